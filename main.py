@@ -12,10 +12,11 @@ Daily News Digest System
 
 import os
 import sys
+import time
 import yaml
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
 # 加载环境变量
@@ -25,10 +26,14 @@ load_dotenv()
 # 添加src到路径
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from collectors import GLMSearchCollector, GitHubTrendingCollector, ContentDeduplicator, RSSCollector
-from formatters import MarkdownFormatter
+from collectors import (
+    GLMSearchCollector, GitHubTrendingCollector, ContentDeduplicator,
+    RSSCollector, FeedRegistry, FeedHealthTracker, TokenBucket
+)
+from formatters import MarkdownFormatter, StreamChunker
 from pushers import WeChatWebhookPusher, EmailSender
-from processors import ContentProcessor
+from processors import ContentProcessor, ArticleRanker, StoryClusterer
+from storage import FeedStateStore, DiskCache, RepoSnapshotStore, LLMResponseCache, DedupStore
 
 # 配置日志
 logging.basicConfig(
@@ -54,8 +59,8 @@ def load_keywords(keywords_path: str = 'config/keywords.yaml') -> List[Dict]:
     加载搜索关键词（支持每个关键词不同的结果数）
 
     Returns:
-        List[Dict]: 包含query和max_results的字典列表
-        例如: [{'query': 'xxx', 'max_results': 10}, ...]
+        List[Dict]: 包含query、max_results和weight的字典列表
+        例如: [{'query': 'xxx', 'max_results': 10, 'weight': 10}, ...]
     """
     with open(keywords_path, 'r', encoding='utf-8') as f:
         data = yaml.safe_load(f)
@@ -70,34 +75,274 @@ def load_keywords(keywords_path: str = 'config/keywords.yaml') -> List[Dict]:
             for keyword_item in category.get('keywords', []):
                 if isinstance(keyword_item, dict):
                     query = keyword_item.get('query', '')
+                    weight = keyword_item.get('weight', 1)
                 else:
                     query = keyword_item
+                    weight = 1
                 if query:
                     keywords.append({
                         'query': query,
                         'max_results': count,
-                        'category': category.get('name', '未分类')
+                        'category': category.get('name', '未分类'),
+                        'weight': weight
                     })
 
     logger.info(f"加载了{len(keywords)}个搜索关键词")
     return keywords
 
 
-def collect_news(config: Dict) -> tuple:
+def create_feed_state_store(config: Dict) -> Optional[FeedStateStore]:
+    """
+    创建RSS源状态存储（cache.enabled为false时返回None）
+
+    Returns:
+        FeedStateStore实例或None
+    """
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    return FeedStateStore(cache_config.get('path', 'cache'))
+
+
+def create_github_cache(config: Dict, namespace: str = 'github', ttl_hours: Optional[float] = None) -> Optional[DiskCache]:
+    """
+    创建GitHub缓存（cache.enabled为false时返回None）
+
+    Args:
+        config: 系统配置
+        namespace: 缓存命名空间
+        ttl_hours: 有效期（小时），默认使用cache.github_ttl
+
+    Returns:
+        DiskCache实例或None
+    """
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    if ttl_hours is None:
+        ttl_hours = cache_config.get('github_ttl', 6)
+    return DiskCache(
+        cache_config.get('path', 'cache'),
+        namespace=namespace,
+        ttl_seconds=ttl_hours * 3600,
+        max_entries=cache_config.get('github_max_entries', 500)
+    )
+
+
+def create_snapshot_store(config: Dict) -> Optional[RepoSnapshotStore]:
+    """
+    创建GitHub星标快照存储（cache.enabled为false时返回None）
+
+    Returns:
+        RepoSnapshotStore实例或None
+    """
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    try:
+        return RepoSnapshotStore(os.path.join(cache_config.get('path', 'cache'), 'github_snapshots.db'))
+    except Exception as e:
+        logger.error(f"星标快照存储初始化失败: {str(e)}")
+        return None
+
+
+def create_article_cache(config: Dict) -> Optional[DiskCache]:
+    """
+    创建逐篇翻译摘要缓存（cache.enabled为false时返回None）
+
+    Returns:
+        DiskCache实例或None
+    """
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    return DiskCache(
+        cache_config.get('path', 'cache'),
+        namespace='articles',
+        ttl_seconds=cache_config.get('article_ttl', 72) * 3600,
+        max_entries=cache_config.get('article_max_entries', 2000)
+    )
+
+
+def create_llm_cache(config: Dict) -> Optional[LLMResponseCache]:
+    """
+    创建大模型响应缓存（cache.enabled为false时返回None）
+
+    Returns:
+        LLMResponseCache实例或None
+    """
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    return LLMResponseCache(
+        cache_config.get('path', 'cache'),
+        ttl_hours=cache_config.get('ttl', 1),
+        max_entries=cache_config.get('llm_max_entries', 200),
+        bypass=cache_config.get('llm_bypass', False)
+    )
+
+
+def create_dedup_store(config: Dict) -> Optional[DedupStore]:
+    """
+    创建跨运行去重存储（cache.enabled或deduplication.persist为false时返回None）
+
+    Returns:
+        DedupStore实例或None
+    """
+    cache_config = config.get('cache', {})
+    dedup_config = config.get('deduplication', {})
+    if not cache_config.get('enabled', False) or not dedup_config.get('persist', True):
+        return None
+    return DedupStore(
+        cache_config.get('path', 'cache'),
+        window_hours=dedup_config.get('time_window', 48)
+    )
+
+
+def create_deduplicator(config: Dict, store: Optional[DedupStore] = None) -> ContentDeduplicator:
+    """
+    根据配置创建内容去重器
+
+    Args:
+        config: 系统配置
+        store: 跨运行去重存储（可选）
+
+    Returns:
+        ContentDeduplicator实例
+    """
+    dedup_config = config.get('deduplication', {})
+    return ContentDeduplicator(
+        similarity_threshold=dedup_config.get('similarity_threshold', 0.8),
+        index=dedup_config.get('index', 'minhash'),
+        store=store
+    )
+
+
+def run_deduplication(
+    deduplicator: ContentDeduplicator,
+    items: List[Dict],
+    config: Dict,
+    priority_key: Optional[str] = None
+) -> List[Dict]:
+    """
+    按配置执行去重（deduplication.batch为true时整批聚类去重，否则逐条去重）
+
+    Args:
+        deduplicator: 内容去重器
+        items: 待去重的项目（title、url字段）
+        config: 系统配置
+        priority_key: 优先级字段名（可选，批量去重时每簇保留优先级最高的项目）
+
+    Returns:
+        去重后的项目列表
+    """
+    dedup_config = config.get('deduplication', {})
+    if dedup_config.get('batch', True):
+        return deduplicator.deduplicate_batch(
+            items,
+            priority_key=priority_key,
+            block_size=dedup_config.get('batch_block_size', 1024)
+        )
+    return deduplicator.deduplicate(items)
+
+
+def collect_news(
+    config: Dict,
+    feed_state: Optional[FeedStateStore] = None,
+    dedup_store: Optional[DedupStore] = None
+) -> tuple:
     """
     收集新闻资讯
 
+    Args:
+        config: 系统配置
+        feed_state: RSS源状态存储（可选，用于条件请求）
+        dedup_store: 跨运行去重存储（可选，跳过之前运行已发送过的文章，并记录本次发送的文章）
+
     Returns:
-        (rss_results, github_projects) 元组
+        (rss_results, github_projects, articles) 元组，articles为筛选后的RSS文章
     """
     logger.info("=== 开始收集资讯 ===")
 
     # 1. RSS新闻收集（替代GLM搜索，时间100%可靠）
     logger.info("步骤1: RSS新闻收集")
-    rss_collector = RSSCollector()
-
-    # 收集最近24小时的RSS文章
-    articles = rss_collector.collect(hours=24, max_per_feed=10)
+    perf_config = config.get('performance', {})
+    max_workers = perf_config.get('max_workers', 5) if perf_config.get('concurrent_search', True) else 1
+    rss_config = config.get('rss', {})
+    registry = FeedRegistry.load(rss_config.get('feeds_file', 'config/feeds.yaml'))
+    health = FeedHealthTracker(feed_state, **rss_config.get('health', {}))
+    rss_collector = RSSCollector(
+        max_workers=max_workers,
+        state_store=feed_state,
+        registry=registry,
+        health=health,
+        stale_date_days=rss_config.get('stale_date_days')
+    )
+
+    # 收集最近24小时的RSS文章（增量模式下只收集上次运行之后的新文章）
+    incremental = rss_config.get('incremental', False)
+    articles = rss_collector.collect(
+        hours=24,
+        max_per_feed=10,
+        incremental=incremental,
+        max_articles=rss_config.get('max_articles')
+    )
+
+    # 故事聚类：多个源报道同一事件时只保留优先级最高的一篇，其他来源记为"同时报道"
+    priorities = registry.priority_map()
+    cluster_config = config.get('processor', {}).get('cluster', {})
+    if cluster_config.get('enabled', False) and articles:
+        clusterer = StoryClusterer(
+            similarity_threshold=cluster_config.get('similarity_threshold', 0.65),
+            priorities=priorities,
+            max_related=cluster_config.get('max_related', 5),
+            block_size=config.get('deduplication', {}).get('batch_block_size', 1024)
+        )
+        articles = clusterer.cluster(articles)
+
+    # 文章去重：同一次收集中的重复（多个源报道同一事件时保留优先级最高的源），以及时间窗口内之前运行已发送过的文章
+    article_deduplicator = create_deduplicator(config, dedup_store)
+    unique_items = run_deduplication(
+        article_deduplicator,
+        [
+            {
+                'title': article.title,
+                'url': article.link,
+                'priority': article.priority if article.priority is not None else priorities.get(article.category, 5),
+                'data': article
+            }
+            for article in articles
+        ],
+        config,
+        priority_key='priority'
+    )
+    logger.info(f"文章去重: {len(articles)} -> {len(unique_items)}")
+    articles = [item['data'] for item in unique_items]
+
+    # 预排序：按时效性、来源优先级、关键词权重和新颖度在Token预算内筛选候选文章
+    prerank_config = config.get('processor', {}).get('prerank', {})
+    if prerank_config.get('enabled', False) and articles:
+        ranker = ArticleRanker(
+            keywords=prerank_config.get('keywords') or load_keywords(
+                prerank_config.get('keywords_file', 'config/keywords.yaml')
+            ),
+            priorities=priorities,
+            token_budget=prerank_config.get('token_budget', 4000),
+            max_articles=prerank_config.get('max_articles', 30),
+            half_life_hours=prerank_config.get('half_life_hours', 12),
+            weights=prerank_config.get('weights')
+        )
+        articles = ranker.select(articles)
+
+    # 增量模式：只用实际发送的文章推进高水位标记（被裁掉的文章后续运行还能收集到）
+    if incremental:
+        rss_collector.advance_high_water(articles)
+
+    # 记录本次发送给大模型的文章及其同时报道（推送成功后才保存到磁盘）
+    for article in articles:
+        article_deduplicator.remember(article.title, article.link)
+        for item in article.related:
+            article_deduplicator.remember(item['title'], item['link'])
 
     # 格式化为GLM处理器兼容的格式
     rss_results = rss_collector.format_for_glm(articles)
@@ -106,27 +351,54 @@ def collect_news(config: Dict) -> tuple:
 
     # 2. GitHub趋势
     logger.info("步骤2: GitHub趋势项目")
-    github_collector = GitHubTrendingCollector()
     github_config = config.get('github', {})
+    github_collector = GitHubTrendingCollector(
+        max_workers=max_workers,
+        pool_size=perf_config.get('connection_pool_size', 10),
+        timeout=github_config.get('timeout', 30),
+        cache=create_github_cache(config),
+        snapshots=create_snapshot_store(config),
+        # 补充信息按pushed_at缓存，项目未更新时一直有效
+        enrich_cache=create_github_cache(config, namespace='github_enrich', ttl_hours=24 * 30),
+        base_url=github_config.get('api_url', 'https://api.github.com'),
+        graphql_url=github_config.get('graphql_url')
+    )
 
     languages = github_config.get('languages', ['Python', 'JavaScript', 'TypeScript'])
     days = github_config.get('trending_days', 7)
     top_n = github_config.get('top_n', 10)
-
-    # 获取所有语言的项目并合并
-    all_projects = []
-    for language in languages:
-        projects = github_collector.get_trending(language, days, top_n // len(languages))
-        all_projects.extend(projects)
-
-    # 按星标排序
-    all_projects.sort(key=lambda x: x.get('stars', 0), reverse=True)
-
-    # 只保留前top_n个
-    github_projects = all_projects[:top_n]
+    ranking = github_config.get('ranking', 'stars')
+
+    if ranking == 'velocity':
+        # 按增速排序的候选为最近创建的项目（星标总数最多的老项目增长缓慢，不适合作为候选）
+        all_projects = github_collector.get_velocity_candidates(
+            languages,
+            created_days=github_config.get('candidate_created_days', 30),
+            per_language=github_config.get('candidates_per_language', 30),
+            min_stars=github_config.get('candidate_min_stars', 20)
+        )
+
+        # 每次运行都记录星标快照，积累增速历史
+        github_collector.record_snapshots(all_projects)
+        github_projects = github_collector.rank_by_star_velocity(
+            all_projects, top_n, github_config.get('velocity_window_days', 7)
+        )
+    else:
+        # 跨语言归并取全局前top_n（按星标），不再平均分配到每种语言
+        github_projects = github_collector.get_global_trending(languages, days, top_n)
+        github_collector.record_snapshots(github_projects)
+
+    # 清理过期快照（保留期不小于增速统计窗口）
+    github_collector.prune_snapshots(
+        max(github_config.get('snapshot_keep_days', 90), github_config.get('velocity_window_days', 7))
+    )
+
+    # GraphQL批量补充项目信息（最新版本、可提及用户数、README摘要）
+    if github_config.get('enrich', False):
+        github_collector.enrich_repos(github_projects, github_config.get('enrich_batch_size', 20))
 
     logger.info(f"收集完成: RSS文章{len(articles)}篇, GitHub项目{len(github_projects)}个")
-    return rss_results, github_projects
+    return rss_results, github_projects, articles
 
 
 def deduplicate_content(glm_results: List[Dict], github_projects: List[Dict], config: Dict):
@@ -138,10 +410,7 @@ def deduplicate_content(glm_results: List[Dict], github_projects: List[Dict], co
     """
     logger.info("=== 开始去重处理 ===")
 
-    dedup_config = config.get('deduplication', {})
-    threshold = dedup_config.get('similarity_threshold', 0.8)
-
-    deduplicator = ContentDeduplicator(similarity_threshold=threshold)
+    deduplicator = create_deduplicator(config)
 
     # GitHub项目去重（基于URL）
     github_items = []
@@ -152,20 +421,53 @@ def deduplicate_content(glm_results: List[Dict], github_projects: List[Dict], co
             'data': project
         })
 
-    unique_github_items = deduplicator.deduplicate(github_items)
+    unique_github_items = run_deduplication(deduplicator, github_items, config)
     unique_github_projects = [item['data'] for item in unique_github_items]
 
     logger.info(f"去重完成: GitHub项目 {len(github_projects)} -> {len(unique_github_projects)}")
     return glm_results, unique_github_projects
 
 
-def intelligent_process(glm_results: List[Dict], github_projects: List[Dict]) -> Dict:
+def create_content_processor(config: Dict) -> ContentProcessor:
+    """
+    根据配置创建智能内容处理器（处理模式、限流和缓存）
+
+    Returns:
+        ContentProcessor实例
+    """
+    processor_config = config.get('processor', {})
+    rate_config = config.get('glm', {}).get('rate_limit', {})
+    return ContentProcessor(
+        cache=create_llm_cache(config),
+        mode=processor_config.get('mode', 'single'),
+        batch_token_budget=processor_config.get('batch_token_budget', 6000),
+        max_workers=processor_config.get('max_workers', 3),
+        map_max_tokens=processor_config.get('map_max_tokens', 1500),
+        rate_limiter=TokenBucket(
+            rate=rate_config.get('requests_per_second', 0.5),
+            burst=rate_config.get('burst', 2),
+            max_concurrent=rate_config.get('max_concurrent', 2)
+        ),
+        article_cache=create_article_cache(config),
+        max_news=processor_config.get('max_news', 8),
+        structured=processor_config.get('structured', False)
+    )
+
+
+def intelligent_process(
+    glm_results: List[Dict],
+    github_projects: List[Dict],
+    config: Optional[Dict] = None,
+    articles: Optional[List] = None
+) -> Dict:
     """
     智能处理内容（使用GLM大模型进行二次处理）
 
     Args:
         glm_results: GLM搜索结果
         github_projects: GitHub项目列表
+        config: 配置字典（处理模式、限流和大模型响应缓存）
+        articles: RSS文章列表（per_article模式使用）
 
     Returns:
         处理后的内容字典
@@ -173,11 +475,13 @@ def intelligent_process(glm_results: List[Dict], github_projects: List[Dict]) ->
     logger.info("=== 开始智能内容处理 ===")
 
     try:
-        processor = ContentProcessor()
-        processed = processor.process_news(glm_results, github_projects)
+        processor = create_content_processor(config or {})
+        processed = processor.process_news(glm_results, github_projects, articles)
 
         if processed.get('success'):
             logger.info(f"✅ 智能处理成功！输出{processed.get('char_count', 0)}字符")
+            if processed.get('failed_batches'):
+                logger.warning(f"⚠️ {processed['failed_batches']}/{processed['batch_count']}个批次摘要失败，部分资讯未纳入")
             return processed
         else:
             logger.error(f"❌ 智能处理失败: {processed.get('error', '未知错误')}")
@@ -192,6 +496,127 @@ def intelligent_process(glm_results: List[Dict], github_projects: List[Dict]) ->
         }
 
 
+def build_kobe_section(formatter: MarkdownFormatter) -> str:
+    """
+    生成追加在内容末尾的科比名言
+
+    Args:
+        formatter: Markdown格式化器
+
+    Returns:
+        名言Markdown文本，未启用时返回空字符串
+    """
+    kobe_quote = formatter.get_random_kobe_quote()
+    if not kobe_quote:
+        return ''
+
+    kobe_lines = ["\n\n---\n"]
+    kobe_lines.append("## 🏀 今日名言 - Kobe Bryant\n")
+
+    if kobe_quote.get('show_category'):
+        kobe_lines.append(f"*{kobe_quote['category']}*\n")
+
+    format_type = kobe_quote.get('format', 'bilingual')
+    if format_type == 'bilingual':
+        kobe_lines.append(f"> **{kobe_quote['en']}**\n")
+        kobe_lines.append(f"> **{kobe_quote['zh']}**\n")
+    elif format_type == 'en_only':
+        kobe_lines.append(f"> {kobe_quote['en']}\n")
+    elif format_type == 'zh_only':
+        kobe_lines.append(f"> {kobe_quote['zh']}\n")
+
+    logger.info("✅ 已添加科比名言")
+    return ''.join(kobe_lines)
+
+
+def stream_and_push(
+    glm_results: List[Dict],
+    github_projects: List[Dict],
+    config: Dict,
+    articles: Optional[List] = None
+) -> bool:
+    """
+    流式处理并推送：大模型边生成边分块，每块完成后立即推送到微信
+
+    科比名言在生成结束后追加；有任何一块推送失败或生成中断时，按备用方式推送已生成的完整内容。
+
+    Args:
+        glm_results: GLM搜索结果
+        github_projects: GitHub项目列表
+        config: 系统配置
+        articles: RSS文章列表（per_article模式使用）
+
+    Returns:
+        True表示成功，False表示失败
+    """
+    logger.info("=== 开始流式处理并推送 ===")
+
+    formatter_config = config.get('formatter', {})
+    chunker = StreamChunker(
+        max_size=formatter_config.get('max_chunk_size', 1300),
+        min_size=config.get('processor', {}).get('stream_min_chunk', 400)
+    )
+    push_config = config.get('push_strategy', {})
+
+    try:
+        processor = create_content_processor(config)
+        pusher = WeChatWebhookPusher()
+    except Exception as e:
+        logger.error(f"流式推送初始化失败: {str(e)}")
+        return False
+
+    parts = []
+    sent = 0
+    all_sent = True
+    last_sent = 0.0
+
+    def push(chunk: str):
+        nonlocal sent, all_sent, last_sent
+        # 避免发送过快
+        wait = 1 - (time.monotonic() - last_sent)
+        if wait > 0:
+            time.sleep(wait)
+        sent += 1
+        logger.info(f"推送第{sent}部分")
+        if not pusher.send_markdown(chunk):
+            all_sent = False
+            logger.error(f"第{sent}部分发送失败")
+        last_sent = time.monotonic()
+
+    completed = True
+    try:
+        for delta in processor.stream_news(glm_results, github_projects, articles):
+            parts.append(delta)
+            for chunk in chunker.feed(delta):
+                push(chunk)
+    except Exception as e:
+        logger.error(f"流式处理中断: {str(e)}", exc_info=True)
+        completed = False
+
+    if not ''.join(parts).strip():
+        logger.error("处理后的内容为空")
+        return False
+
+    kobe_section = build_kobe_section(MarkdownFormatter()) if completed else ''
+    parts.append(kobe_section)
+    for chunk in chunker.feed(kobe_section) + chunker.flush():
+        push(chunk)
+
+    success = completed and all_sent
+    logger.info(f"流式推送完成，共{sent}个部分")
+
+    # 备用推送（发送完整内容）
+    if not success and push_config.get('enable_fallback', True) and push_config.get('fallback', 'email') == 'email':
+        logger.warning("流式推送未完全成功，尝试备用推送: email")
+        try:
+            success = EmailSender().send_markdown_as_html(''.join(parts).strip())
+        except Exception as e:
+            logger.error(f"备用邮箱推送失败: {str(e)}")
+            success = False
+
+    return success
+
+
 def format_and_push_processed(processed_content: Dict, config: Dict) -> bool:
     """
     推送智能处理后的内容
@@ -214,32 +639,23 @@ def format_and_push_processed(processed_content: Dict, config: Dict) -> bool:
         logger.error("处理后的内容为空")
         return False
 
-    # 添加科比名言（在分割前）
     formatter = MarkdownFormatter()
-    kobe_quote = formatter.get_random_kobe_quote()
-    if kobe_quote:
-        # 添加科比名言到内容末尾
-        kobe_lines = ["\n\n---\n"]
-        kobe_lines.append("## 🏀 今日名言 - Kobe Bryant\n")
-
-        if kobe_quote.get('show_category'):
-            kobe_lines.append(f"*{kobe_quote['category']}*\n")
-
-        format_type = kobe_quote.get('format', 'bilingual')
-        if format_type == 'bilingual':
-            kobe_lines.append(f"> **{kobe_quote['en']}**\n")
-            kobe_lines.append(f"> **{kobe_quote['zh']}**\n")
-        elif format_type == 'en_only':
-            kobe_lines.append(f"> {kobe_quote['en']}\n")
-        elif format_type == 'zh_only':
-            kobe_lines.append(f"> {kobe_quote['zh']}\n")
-
-        markdown += ''.join(kobe_lines)
-        logger.info("✅ 已添加科比名言")
-
-    # 检查是否需要分割
-    max_size = config.get('formatter', {}).get('max_chunk_size', 1300)
-    chunks = formatter.split_content(markdown, max_size)
+    digest = processed_content.get('digest')
+    if digest is not None:
+        # 结构化输出：逐块渲染，按字节数直接装入消息
+        blocks = formatter.render_digest_blocks(digest)
+        kobe_section = build_kobe_section(formatter).strip()
+        if kobe_section:
+            blocks.append(kobe_section)
+        markdown = '\n\n'.join(blocks)
+        chunks = formatter.pack_blocks(blocks, config.get('formatter', {}).get('max_chunk_bytes', 4000))
+    else:
+        # 添加科比名言（在分割前）
+        markdown += build_kobe_section(formatter)
+
+        # 检查是否需要分割
+        max_size = config.get('formatter', {}).get('max_chunk_size', 1300)
+        chunks = formatter.split_content(markdown, max_size)
 
     logger.info(f"内容分割完成，共{len(chunks)}个部分")
 
@@ -346,6 +762,15 @@ def format_and_push(glm_results: List[Dict], github_projects: List[Dict], config
     return success
 
 
+def save_feed_health(feed_state: Optional[FeedStateStore]):
+    """
+    推送失败时只保存RSS源健康数据（连续失败次数、熔断、耗时统计），
+    ETag、已见条目和高水位标记不前进，重新运行仍会完整获取内容
+    """
+    if feed_state:
+        feed_state.save(only=('health',))
+
+
 def main():
     """主函数"""
     logger.info("=" * 60)
@@ -353,31 +778,46 @@ def main():
     logger.info(f"运行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("=" * 60)
 
+    feed_state = None
     try:
         # 加载配置
         config = load_config()
 
         # 收集资讯
-        glm_results, github_projects = collect_news(config)
+        feed_state = create_feed_state_store(config)
+        dedup_store = create_dedup_store(config)
+        glm_results, github_projects, articles = collect_news(config, feed_state, dedup_store)
 
         # 去重处理
         glm_results, github_projects = deduplicate_content(glm_results, github_projects, config)
 
-        # 🆕 智能内容处理（使用GLM大模型进行二次处理）
-        processed_content = intelligent_process(glm_results, github_projects)
+        push_config = config.get('push_strategy', {})
+        if config.get('processor', {}).get('stream', False) and push_config.get('primary', 'wechat') == 'wechat':
+            # 流式处理：章节生成完即推送，首条消息不必等待完整生成
+            success = stream_and_push(glm_results, github_projects, config, articles)
+        else:
+            # 🆕 智能内容处理（使用GLM大模型进行二次处理）
+            processed_content = intelligent_process(glm_results, github_projects, config, articles)
 
-        # 推送处理后的内容
-        success = format_and_push_processed(processed_content, config)
+            # 推送处理后的内容
+            success = format_and_push_processed(processed_content, config)
 
         if success:
             logger.info("✅ 资讯推送成功！")
+            # 推送成功后才保存RSS源状态和已发送记录，推送失败时重新运行仍会完整获取
+            if feed_state:
+                feed_state.save()
+            if dedup_store:
+                dedup_store.save()
             return 0
         else:
             logger.error("❌ 资讯推送失败！")
+            save_feed_health(feed_state)
             return 1
 
     except Exception as e:
         logger.error(f"❌ 程序执行失败: {str(e)}", exc_info=True)
+        save_feed_health(feed_state)
         return 1
 
     finally:
@@ -6,10 +6,30 @@ from .glm_search import GLMSearchCollector
 from .github_trending import GitHubTrendingCollector
 from .deduplicator import ContentDeduplicator
 from .rss_collector import RSSCollector
+from .feed_registry import FeedRegistry, FeedSpec
+from .feed_health import FeedHealthTracker
+from .models import Article, Repo
+from .rate_limiter import TokenBucket
+from .date_extractor import DateExtractor
+from .minhash_index import MinHashLSH
+from .batch_dedup import BatchDeduplicator
+from .url_canonical import FingerprintSet, canonicalize_url, url_fingerprint
 
 __all__ = [
     'GLMSearchCollector',
     'GitHubTrendingCollector',
     'ContentDeduplicator',
-    'RSSCollector'
+    'RSSCollector',
+    'FeedRegistry',
+    'FeedSpec',
+    'FeedHealthTracker',
+    'Article',
+    'Repo',
+    'TokenBucket',
+    'DateExtractor',
+    'MinHashLSH',
+    'BatchDeduplicator',
+    'FingerprintSet',
+    'canonicalize_url',
+    'url_fingerprint'
 ]
@@ -0,0 +1,231 @@
+"""
+批量相似度去重 - 整批标题一次归一化，用字符出现次数特征矩阵分块相乘得到所有标题对的相似度上界，
+只对上界达到阈值的标题对做精确比较（SequenceMatcher），再用并查集合并为簇，每簇保留一个代表
+安装NumPy时使用矩阵运算（特征矩阵按稀疏行保存、按块展开），未安装时使用纯Python实现，两者结果相同
+"""
+
+import logging
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class UnionFind:
+    """并查集（根节点总是簇内最小编号，合并结果与顺序无关）"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        """查找根节点（路径减半）"""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        合并两个元素所在的簇
+
+        Returns:
+            True表示发生了合并，False表示已在同一簇
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if root_a > root_b:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        return True
+
+    def groups(self) -> List[List[int]]:
+        """所有簇（簇内按编号升序，簇按最小编号升序）"""
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(self.parent)):
+            groups.setdefault(self.find(i), []).append(i)
+        return list(groups.values())
+
+
+class BatchDeduplicator:
+    """批量相似度去重器"""
+
+    def __init__(self, similarity_threshold: float = 0.8, block_size: int = 1024, use_numpy: Optional[bool] = None):
+        """
+        初始化批量去重器
+
+        相似度与ContentDeduplicator.calculate_similarity一致（小写、去首尾空白后的SequenceMatcher.ratio）。
+        特征为(字符, 第k次出现)，两个标题特征向量的点积等于共同字符数（按出现次数取小），
+        2 × 点积 / 长度和 即quick_ratio，是ratio的上界，因此预筛选不会漏掉任何达到阈值的标题对。
+
+        Args:
+            similarity_threshold: 标题相似度阈值（0-1）
+            block_size: 分块矩阵乘法的块大小（行数），特征矩阵只按块展开，
+                峰值内存约为 (2 × block_size × 特征数 + block_size²) × 4字节，与标题总数无关
+            use_numpy: 是否使用NumPy（默认已安装时使用）
+        """
+        self.similarity_threshold = similarity_threshold
+        self.block_size = max(1, block_size)
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+
+    @staticmethod
+    def normalize(title: str) -> str:
+        """标题归一化（与calculate_similarity一致）"""
+        return title.lower().strip()
+
+    @staticmethod
+    def _features(counts: Counter) -> Iterator[Tuple[str, int]]:
+        """字符出现次数特征：出现n次的字符产生(字符, 1)...(字符, n)"""
+        for char, count in counts.items():
+            for k in range(1, count + 1):
+                yield char, k
+
+    def _candidate_pairs_numpy(self, texts: List[str], counts: List[Counter]) -> Iterator[Tuple[int, int]]:
+        """NumPy分块矩阵乘法求上界达到阈值的标题对 (i, j)，j < i"""
+        # 只出现在一个标题中的特征对点积没有贡献，不进入矩阵
+        frequency = Counter(feature for c in counts for feature in self._features(c))
+        vocabulary = {feature: i for i, feature in enumerate(f for f, df in frequency.items() if df > 1)}
+        width = max(1, len(vocabulary))
+
+        # 特征矩阵以稀疏行（CSR：每行的特征列号）保存，计算时只展开参与乘法的两个块
+        indices = []
+        indptr = [0]
+        for c in counts:
+            indices.extend(vocabulary[f] for f in self._features(c) if f in vocabulary)
+            indptr.append(len(indices))
+        indices = np.array(indices, dtype=np.int32)
+        indptr = np.array(indptr, dtype=np.int64)
+
+        def dense(start: int, stop: int):
+            block = np.zeros((stop - start, width), dtype=np.float32)
+            rows = np.repeat(np.arange(stop - start), np.diff(indptr[start:stop + 1]))
+            block[rows, indices[indptr[start]:indptr[stop]]] = 1.0
+            return block
+
+        n = len(texts)
+        size = self.block_size
+        lengths = np.array([len(text) for text in texts], dtype=np.float32)
+
+        # 比较前留一点余量，浮点误差只会多出候选（由精确比较排除），不会漏掉
+        threshold = self.similarity_threshold
+        for start in range(0, n, size):
+            stop = min(n, start + size)
+            row_block = dense(start, stop)
+            # 只计算下三角：本块的行与编号不超过stop的列块
+            for col_start in range(0, stop, size):
+                col_stop = min(stop, col_start + size)
+                col_block = row_block if col_start == start else dense(col_start, col_stop)
+                overlap = row_block @ col_block.T
+                total = lengths[start:stop, None] + lengths[None, col_start:col_stop]
+                rows, cols = np.nonzero(2 * overlap >= threshold * total - 1e-3)
+                for row, col in zip((rows + start).tolist(), (cols + col_start).tolist()):
+                    if col < row:
+                        yield row, col
+
+    def _candidate_pairs_python(self, texts: List[str], counts: List[Counter]) -> Iterator[Tuple[int, int]]:
+        """纯Python逐对计算上界（长度上界先行过滤）"""
+        threshold = self.similarity_threshold
+        lengths = [len(text) for text in texts]
+        for i in range(len(texts)):
+            for j in range(i):
+                total = lengths[i] + lengths[j]
+                if 2 * min(lengths[i], lengths[j]) < threshold * total:
+                    continue
+                if 2 * sum((counts[i] & counts[j]).values()) >= threshold * total:
+                    yield i, j
+
+    def cluster(self, titles: Sequence[str]) -> List[List[int]]:
+        """
+        把相似标题合并为簇（相似关系可传递：A≈B、B≈C时A、B、C同簇）
+
+        Args:
+            titles: 标题列表
+
+        Returns:
+            簇列表（簇内按编号升序，簇按最小编号升序）
+        """
+        texts = [self.normalize(title) for title in titles]
+        counts = [Counter(text) for text in texts]
+        union_find = UnionFind(len(texts))
+
+        pairs = self._candidate_pairs_numpy if self.use_numpy else self._candidate_pairs_python
+        candidates = confirmed = 0
+        for i, j in pairs(texts, counts):
+            # 已在同一簇的标题对不必再精确比较
+            if union_find.find(i) == union_find.find(j):
+                continue
+            candidates += 1
+            # 参数顺序与逐条去重一致（新标题在前）
+            if SequenceMatcher(None, texts[i], texts[j]).ratio() >= self.similarity_threshold:
+                union_find.union(i, j)
+                confirmed += 1
+
+        groups = union_find.groups()
+        logger.debug(f"批量去重: {len(texts)}个标题，精确比较{candidates}对，合并{confirmed}对，{len(groups)}个簇")
+        return groups
+
+    def select(self, titles: Sequence[str], priorities: Optional[Sequence[float]] = None) -> List[int]:
+        """
+        每簇选出一个代表
+
+        Args:
+            titles: 标题列表
+            priorities: 优先级（可选，数字越小越优先），同优先级时保留编号最小（最靠前）的
+
+        Returns:
+            代表的编号（升序）
+        """
+        if priorities is None:
+            return [group[0] for group in self.cluster(titles)]
+        return sorted(min(group, key=lambda i: (priorities[i], i)) for group in self.cluster(titles))
+
+
+# 测试代码
+if __name__ == '__main__':
+    import time
+    import random
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    titles = [
+        'OpenAI发布GPT-5模型',
+        'OpenAI发布GPT-5模型！',
+        '谷歌推出Gemini 2.0',
+        'openai发布gpt-5新模型',
+        '苹果发布新款iPhone',
+    ]
+    deduplicator = BatchDeduplicator(0.8)
+    print(f"簇: {deduplicator.cluster(titles)}")
+    print(f"按优先级选代表: {deduplicator.select(titles, priorities=[3, 1, 2, 2, 2])}")
+
+    # 基准测试：合成标题（同一事件的改写版本为重复），对比NumPy与纯Python实现
+    rng = random.Random(7)
+    topic_chars = '数据安全模型算力市场用户平台服务产品技术生态合作监管融资芯片手机汽车能源医疗教育金融游戏视频'
+    subjects = ['OpenAI', '英伟达', '苹果', '特斯拉', '微软', '谷歌', '字节跳动', '阿里巴巴', '腾讯', '华为']
+    sample = []
+    for _ in range(600):
+        topic = ''.join(rng.choice(topic_chars) for _ in range(rng.randrange(4, 8)))
+        base = f"{rng.choice(subjects)}{rng.choice(['发布', '推出', '宣布'])}{topic}新品"
+        sample.append(base)
+        sample.extend(base + rng.choice(['！', '（附详情）', '最新消息']) for _ in range(rng.randrange(0, 3)))
+    rng.shuffle(sample)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"\n基准测试: {len(sample)}个标题")
+    results = {}
+    for label, use_numpy in (('NumPy', True), ('纯Python', False)):
+        if use_numpy and np is None:
+            print("未安装NumPy，跳过")
+            continue
+        start = time.perf_counter()
+        results[label] = BatchDeduplicator(0.8, block_size=512, use_numpy=use_numpy).cluster(sample)
+        print(f"{label:>8}: {time.perf_counter() - start:.2f}s，{len(results[label])}个簇")
+    if len(results) == 2:
+        print(f"结果一致: {results['NumPy'] == results['纯Python']}")
@@ -0,0 +1,172 @@
+"""
+日期提取器 - 预编译的单一正则一次扫描提取中文/ISO日期，返回匹配位置供过滤和标注
+支持格式：2025年11月10日、2025-11-10、11月10日（缺少年份时使用默认年份）
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List, Optional
+
+
+# 三种格式合并为一个正则，公共的前导数字提取到分支之前（年份或月份，长度在匹配后校验）。
+# finditer不重叠扫描，"2025年11月10日"不会再被"11月10日"重复匹配；
+# (?=\d)让非数字位置快速失败，(?<!\d)/(?!\d)防止从长数字中间截取
+DATE_PATTERN = re.compile(
+    r'(?=\d)(?<!\d)(\d{1,4})(?:'
+    r'年(\d{1,2})月(\d{1,2})日'         # 2025年11月10日
+    r'|-(\d{1,2})-(\d{1,2})(?!\d)'     # 2025-11-10
+    r'|月(\d{1,2})日'                   # 11月10日
+    r')'
+)
+
+
+@dataclass(slots=True)
+class DateMatch:
+    """日期匹配结果"""
+
+    start: int
+    end: int
+    year: Optional[int]     # 原文没有年份时为None
+    month: int
+    day: int
+
+    @property
+    def span(self) -> tuple:
+        """匹配位置 (start, end)"""
+        return self.start, self.end
+
+    def to_date(self, default_year: int) -> Optional[date]:
+        """
+        转换为date（原文没有年份时使用default_year）
+
+        Returns:
+            date对象，日期不合法（如2月30日）时返回None
+        """
+        try:
+            return date(self.year or default_year, self.month, self.day)
+        except ValueError:
+            return None
+
+
+class DateExtractor:
+    """日期提取器"""
+
+    def __init__(self, default_year: Optional[int] = None):
+        """
+        初始化日期提取器
+
+        Args:
+            default_year: 原文只有月日时使用的年份（默认今年）
+        """
+        self.default_year = default_year or date.today().year
+
+    @staticmethod
+    def iter_matches(text: str) -> Iterator[DateMatch]:
+        """
+        单次扫描遍历文本中的日期
+
+        Args:
+            text: 待扫描文本
+
+        Yields:
+            日期匹配结果（按出现顺序）
+        """
+        for m in DATE_PATTERN.finditer(text):
+            lead, cn_month, cn_day, iso_month, iso_day, md_day = m.groups()
+            if md_day is not None:
+                if len(lead) <= 2:
+                    yield DateMatch(m.start(), m.end(), None, int(lead), int(md_day))
+            elif len(lead) == 4:
+                if cn_month is not None:
+                    yield DateMatch(m.start(), m.end(), int(lead), int(cn_month), int(cn_day))
+                else:
+                    yield DateMatch(m.start(), m.end(), int(lead), int(iso_month), int(iso_day))
+
+    def extract(self, text: str) -> List[DateMatch]:
+        """
+        提取文本中的所有日期
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            日期匹配结果列表
+        """
+        return list(self.iter_matches(text))
+
+    def out_of_range(self, text: str, earliest: date, latest: date) -> List[DateMatch]:
+        """
+        找出不在 [earliest, latest] 范围内的日期（不合法的日期忽略）
+
+        Args:
+            text: 待扫描文本
+            earliest: 最早允许日期
+            latest: 最晚允许日期
+
+        Returns:
+            超出范围的日期匹配结果列表
+        """
+        invalid = []
+        for match in self.iter_matches(text):
+            value = match.to_date(self.default_year)
+            if value and not earliest <= value <= latest:
+                invalid.append(match)
+        return invalid
+
+    def is_stale(self, text: str, earliest: date) -> bool:
+        """
+        判断文本是否只提到旧日期（至少有一个带年份的日期，且所有带年份的日期都早于earliest）
+
+        只有月日的日期年份不确定，不参与判断。
+
+        Args:
+            text: 待扫描文本
+            earliest: 最早的非过期日期
+
+        Returns:
+            True表示文本描述的是旧闻
+        """
+        found = False
+        for match in self.iter_matches(text):
+            if match.year is None:
+                continue
+            value = match.to_date(self.default_year)
+            if value is None:
+                continue
+            if value >= earliest:
+                return False
+            found = True
+        return found
+
+
+# 测试代码
+if __name__ == '__main__':
+    import time
+
+    extractor = DateExtractor()
+    sample = "2025年11月10日发布，11月12日上线，2025-11-9更新，编号12025-11-10不是日期，2月30日不合法"
+    for match in extractor.extract(sample):
+        print(f"{sample[match.start:match.end]:>12} -> {match.year}-{match.month}-{match.day} @ {match.span}")
+
+    def old_scan(text: str) -> int:
+        """旧版实现：三次findall（重叠格式会重复计数）"""
+        count = 0
+        for pattern in [r'(\d{4})年(\d{1,2})月(\d{1,2})日', r'(\d{4})-(\d{1,2})-(\d{1,2})', r'(\d{1,2})月(\d{1,2})日']:
+            count += len(re.findall(pattern, text))
+        return count
+
+    block = "今日要闻：OpenAI于2025年11月10日发布新模型，预计11月20日全面开放。" + "普通正文内容" * 20 + "\n"
+    print(f"\n{'大小':>6} | {'旧版(3次扫描)':>14} | {'单次扫描':>10} | 旧版匹配数 | 新版匹配数")
+    for size_mb in (1, 2, 4, 8):
+        text = block * (size_mb * 1024 * 1024 // len(block.encode('utf-8')))
+
+        start = time.perf_counter()
+        old_count = old_scan(text)
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new_count = sum(1 for _ in extractor.iter_matches(text))
+        new_time = time.perf_counter() - start
+
+        print(f"{size_mb:>4}MB | {old_time * 1000:>12.1f}ms | {new_time * 1000:>8.1f}ms | {old_count:>10} | {new_count:>10}")
@@ -3,27 +3,63 @@
 """
 
 import logging
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from difflib import SequenceMatcher
 
+from .batch_dedup import BatchDeduplicator
+from .minhash_index import MinHashLSH
+from .url_canonical import FingerprintSet, url_fingerprint
+
+if TYPE_CHECKING:
+    from storage.dedup_store import DedupStore
+
 logger = logging.getLogger(__name__)
 
+# 跨运行存储中"没有URL"的指纹标记
+NO_URL = 0
+
 
 class ContentDeduplicator:
     """内容去重器"""
 
-    def __init__(self, similarity_threshold: float = 0.8):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        index: str = 'minhash',
+        store: Optional['DedupStore'] = None
+    ):
         """
         初始化去重器
 
         Args:
             similarity_threshold: 标题相似度阈值（0-1），默认0.8表示80%相似即判定为重复
+            index: 标题候选查找方式，minhash=MinHash/LSH索引只比较候选标题，linear=与所有已见标题逐一比较
+            store: 跨运行去重存储（可选），时间窗口内已发送过的URL和标题同样判定为重复
         """
         self.similarity_threshold = similarity_threshold
-        self.seen_urls: Set[str] = set()
+        # URL按规范化后的64位指纹记录（跟踪参数、http/https、移动版、AMP链接视为同一URL）
+        self.seen_urls = FingerprintSet()
         self.seen_titles: List[str] = []
-
-        logger.info(f"内容去重器初始化成功，相似度阈值: {similarity_threshold}")
+        self.hasher = MinHashLSH()
+        self.index = self.hasher if index == 'minhash' else None
+        self.store = store
+        self._last_signature: Optional[Tuple[str, Tuple[int, ...]]] = None
+        self._load_store()
+
+        logger.info(f"内容去重器初始化成功，相似度阈值: {similarity_threshold}，候选查找: {index}")
+
+    def _load_store(self):
+        """把跨运行存储中的URL指纹和标题加入已见记录（使用存储的签名，不重新计算）"""
+        if self.store is None:
+            return
+        # 没有URL的条目只参与标题去重（NO_URL标记；旧版存储中记为空串的指纹）
+        no_url = {NO_URL, url_fingerprint('')}
+        self.seen_urls = FingerprintSet(fp for fp in self.store.fingerprints if fp not in no_url)
+        for title, signature in self.store.entries():
+            if self.index is not None:
+                self.index.add(len(self.seen_titles), signature)
+            self.seen_titles.append(title)
+        logger.info(f"加载了{len(self.store)}条已发送记录")
 
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -55,18 +91,39 @@ class ContentDeduplicator:
         """
         title = title.strip()
 
-        # 与已知标题逐一比较
-        for seen_title in self.seen_titles:
-            similarity = self.calculate_similarity(title, seen_title)
-            if similarity >= self.similarity_threshold:
+        if self.index is None:
+            candidates = self.seen_titles
+        else:
+            # 只与LSH候选比较（签名留给add_content复用）
+            signature = self.index.signature(title)
+            self._last_signature = (title, signature)
+            candidates = [self.seen_titles[i] for i in sorted(self.index.query(signature))]
+
+        for seen_title in candidates:
+            similarity = self._similarity_above_threshold(title, seen_title)
+            if similarity is not None:
                 logger.debug(f"发现重复标题（相似度{similarity:.2f}）: {title} ≈ {seen_title}")
                 return True
 
         return False
 
+    def _similarity_above_threshold(self, text1: str, text2: str) -> Optional[float]:
+        """
+        相似度达到阈值时返回相似度，否则返回None（与calculate_similarity结果一致）
+
+        先用SequenceMatcher的两个上界（real_quick_ratio、quick_ratio）快速排除，
+        上界低于阈值时ratio必然更低，不必做完整匹配。
+        """
+        matcher = SequenceMatcher(None, text1.lower().strip(), text2.lower().strip())
+        threshold = self.similarity_threshold
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            return None
+        similarity = matcher.ratio()
+        return similarity if similarity >= threshold else None
+
     def is_duplicate_url(self, url: str) -> bool:
         """
-        检查URL是否重复
+        检查URL是否重复（空URL不判重，交给标题去重）
 
         Args:
             url: 待检查的URL
@@ -74,7 +131,7 @@ class ContentDeduplicator:
         Returns:
             True表示重复，False表示不重复
         """
-        if url in self.seen_urls:
+        if url and self.seen_urls.contains_url(url):
             logger.debug(f"发现重复URL: {url}")
             return True
         return False
@@ -87,8 +144,34 @@ class ContentDeduplicator:
             title: 标题
             url: URL
         """
-        self.seen_titles.append(title.strip())
-        self.seen_urls.add(url)
+        title = title.strip()
+        if self.index is not None:
+            if self._last_signature and self._last_signature[0] == title:
+                signature = self._last_signature[1]
+            else:
+                signature = self.index.signature(title)
+            self.index.add(len(self.seen_titles), signature)
+            self._last_signature = None
+
+        self.seen_titles.append(title)
+        if url:
+            self.seen_urls.add_url(url)
+
+    def remember(self, title: str, url: str):
+        """
+        把内容记入跨运行存储（只记录实际发送的内容，未设置存储时忽略）
+
+        URL为空时只记录标题（指纹记为NO_URL），之后没有链接的条目不会因为URL相同被误判为重复。
+
+        Args:
+            title: 标题
+            url: URL
+        """
+        if self.store is None:
+            return
+        title = title.strip()
+        fingerprint = url_fingerprint(url) if url else NO_URL
+        self.store.add(fingerprint, title, self.hasher.signature(title))
 
     def deduplicate(
         self,
@@ -130,10 +213,63 @@ class ContentDeduplicator:
         logger.info(f"去重完成，剩余项目数: {len(deduplicated)}（去除{len(items) - len(deduplicated)}个重复）")
         return deduplicated
 
+    def deduplicate_batch(
+        self,
+        items: List[Dict],
+        title_key: str = 'title',
+        url_key: str = 'url',
+        priority_key: Optional[str] = None,
+        block_size: int = 1024
+    ) -> List[Dict]:
+        """
+        批量去重：整批标题一起计算相似度，相似标题合并为簇，每簇只保留一个
+
+        先按URL去重（空URL除外）并排除与已见标题（之前的批次、跨运行存储）重复的项目，
+        剩余项目交给BatchDeduplicator分块计算相似度并用并查集聚类。
+        与逐条去重的区别：相似关系可传递（A≈B、B≈C时只保留一个），保留的是簇内优先级最高的项目。
+
+        Args:
+            items: 待去重的项目列表
+            title_key: 标题字段名
+            url_key: URL字段名
+            priority_key: 优先级字段名（可选，数字越小越优先），不提供时每簇保留最靠前的项目
+            block_size: 相似度矩阵分块行数（控制内存占用）
+
+        Returns:
+            去重后的项目列表（保持输入顺序）
+        """
+        logger.info(f"开始批量去重，原始项目数: {len(items)}")
+
+        candidates = []
+        batch_urls = FingerprintSet()
+        for item in items:
+            url = item.get(url_key, '')
+            # 没有URL的项目只按标题去重
+            if url and (self.is_duplicate_url(url) or not batch_urls.add_url(url)):
+                continue
+            if self.seen_titles and self.is_duplicate_title(item.get(title_key, '')):
+                continue
+            candidates.append(item)
+
+        batch = BatchDeduplicator(self.similarity_threshold, block_size)
+        priorities = [item.get(priority_key, 0) for item in candidates] if priority_key else None
+        keep = batch.select([item.get(title_key, '') for item in candidates], priorities)
+
+        deduplicated = [candidates[i] for i in keep]
+        for item in deduplicated:
+            self.add_content(item.get(title_key, ''), item.get(url_key, ''))
+
+        logger.info(f"批量去重完成，剩余项目数: {len(deduplicated)}（去除{len(items) - len(deduplicated)}个重复）")
+        return deduplicated
+
     def reset(self):
         """重置去重器"""
         self.seen_urls.clear()
         self.seen_titles.clear()
+        if self.index is not None:
+            self.index.clear()
+        self._last_signature = None
+        self._load_store()
         logger.info("去重器已重置")
 
 
@@ -167,3 +303,46 @@ if __name__ == '__main__':
     print("去重后的项目:")
     for item in unique_items:
         print(f"  - {item['title']}")
+
+    # 基准测试：合成带标注的标题样本（同一事件的改写版本为重复），对比逐一比较与MinHash索引
+    import time
+    import random
+
+    rng = random.Random(42)
+    subjects = ['OpenAI', '英伟达', '苹果', '特斯拉', '微软', '谷歌', '字节跳动', '阿里巴巴', '腾讯', 'Meta', '小米', '华为']
+    actions = ['发布', '推出', '宣布', '上线', '开源', '升级', '收购', '投资']
+    objects = ['新一代大模型', 'AI芯片', '智能手机', '自动驾驶系统', '云计算平台', '开发者工具', '搜索引擎', '机器人']
+    suffixes = ['', '，性能大幅提升', '，价格下调', '，引发行业关注', '，首批用户已可体验']
+
+    def variant(base: str) -> str:
+        choice = rng.random()
+        if choice < 0.3:
+            return base + rng.choice(['', '！', '（附详情）', '最新消息'])
+        if choice < 0.6:
+            i = rng.randrange(len(base))
+            return base[:i] + rng.choice('的了新版') + base[i + 1:]
+        return rng.choice(['快讯：', '独家｜', '']) + base
+
+    # 加入随机话题词，使标题词汇接近真实新闻的多样性
+    topic_chars = '数据安全模型算力市场用户平台服务产品技术生态合作监管融资芯片手机汽车能源医疗教育金融游戏视频'
+    bases = []
+    for _ in range(2000):
+        topic = ''.join(rng.choice(topic_chars) for _ in range(rng.randrange(2, 5)))
+        bases.append(f"{rng.choice(subjects)}{rng.choice(actions)}{topic}{rng.choice(objects)}{rng.choice(suffixes)}")
+    sample = []
+    for base in bases:
+        sample.append(base)
+        sample.extend(variant(base) for _ in range(rng.randrange(0, 4)))
+    rng.shuffle(sample)
+    bench_items = [{'title': title, 'url': f'https://example.com/{i}'} for i, title in enumerate(sample)]
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"\n基准测试：{len(bench_items)}个标题（{len(bases)}个事件）")
+    results = {}
+    for mode in ('linear', 'minhash'):
+        start = time.perf_counter()
+        kept = ContentDeduplicator(0.8, index=mode).deduplicate(bench_items)
+        elapsed = time.perf_counter() - start
+        results[mode] = [item['url'] for item in kept]
+        print(f"  {mode:>8}: 保留{len(kept)}条，耗时{elapsed:.2f}秒")
+    print(f"  结果一致: {results['linear'] == results['minhash']}")
@@ -0,0 +1,205 @@
+"""
+RSS源健康跟踪 - 熔断器与自适应轮询
+记录每个源的连续失败次数、滚动失败率、延迟EWMA和bozo率，
+持续失败的源在冷却期内跳过，长期不更新的源降低轮询频率
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from storage import FeedStateStore
+
+logger = logging.getLogger(__name__)
+
+
+class FeedHealthTracker:
+    """RSS源健康跟踪器"""
+
+    def __init__(
+        self,
+        state_store: Optional[FeedStateStore] = None,
+        failure_threshold: int = 3,
+        cooldown_minutes: int = 60,
+        max_cooldown_minutes: int = 24 * 60,
+        min_poll_minutes: int = 60,
+        max_poll_minutes: int = 24 * 60,
+        window_size: int = 20,
+        ewma_alpha: float = 0.3,
+        schedule_tolerance_minutes: int = 60
+    ):
+        """
+        初始化RSS源健康跟踪器
+
+        Args:
+            state_store: RSS源状态存储（可选），提供时健康数据随状态一起持久化
+            failure_threshold: 连续失败多少次后熔断
+            cooldown_minutes: 首次熔断的冷却时间（分钟），之后每次翻倍
+            max_cooldown_minutes: 冷却时间上限（分钟）
+            min_poll_minutes: 自适应轮询的基础间隔（分钟）
+            max_poll_minutes: 自适应轮询间隔上限（分钟）
+            window_size: 滚动失败率的窗口大小（最近N次获取）
+            ewma_alpha: EWMA平滑系数（越大越偏重最近的获取）
+            schedule_tolerance_minutes: 调度容差（分钟），距离冷却/轮询截止不超过该时间时视为已到期。
+                定时任务每天启动时间有几分钟到几十分钟的漂移，没有容差时24小时上限的源会因为
+                本次比上次早启动几分钟而多跳过一整天
+        """
+        self.state_store = state_store
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown_minutes * 60
+        self.max_cooldown = max_cooldown_minutes * 60
+        self.min_poll = min_poll_minutes * 60
+        self.max_poll = max_poll_minutes * 60
+        self.window_size = window_size
+        self.alpha = ewma_alpha
+        self.tolerance = schedule_tolerance_minutes * 60
+
+        # 无状态存储时仅在内存中跟踪
+        self._memory: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, url: str) -> Dict:
+        """读取某个源的健康数据"""
+        if self.state_store:
+            return dict(self.state_store.get(url).get('health', {}))
+        with self._lock:
+            return dict(self._memory.get(url, {}))
+
+    def _set(self, url: str, health: Dict):
+        """写入某个源的健康数据"""
+        if self.state_store:
+            self.state_store.update(url, health=health)
+        else:
+            with self._lock:
+                self._memory[url] = health
+
+    def _ewma(self, old: Optional[float], value: float) -> float:
+        """指数加权移动平均"""
+        return value if old is None else self.alpha * value + (1 - self.alpha) * old
+
+    def should_fetch(self, url: str, now: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        判断本次是否获取该源
+
+        Args:
+            url: RSS地址
+            now: 当前时间戳（可选）
+
+        Returns:
+            (是否获取, 跳过原因)
+        """
+        now = now if now is not None else time.time()
+        health = self._get(url)
+
+        # 截止时间在容差内的视为已到期（定时任务启动时间漂移）
+        deadline = now + self.tolerance
+        if health.get('open_until', 0) > deadline:
+            return False, f"熔断中（连续失败{health.get('failures', 0)}次）"
+        if health.get('next_poll', 0) > deadline:
+            return False, f"自适应轮询（连续{health.get('idle_streak', 0)}次无更新）"
+        return True, ''
+
+    def record_success(
+        self,
+        url: str,
+        latency: float,
+        bozo: bool = False,
+        has_new: bool = True,
+        now: Optional[float] = None
+    ):
+        """
+        记录一次成功获取
+
+        Args:
+            url: RSS地址
+            latency: 下载耗时（秒）
+            bozo: 解析是否有警告
+            has_new: 是否有新条目（304或无新条目时为False）
+            now: 当前时间戳（可选）
+        """
+        now = now if now is not None else time.time()
+        health = self._get(url)
+
+        health['failures'] = 0
+        health['open_until'] = 0
+        health['recent'] = (health.get('recent', []) + [0])[-self.window_size:]
+        health['bozo_rate'] = self._ewma(health.get('bozo_rate'), 1.0 if bozo else 0.0)
+        self._record_cost(health, latency)
+
+        # 自适应轮询：有新内容时恢复正常，连续无更新时间隔翻倍
+        if has_new:
+            health['idle_streak'] = 0
+            health['next_poll'] = 0
+        else:
+            health['idle_streak'] = health.get('idle_streak', 0) + 1
+            interval = min(self.min_poll * 2 ** (health['idle_streak'] - 1), self.max_poll)
+            health['next_poll'] = now + interval
+
+        self._set(url, health)
+
+    def record_failure(self, url: str, latency: float, error: str = '', now: Optional[float] = None):
+        """
+        记录一次失败获取（超时、HTTP错误、无法解析）
+
+        Args:
+            url: RSS地址
+            latency: 失败前消耗的时间（秒）
+            error: 错误描述
+            now: 当前时间戳（可选）
+        """
+        now = now if now is not None else time.time()
+        health = self._get(url)
+
+        health['failures'] = health.get('failures', 0) + 1
+        health['recent'] = (health.get('recent', []) + [1])[-self.window_size:]
+        health['last_error'] = error[:200]
+        self._record_cost(health, latency)
+
+        # 熔断：达到阈值后进入冷却期，之后每次失败冷却时间翻倍
+        over = health['failures'] - self.failure_threshold
+        if over >= 0:
+            cooldown = min(self.cooldown * 2 ** over, self.max_cooldown)
+            health['open_until'] = now + cooldown
+            logger.warning(f"RSS源熔断{cooldown / 60:.0f}分钟（连续失败{health['failures']}次）: {url}")
+
+        self._set(url, health)
+
+    def _record_cost(self, health: Dict, latency: float):
+        """累计耗时统计"""
+        health['latency_ewma'] = self._ewma(health.get('latency_ewma'), latency)
+        health['fetches'] = health.get('fetches', 0) + 1
+        health['total_time'] = health.get('total_time', 0.0) + latency
+
+    def stats(self, urls: List[str]) -> List[Dict]:
+        """
+        获取各源的健康统计（按平均耗时从高到低排序）
+
+        Args:
+            urls: RSS地址列表
+
+        Returns:
+            统计列表，包含失败次数、失败率、延迟EWMA、bozo率、熔断截止时间等
+        """
+        result = []
+        for url in urls:
+            health = self._get(url)
+            if not health:
+                continue
+
+            recent = health.get('recent', [])
+            result.append({
+                'url': url,
+                'failures': health.get('failures', 0),
+                'failure_rate': sum(recent) / len(recent) if recent else 0.0,
+                'latency_ewma': health.get('latency_ewma', 0.0),
+                'bozo_rate': health.get('bozo_rate', 0.0),
+                'fetches': health.get('fetches', 0),
+                'total_time': health.get('total_time', 0.0),
+                'open_until': health.get('open_until', 0),
+                'next_poll': health.get('next_poll', 0),
+                'last_error': health.get('last_error', '')
+            })
+
+        result.sort(key=lambda x: x['latency_ewma'], reverse=True)
+        return result
@@ -0,0 +1,280 @@
+"""
+RSS源注册表 - 从配置文件或OPML导入RSS源，支持数千个源
+按URL索引、按分类分组，查找和遍历均为O(1)/O(n)
+"""
+
+import os
+import time
+import yaml
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, List, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 配置文件缺失时使用的内置RSS源（可靠的中英文科技新闻源）
+DEFAULT_FEEDS = {
+    'AI科技': [
+        'https://www.36kr.com/feed',  # 36氪
+        'https://www.infoq.cn/feed',  # InfoQ中文
+    ],
+    '国际科技': [
+        'https://techcrunch.com/feed/',  # TechCrunch
+        'https://www.theverge.com/rss/index.xml',  # The Verge
+    ],
+    '开发者资讯': [
+        'https://github.blog/feed/',  # GitHub官方博客
+    ]
+}
+
+
+@dataclass(slots=True)
+class FeedSpec:
+    """单个RSS源的配置"""
+
+    url: str
+    category: str
+    name: str = ''
+    priority: int = 5           # 优先级，数字越小越重要
+    poll_interval: int = 0      # 最小轮询间隔（分钟），0表示每次运行都获取
+    max_items: Optional[int] = None  # 每次最多取多少条，None表示使用collect的max_per_feed
+    enabled: bool = True
+
+
+class FeedRegistry:
+    """RSS源注册表"""
+
+    def __init__(self, feeds: Optional[List[FeedSpec]] = None):
+        """
+        初始化RSS源注册表
+
+        Args:
+            feeds: RSS源配置列表（可选）
+        """
+        self._feeds: Dict[str, FeedSpec] = {}
+        self._by_category: Dict[str, List[str]] = {}
+
+        for spec in feeds or []:
+            self.add(spec)
+
+    def add(self, spec: FeedSpec):
+        """
+        注册RSS源（URL重复时以后注册的配置为准）
+
+        Args:
+            spec: RSS源配置
+        """
+        existing = self._feeds.get(spec.url)
+        if existing and existing.category != spec.category:
+            self._by_category[existing.category].remove(spec.url)
+
+        if not existing or existing.category != spec.category:
+            self._by_category.setdefault(spec.category, []).append(spec.url)
+
+        self._feeds[spec.url] = spec
+
+    def get(self, url: str) -> Optional[FeedSpec]:
+        """按URL查找RSS源配置"""
+        return self._feeds.get(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._feeds
+
+    def __len__(self) -> int:
+        return len(self._feeds)
+
+    def __iter__(self) -> Iterator[FeedSpec]:
+        """按分类分组顺序遍历所有启用的RSS源"""
+        for _, specs in self.iter_grouped():
+            yield from specs
+
+    @property
+    def categories(self) -> List[str]:
+        """所有分类（按首次出现顺序）"""
+        return [category for category, urls in self._by_category.items() if urls]
+
+    def iter_category(self, category: str) -> Iterator[FeedSpec]:
+        """
+        遍历某个分类下启用的RSS源
+
+        Args:
+            category: 分类名称
+        """
+        for url in self._by_category.get(category, ()):
+            spec = self._feeds[url]
+            if spec.enabled:
+                yield spec
+
+    def iter_grouped(self) -> Iterator[Tuple[str, Iterator[FeedSpec]]]:
+        """按分类遍历启用的RSS源，产出 (分类, RSS源迭代器)"""
+        for category in self.categories:
+            yield category, self.iter_category(category)
+
+    def is_due(self, spec: FeedSpec, last_fetch: Optional[float], now: Optional[float] = None) -> bool:
+        """
+        判断RSS源是否到了轮询时间
+
+        Args:
+            spec: RSS源配置
+            last_fetch: 上次获取时间（时间戳），None表示从未获取
+            now: 当前时间戳（可选）
+
+        Returns:
+            True表示需要获取
+        """
+        if not spec.poll_interval or not last_fetch:
+            return True
+        now = now if now is not None else time.time()
+        return now - last_fetch >= spec.poll_interval * 60
+
+    def priority_map(self) -> Dict[str, int]:
+        """
+        优先级映射：分类 -> 分类内最高优先级（最小值）
+
+        单个源的优先级由RSSCollector写入Article.priority，这里只用于没有来源优先级的文章。
+
+        Returns:
+            {分类: 优先级}
+        """
+        priorities = {}
+        for spec in self:
+            priorities[spec.category] = min(spec.priority, priorities.get(spec.category, spec.priority))
+        return priorities
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """转换为 {分类: [URL]} 字典（与旧版RSSCollector.feeds格式一致）"""
+        return {category: [spec.url for spec in specs] for category, specs in self.iter_grouped()}
+
+    @classmethod
+    def from_dict(cls, feeds: Dict[str, List[str]]) -> 'FeedRegistry':
+        """
+        从 {分类: [URL]} 字典创建注册表
+
+        Args:
+            feeds: 分类到URL列表的映射
+        """
+        return cls([FeedSpec(url=url, category=category) for category, urls in feeds.items() for url in urls])
+
+    @classmethod
+    def from_yaml(cls, path: str) -> 'FeedRegistry':
+        """
+        从YAML配置文件加载RSS源
+
+        Args:
+            path: 配置文件路径（格式见config/feeds.yaml）
+
+        Returns:
+            RSS源注册表
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+
+        defaults = data.get('defaults', {})
+        registry = cls()
+
+        for category in data.get('categories', []):
+            category_name = category.get('name', '未分类')
+            category_enabled = category.get('enabled', True)
+
+            for item in category.get('feeds', []):
+                if isinstance(item, str):
+                    item = {'url': item}
+                if not item.get('url'):
+                    continue
+
+                registry.add(FeedSpec(
+                    url=item['url'],
+                    category=category_name,
+                    name=item.get('name', ''),
+                    priority=item.get('priority', category.get('priority', defaults.get('priority', 5))),
+                    poll_interval=item.get('poll_interval', defaults.get('poll_interval', 0)),
+                    max_items=item.get('max_items', defaults.get('max_items')),
+                    enabled=category_enabled and item.get('enabled', True)
+                ))
+
+        # 导入OPML文件（路径相对于配置文件所在目录）
+        base_dir = os.path.dirname(path)
+        for opml_path in data.get('opml_imports', []):
+            full_path = opml_path if os.path.isabs(opml_path) else os.path.join(base_dir, opml_path)
+            registry.import_opml(
+                full_path,
+                priority=defaults.get('priority', 5),
+                poll_interval=defaults.get('poll_interval', 0),
+                max_items=defaults.get('max_items')
+            )
+
+        logger.info(f"RSS源注册表加载成功: {path}（{len(registry)}个源，{len(registry.categories)}个分类）")
+        return registry
+
+    def import_opml(
+        self,
+        path: str,
+        default_category: str = '未分类',
+        priority: int = 5,
+        poll_interval: int = 0,
+        max_items: Optional[int] = None
+    ) -> int:
+        """
+        从OPML文件导入RSS源（分类取自外层outline的标题或category属性）
+
+        Args:
+            path: OPML文件路径
+            default_category: 无分类信息时使用的分类
+            priority: 导入源的优先级
+            poll_interval: 导入源的轮询间隔（分钟）
+            max_items: 导入源每次最多取多少条
+
+        Returns:
+            导入的源数量
+        """
+        root = ET.parse(path).getroot()
+        body = root.find('body')
+        if body is None:
+            logger.warning(f"OPML文件缺少body节点: {path}")
+            return 0
+
+        count = 0
+        # 栈中保存 (outline节点, 所属分类)，避免深层嵌套时递归过深
+        stack = [(outline, default_category) for outline in reversed(list(body))]
+        while stack:
+            outline, category = stack.pop()
+            xml_url = outline.get('xmlUrl')
+
+            if xml_url:
+                self.add(FeedSpec(
+                    url=xml_url,
+                    category=outline.get('category', '').split(',')[0].strip('/ ') or category,
+                    name=outline.get('title') or outline.get('text', ''),
+                    priority=priority,
+                    poll_interval=poll_interval,
+                    max_items=max_items
+                ))
+                count += 1
+            else:
+                group = outline.get('title') or outline.get('text') or category
+                stack.extend((child, group) for child in reversed(list(outline)))
+
+        logger.info(f"从OPML导入{count}个RSS源: {path}")
+        return count
+
+    @classmethod
+    def load(cls, path: str = 'config/feeds.yaml') -> 'FeedRegistry':
+        """
+        加载RSS源注册表，配置文件不存在或加载失败时使用内置RSS源
+
+        Args:
+            path: 配置文件路径
+
+        Returns:
+            RSS源注册表
+        """
+        if os.path.exists(path):
+            try:
+                return cls.from_yaml(path)
+            except Exception as e:
+                logger.error(f"RSS源配置加载失败，使用内置RSS源: {path}, {e}")
+        else:
+            logger.info(f"未找到RSS源配置文件，使用内置RSS源: {path}")
+
+        return cls.from_dict(DEFAULT_FEEDS)
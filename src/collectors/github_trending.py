@@ -3,24 +3,65 @@ GitHub Trending模块 - 获取GitHub热门趋势项目
 """
 
 import os
+import re
+import math
 import time
+import heapq
 import logging
+import threading
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Iterator, Tuple
 from datetime import datetime, timedelta
 
+from storage import DiskCache, RepoSnapshotStore
+from .models import Repo
+
 logger = logging.getLogger(__name__)
 
+# README文件名候选（GraphQL的object表达式区分大小写，按顺序取第一个存在的）
+README_FILENAMES = ('README.md', 'readme.md', 'Readme.md', 'README.rst', 'README.markdown', 'README.txt', 'README')
+
+# 补充信息缓存的版本号（字段变化时递增，使旧缓存失效）
+ENRICH_CACHE_VERSION = 2
+
+
+class GitHubRateLimitError(Exception):
+    """GitHub API速率限制耗尽，且重置时间超过可等待上限"""
+
 
 class GitHubTrendingCollector:
     """GitHub趋势项目收集器"""
 
-    def __init__(self, api_token: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        max_workers: int = 5,
+        pool_size: int = 10,
+        timeout: int = 30,
+        max_rate_wait: int = 60,
+        cache: Optional[DiskCache] = None,
+        snapshots: Optional[RepoSnapshotStore] = None,
+        enrich_cache: Optional[DiskCache] = None,
+        base_url: str = 'https://api.github.com',
+        graphql_url: Optional[str] = None
+    ):
         """
         初始化GitHub趋势收集器
 
         Args:
             api_token: GitHub API Token，如果不提供则从环境变量读取（可选）
+            max_workers: 多语言并发请求的最大线程数
+            pool_size: HTTP连接池大小（对应config.yaml中performance.connection_pool_size）
+            timeout: 单次请求超时（秒）
+            max_rate_wait: 速率限制耗尽时最多等待多少秒（超过则放弃本次请求）
+            cache: 搜索结果磁盘缓存（可选），有效期内直接返回，过期后用ETag重新验证
+            snapshots: 星标快照存储（可选），用于按星标增速排序
+            enrich_cache: 项目补充信息缓存（可选），按项目和pushed_at缓存GraphQL结果
+            base_url: REST API地址（可指向GitHub Enterprise或本地测试服务）
+            graphql_url: GraphQL API地址（默认为base_url下的/graphql）
         """
         self.api_token = api_token or os.getenv('GITHUB_API_TOKEN')
 
@@ -31,19 +72,308 @@ class GitHubTrendingCollector:
         if self.api_token:
             self.headers['Authorization'] = f'token {self.api_token}'
 
-        self.base_url = 'https://api.github.com'
+        # 所有请求共享一个带连接池的Session
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.base_url = base_url.rstrip('/')
+        self.graphql_url = graphql_url or f'{self.base_url}/graphql'
         self.max_retries = 3
         self.retry_delay = 5
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_rate_wait = max_rate_wait
+        self.cache = cache
+        self.snapshots = snapshots
+        self.enrich_cache = enrich_cache
+
+        # 速率限制状态（来自X-RateLimit-Remaining / X-RateLimit-Reset响应头）
+        self._rate_lock = threading.Lock()
+        self._rate_remaining: Optional[int] = None
+        self._rate_reset: float = 0.0
 
         logger.info("GitHub趋势收集器初始化成功")
 
+    def _update_rate_limit(self, response: requests.Response):
+        """根据响应头更新速率限制状态"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+
+        with self._rate_lock:
+            self._rate_remaining = int(remaining)
+            self._rate_reset = float(reset)
+
+    def _acquire_rate_slot(self):
+        """
+        发送请求前占用一个速率配额，配额耗尽时等待到重置时间
+
+        Raises:
+            GitHubRateLimitError: 需要等待的时间超过max_rate_wait
+        """
+        with self._rate_lock:
+            if self._rate_remaining is not None and self._rate_remaining <= 0:
+                wait_seconds = self._rate_reset - time.time() + 1
+                if wait_seconds > self.max_rate_wait:
+                    raise GitHubRateLimitError(f"速率限制已耗尽，{wait_seconds:.0f}秒后重置")
+                if wait_seconds > 0:
+                    # 持锁等待，其他线程也会排在重置之后
+                    logger.warning(f"GitHub速率限制已耗尽，等待{wait_seconds:.0f}秒后重置")
+                    time.sleep(wait_seconds)
+                self._rate_remaining = None
+
+            if self._rate_remaining is not None:
+                self._rate_remaining -= 1
+
+    def _rate_limit_wait(self, response: requests.Response) -> Optional[float]:
+        """
+        判断响应是否为速率限制拒绝，返回建议等待秒数
+
+        Returns:
+            等待秒数，非速率限制响应时返回None
+        """
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            return float(retry_after)
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = float(response.headers.get('X-RateLimit-Reset', time.time()))
+            return max(reset - time.time(), 0) + 1
+
+        return None
+
+    @staticmethod
+    def _cache_key(url: str, params: Dict) -> str:
+        """
+        生成规范化的缓存键（查询词去除多余空白并排序，GitHub搜索限定词与顺序无关）
+        """
+        normalized = {str(k).lower(): str(v) for k, v in params.items()}
+        if 'q' in normalized:
+            normalized['q'] = ' '.join(sorted(normalized['q'].split()))
+        return DiskCache.make_key(url, normalized)
+
+    def _search(self, params: Dict) -> Dict:
+        """
+        调用搜索API（优先使用缓存）
+
+        缓存有效期内直接返回；过期但有ETag时发送If-None-Match重新验证，
+        304响应不消耗速率配额，直接续期缓存。
+
+        Args:
+            params: /search/repositories 查询参数
+
+        Returns:
+            API返回的JSON
+        """
+        if not self.cache:
+            return self._request_search(params)
+
+        key = self._cache_key(f"{self.base_url}/search/repositories", params)
+        entry = self.cache.get_entry(key)
+        if entry and self.cache.is_fresh(entry):
+            logger.info(f"命中GitHub搜索缓存: {params.get('q')}")
+            return entry['value']
+
+        etag = entry.get('meta', {}).get('etag') if entry else None
+        data, new_etag = self._request_search(params, etag=etag, with_etag=True)
+
+        if data is None:
+            # 304：内容未变化，续期缓存
+            logger.info(f"GitHub搜索结果未变化（304），续期缓存: {params.get('q')}")
+            data = entry['value']
+
+        self.cache.set(key, data, etag=new_etag or etag)
+        return data
+
+    def _request_search(self, params: Dict, etag: Optional[str] = None, with_etag: bool = False):
+        """
+        请求搜索API（共享连接池，按速率限制调度，网络错误和5xx指数退避重试）
+
+        Args:
+            params: /search/repositories 查询参数
+            etag: 上次响应的ETag（可选），提供时发送条件请求
+            with_etag: 是否同时返回响应ETag
+
+        Returns:
+            API返回的JSON（304时为None）；with_etag为True时返回 (JSON, ETag)
+
+        Raises:
+            GitHubRateLimitError: 速率限制无法在max_rate_wait内恢复
+            requests.RequestException: 4xx错误，或重试后仍然失败
+        """
+        url = f"{self.base_url}/search/repositories"
+
+        for attempt in range(1, self.max_retries + 1):
+            self._acquire_rate_slot()
+            try:
+                headers = {'If-None-Match': etag} if etag else None
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+                self._update_rate_limit(response)
+
+                if response.status_code == 304 and etag:
+                    return (None, response.headers.get('ETag')) if with_etag else None
+
+                # 速率限制：按服务器给出的重置时间调度，而不是固定间隔重试
+                wait_seconds = self._rate_limit_wait(response)
+                if wait_seconds is not None and attempt < self.max_retries:
+                    if wait_seconds > self.max_rate_wait:
+                        raise GitHubRateLimitError(f"速率限制，需等待{wait_seconds:.0f}秒")
+                    logger.warning(f"触发GitHub速率限制，{wait_seconds:.0f}秒后重试")
+                    time.sleep(wait_seconds)
+                    continue
+
+                response.raise_for_status()
+                data = response.json()
+                return (data, response.headers.get('ETag')) if with_etag else data
+
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                # 4xx为请求本身的问题，重试无意义
+                status = e.response.status_code if getattr(e, 'response', None) is not None else None
+                if (status is not None and status < 500) or attempt >= self.max_retries:
+                    raise
+
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                logger.warning(f"GitHub请求失败 (尝试 {attempt}/{self.max_retries})，{delay}秒后重试: {str(e)}")
+                time.sleep(delay)
+
+        raise GitHubRateLimitError("速率限制重试次数已用尽")
+
+    @staticmethod
+    def _trending_query(language: Optional[str], days: int, min_stars: int) -> str:
+        """
+        构建趋势搜索查询
+
+        使用pushed（最近更新）而非created（新创建），获取活跃的成熟项目
+        """
+        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        query = f"pushed:>{since_date} stars:>={min_stars}"
+        if language:
+            query += f" language:{language}"
+        return query
+
+    @staticmethod
+    def _rising_query(language: Optional[str], days: int, min_stars: int) -> str:
+        """
+        构建增速候选搜索查询
+
+        使用created（最近创建），候选是正在快速积累星标的新项目，而不是星标总数最多的老牌项目
+        """
+        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        query = f"created:>{since_date} stars:>={min_stars}"
+        if language:
+            query += f" language:{language}"
+        return query
+
+    def iter_search(
+        self,
+        query: str,
+        per_page: int = 30,
+        max_pages: int = 10,
+        first_page: Optional[Dict] = None
+    ) -> Iterator[Repo]:
+        """
+        分页流式搜索（按星标倒序），只有消费到下一页时才发起请求
+
+        Args:
+            query: 搜索查询
+            per_page: 每页条数（最大100）
+            max_pages: 最多请求多少页（GitHub搜索最多返回前1000条）
+            first_page: 已获取的第一页数据（可选，用于并发预取）
+
+        Yields:
+            Repo记录
+        """
+        per_page = min(per_page, 100)
+        max_pages = min(max_pages, math.ceil(1000 / per_page))
+
+        for page in range(1, max_pages + 1):
+            if page == 1 and first_page is not None:
+                data = first_page
+            else:
+                try:
+                    data = self._search({
+                        'q': query,
+                        'sort': 'stars',
+                        'order': 'desc',
+                        'per_page': per_page,
+                        'page': page
+                    })
+                except Exception as e:
+                    logger.error(f"分页搜索失败（第{page}页）: {query}, {str(e)}")
+                    return
+
+            items = data.get('items', [])
+            for item in items:
+                yield Repo.from_api(item)
+
+            if len(items) < per_page or page * per_page >= data.get('total_count', 0):
+                return
+
+    def get_global_trending(
+        self,
+        languages: List[str],
+        days: int = 7,
+        top_n: int = 10,
+        min_stars: int = 50
+    ) -> List[Repo]:
+        """
+        跨语言获取全局前N个趋势项目（按星标）
+
+        每种语言是一个按星标倒序的分页流，用堆进行多路归并；
+        一旦全局前N确定就停止，不会为每种语言都拉取N条。
+
+        Args:
+            languages: 编程语言列表（为空表示不限语言）
+            days: 趋势时间范围（天）
+            top_n: 全局返回前N个项目
+            min_stars: 最低stars要求
+
+        Returns:
+            全局前N个项目（按星标倒序）
+        """
+        languages = languages or [None]
+        # 每页大小取平均每种语言所需条数，多数语言只需一页
+        per_page = min(100, max(10, math.ceil(top_n / len(languages)) + 5))
+        max_pages = math.ceil(top_n / per_page)
+
+        logger.info(f"获取全局趋势项目: languages={languages}, top_n={top_n}, per_page={per_page}")
+
+        queries = [self._trending_query(language, days, min_stars) for language in languages]
+
+        # 并发预取各语言第一页，后续页按需拉取
+        def fetch_first(query):
+            try:
+                return self._search({'q': query, 'sort': 'stars', 'order': 'desc', 'per_page': per_page, 'page': 1})
+            except Exception as e:
+                logger.error(f"获取趋势项目失败: {query}, {str(e)}")
+                return {'items': []}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            first_pages = list(executor.map(fetch_first, queries))
+
+        streams = [
+            self.iter_search(query, per_page, max_pages, first_page)
+            for query, first_page in zip(queries, first_pages)
+        ]
+        projects = list(islice(heapq.merge(*streams, key=lambda repo: -repo.stars), top_n))
+
+        logger.info(f"成功获取{len(projects)}个全局趋势项目")
+        return projects
+
     def get_trending(
         self,
         language: Optional[str] = None,
         days: int = 7,
         top_n: int = 10,
         min_stars: int = 50  # 最低stars门槛，确保项目质量
-    ) -> List[Dict]:
+    ) -> List[Repo]:
         """
         获取GitHub趋势项目（基于最近活跃度和受欢迎程度）
 
@@ -54,70 +384,36 @@ class GitHubTrendingCollector:
             min_stars: 最低stars要求（默认50，确保项目质量）
 
         Returns:
-            趋势项目列表
+            趋势项目列表（Repo记录，兼容字典访问）
         """
         logger.info(f"获取GitHub趋势项目: language={language}, days={days}, top_n={top_n}, min_stars={min_stars}")
 
-        # 计算日期范围
-        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        query = self._trending_query(language, days, min_stars)
 
-        # 构建搜索查询
-        # 使用pushed（最近更新）而非created（新创建），获取活跃的成熟项目
-        query = f"pushed:>{since_date} stars:>={min_stars}"
-        if language:
-            query += f" language:{language}"
+        try:
+            data = self._search({
+                'q': query,
+                'sort': 'stars',
+                'order': 'desc',
+                'per_page': top_n
+            })
+        except Exception as e:
+            logger.error(f"获取趋势项目失败: {str(e)}")
+            return []
 
-        for attempt in range(self.max_retries):
-            try:
-                # GitHub搜索API
-                url = f"{self.base_url}/search/repositories"
-                params = {
-                    'q': query,
-                    'sort': 'stars',
-                    'order': 'desc',
-                    'per_page': top_n
-                }
-
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                response.raise_for_status()
+        projects = [Repo.from_api(item) for item in data.get('items', [])]
 
-                data = response.json()
-                projects = []
-
-                for item in data.get('items', []):
-                    project = {
-                        'name': item['name'],
-                        'full_name': item['full_name'],
-                        'description': item.get('description', '无描述'),
-                        'url': item['html_url'],
-                        'stars': item['stargazers_count'],
-                        'language': item.get('language', '未知'),
-                        'created_at': item['created_at'],
-                        'topics': item.get('topics', [])
-                    }
-                    projects.append(project)
-
-                logger.info(f"成功获取{len(projects)}个趋势项目")
-                return projects
-
-            except Exception as e:
-                logger.error(f"获取趋势项目失败 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error("获取趋势项目失败，已达最大重试次数")
-                    return []
-
-        return []
+        logger.info(f"成功获取{len(projects)}个趋势项目")
+        return projects
 
     def get_trending_by_languages(
         self,
         languages: List[str],
         days: int = 7,
         top_n_per_language: int = 5
-    ) -> Dict[str, List[Dict]]:
+    ) -> Dict[str, List[Repo]]:
         """
-        按多种语言获取趋势项目
+        按多种语言并发获取趋势项目（共享连接池，按速率限制调度）
 
         Args:
             languages: 编程语言列表
@@ -125,24 +421,291 @@ class GitHubTrendingCollector:
             top_n_per_language: 每种语言返回的项目数
 
         Returns:
-            按语言分组的趋势项目字典
+            按语言分组的趋势项目字典（顺序与languages一致）
         """
-        logger.info(f"按多种语言获取趋势项目: {languages}")
-        results = {}
+        logger.info(f"按多种语言获取趋势项目: {languages}，并发数: {self.max_workers}")
 
-        for i, language in enumerate(languages, 1):
-            logger.info(f"进度: {i}/{len(languages)} - {language}")
-            projects = self.get_trending(language, days, top_n_per_language)
-            results[language] = projects
-
-            # 避免请求过快（GitHub API有速率限制）
-            if i < len(languages):
-                time.sleep(2)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.get_trending, language, days, top_n_per_language)
+                for language in languages
+            ]
+            results = {language: future.result() for language, future in zip(languages, futures)}
 
         logger.info(f"多语言趋势项目获取完成")
         return results
 
-    def get_top_topics(self, topic: str, days: int = 7, top_n: int = 10) -> List[Dict]:
+    def get_velocity_candidates(
+        self,
+        languages: List[str],
+        created_days: int = 30,
+        per_language: int = 30,
+        min_stars: int = 20
+    ) -> List[Repo]:
+        """
+        获取按星标增速排序的候选项目：各语言最近created_days天内创建、星标最多的项目
+
+        新项目星标增长快，且每天的候选大致相同，快照历史可以持续积累；
+        按最近更新+星标总数取候选时只会跟踪增长缓慢的大项目。
+
+        Args:
+            languages: 编程语言列表（为空表示不限语言）
+            created_days: 创建时间范围（天）
+            per_language: 每种语言的候选数
+            min_stars: 最低stars要求
+
+        Returns:
+            候选项目列表（按语言顺序，去除重复）
+        """
+        queries = [self._rising_query(language, created_days, min_stars) for language in languages or [None]]
+        logger.info(f"获取增速候选项目: {len(queries)}个查询，每个{per_language}个，创建时间{created_days}天内")
+
+        def fetch(query):
+            try:
+                data = self._search({'q': query, 'sort': 'stars', 'order': 'desc', 'per_page': min(per_language, 100)})
+            except Exception as e:
+                logger.error(f"获取增速候选项目失败: {query}, {str(e)}")
+                return []
+            return [Repo.from_api(item) for item in data.get('items', [])]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(fetch, queries))
+
+        candidates = {}
+        for projects in results:
+            for project in projects:
+                candidates.setdefault(project.full_name, project)
+
+        logger.info(f"增速候选项目获取完成: {len(candidates)}个")
+        return list(candidates.values())
+
+    def record_snapshots(self, projects: List[Repo]):
+        """
+        记录项目当前星标数到快照存储（未配置快照存储时忽略）
+
+        Args:
+            projects: 项目列表
+        """
+        if self.snapshots and projects:
+            try:
+                self.snapshots.record(projects)
+            except Exception as e:
+                logger.error(f"记录星标快照失败: {str(e)}")
+
+    def prune_snapshots(self, keep_days: float = 90):
+        """
+        删除超过保留期的星标快照（未配置快照存储时忽略），避免数据库无限增长
+
+        Args:
+            keep_days: 保留天数（应不小于增速统计窗口）
+        """
+        if self.snapshots:
+            try:
+                deleted = self.snapshots.prune(keep_days)
+                if deleted:
+                    logger.info(f"删除了{deleted}条超过{keep_days}天的星标快照")
+            except Exception as e:
+                logger.error(f"清理星标快照失败: {str(e)}")
+
+    def rank_by_star_velocity(
+        self,
+        projects: List[Repo],
+        top_n: int = 10,
+        window_days: float = 7
+    ) -> List[Repo]:
+        """
+        按星标增速排序（真正的趋势），增速由本地快照历史计算，不需要额外API调用
+
+        有增长记录的项目按每日增速排序在前，历史不足或无增长的项目按星标总数补位。
+
+        Args:
+            projects: 候选项目列表（应先调用record_snapshots记录本次快照）
+            top_n: 返回前N个项目
+            window_days: 增速统计窗口（天）
+
+        Returns:
+            排序后的项目列表（填充star_velocity/star_acceleration字段）
+        """
+        by_name = {project.full_name: project for project in projects}
+        ranked = []
+
+        if self.snapshots:
+            try:
+                rows = self.snapshots.rank_by_velocity(window_days, top_n=len(by_name), candidates=list(by_name))
+            except Exception as e:
+                logger.error(f"星标增速计算失败，按星标总数排序: {str(e)}")
+                rows = []
+
+            for full_name, _, _, velocity, acceleration in rows:
+                if velocity <= 0:
+                    break
+                project = by_name[full_name]
+                project.star_velocity = velocity
+                project.star_acceleration = acceleration
+                ranked.append(project)
+
+        logger.info(f"{len(ranked)}个项目有星标增长记录，其余按星标总数排序")
+
+        ranked_names = {project.full_name for project in ranked}
+        rest = sorted(
+            (project for project in by_name.values() if project.full_name not in ranked_names),
+            key=lambda x: x.stars,
+            reverse=True
+        )
+        return (ranked + rest)[:top_n]
+
+    @staticmethod
+    def _build_enrich_query(projects: List[Repo]) -> Tuple[str, Dict[str, str]]:
+        """
+        构建批量GraphQL查询（每个项目一个别名，参数通过变量传递）
+
+        Returns:
+            (查询语句, 变量字典)
+        """
+        declarations = []
+        fields = []
+        variables = {}
+
+        for i, project in enumerate(projects):
+            owner, _, name = project.full_name.partition('/')
+            variables[f'o{i}'] = owner
+            variables[f'n{i}'] = name
+            declarations.append(f'$o{i}: String!, $n{i}: String!')
+            fields.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}')
+
+        query = (
+            f"query({', '.join(declarations)}) {{\n  " + '\n  '.join(fields) + "\n}\n"
+            "fragment RepoFields on Repository {\n"
+            "  nameWithOwner\n"
+            "  stargazerCount\n"
+            "  pushedAt\n"
+            "  latestRelease { name tagName publishedAt }\n"
+            "  mentionableUsers { totalCount }\n"
+            + ''.join(
+                f"  readme{i}: object(expression: \"HEAD:{filename}\") {{ ... on Blob {{ text }} }}\n"
+                for i, filename in enumerate(README_FILENAMES)
+            )
+            + "}"
+        )
+        return query, variables
+
+    @staticmethod
+    def _readme_excerpt(text: Optional[str], max_chars: int = 200) -> str:
+        """
+        提取README第一段正文（跳过标题、徽章、图片和HTML）
+
+        Args:
+            text: README原文
+            max_chars: 最大字符数
+        """
+        if not text:
+            return ''
+
+        paragraph = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                if paragraph:
+                    break
+                continue
+            # reStructuredText标题下划线：前面的一行是标题，不是正文
+            if re.fullmatch(r'([=\-~^*+#`])\1{2,}', line):
+                if len(paragraph) == 1:
+                    paragraph = []
+                    continue
+                if paragraph:
+                    break
+                continue
+            if line.startswith(('#', '[![', '![', '<', '---', '```', '|', '.. ')):
+                if paragraph:
+                    break
+                continue
+            paragraph.append(line)
+
+        excerpt = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', ' '.join(paragraph))
+        return excerpt[:max_chars]
+
+    @staticmethod
+    def _enrich_fields(node: Dict) -> Dict:
+        """从GraphQL结果中提取补充字段"""
+        release = node.get('latestRelease') or {}
+        readmes = ((node.get(f'readme{i}') or {}).get('text') for i in range(len(README_FILENAMES)))
+        readme = next((text for text in readmes if text), None)
+        return {
+            'latest_release': release.get('tagName') or release.get('name'),
+            'mentionable_users': (node.get('mentionableUsers') or {}).get('totalCount'),
+            'readme_excerpt': GitHubTrendingCollector._readme_excerpt(readme)
+        }
+
+    @staticmethod
+    def _enrich_key(project: Repo) -> str:
+        """补充信息缓存键（项目未推送新提交时一直有效）"""
+        return DiskCache.make_key(project.full_name, project.pushed_at, ENRICH_CACHE_VERSION)
+
+    def enrich_repos(self, projects: List[Repo], batch_size: int = 20) -> List[Repo]:
+        """
+        批量补充项目信息（最新版本、可提及用户数、README摘要），每批一次GraphQL请求
+
+        已缓存且pushed_at未变化的项目不会再次请求；星标增长由快照存储提供（见rank_by_star_velocity）。
+        GraphQL API需要Token，未配置时跳过。
+
+        Args:
+            projects: 项目列表（原地填充补充字段）
+            batch_size: 每次GraphQL查询包含的项目数
+
+        Returns:
+            同一项目列表
+        """
+        if not self.api_token:
+            logger.info("未配置GitHub Token，跳过GraphQL项目信息补充")
+            return projects
+
+        pending = []
+        for project in projects:
+            cached = None
+            if self.enrich_cache:
+                cached = self.enrich_cache.get(self._enrich_key(project))
+            if cached is not None:
+                for field_name, value in cached.items():
+                    setattr(project, field_name, value)
+            else:
+                pending.append(project)
+
+        logger.info(f"GraphQL补充项目信息: {len(projects)}个项目，缓存命中{len(projects) - len(pending)}个")
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            query, variables = self._build_enrich_query(batch)
+
+            try:
+                response = self.session.post(
+                    self.graphql_url,
+                    json={'query': query, 'variables': variables},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                result = response.json()
+            except Exception as e:
+                logger.error(f"GraphQL请求失败（{len(batch)}个项目）: {str(e)}")
+                continue
+
+            if result.get('errors'):
+                logger.warning(f"GraphQL部分查询出错: {result['errors'][:3]}")
+
+            data = result.get('data') or {}
+            for i, project in enumerate(batch):
+                node = data.get(f'r{i}')
+                if not node:
+                    continue
+                fields = self._enrich_fields(node)
+                for field_name, value in fields.items():
+                    setattr(project, field_name, value)
+                if self.enrich_cache:
+                    self.enrich_cache.set(self._enrich_key(project), fields)
+
+        return projects
+
+    def get_top_topics(self, topic: str, days: int = 7, top_n: int = 10) -> List[Repo]:
         """
         按主题获取趋势项目
 
@@ -159,43 +722,21 @@ class GitHubTrendingCollector:
         since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         query = f"topic:{topic} created:>{since_date}"
 
-        for attempt in range(self.max_retries):
-            try:
-                url = f"{self.base_url}/search/repositories"
-                params = {
-                    'q': query,
-                    'sort': 'stars',
-                    'order': 'desc',
-                    'per_page': top_n
-                }
-
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                response.raise_for_status()
+        try:
+            data = self._search({
+                'q': query,
+                'sort': 'stars',
+                'order': 'desc',
+                'per_page': top_n
+            })
+        except Exception as e:
+            logger.error(f"获取主题项目失败: {str(e)}")
+            return []
 
-                data = response.json()
-                projects = []
-
-                for item in data.get('items', []):
-                    project = {
-                        'name': item['name'],
-                        'full_name': item['full_name'],
-                        'description': item.get('description', '无描述'),
-                        'url': item['html_url'],
-                        'stars': item['stargazers_count'],
-                        'language': item.get('language', '未知'),
-                        'topics': item.get('topics', [])
-                    }
-                    projects.append(project)
-
-                logger.info(f"成功获取{len(projects)}个主题项目")
-                return projects
+        projects = [Repo.from_api(item) for item in data.get('items', [])]
 
-            except Exception as e:
-                logger.error(f"获取主题项目失败 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-
-        return []
+        logger.info(f"成功获取{len(projects)}个主题项目")
+        return projects
 
 
 # 测试代码
@@ -205,6 +746,83 @@ if __name__ == '__main__':
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
+    import sys
+    import json
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    def check_enrichment_with_stub():
+        """GraphQL补充与缓存自检：使用本地桩服务和临时缓存目录，不访问网络"""
+        requests_seen = []
+        readme = 'Demo\n====\n\n.. image:: badge.svg\n\nA tiny demo project written in **rst**.\n'
+        node = {
+            'nameWithOwner': 'octo/demo',
+            'latestRelease': {'name': 'Demo 1.2', 'tagName': 'v1.2.0'},
+            'mentionableUsers': {'totalCount': 42},
+            f'readme{README_FILENAMES.index("README.rst")}': {'text': readme}
+        }
+
+        class StubHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                requests_seen.append((self.path, body))
+                payload = json.dumps({'data': {'r0': node}}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        def demo_repo(pushed_at: str) -> Repo:
+            return Repo('demo', 'octo/demo', None, 'https://github.com/octo/demo', 10, 'Python', pushed_at=pushed_at)
+
+        server = HTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                stub = GitHubTrendingCollector(
+                    api_token='stub',
+                    base_url=f'http://127.0.0.1:{server.server_port}',
+                    enrich_cache=DiskCache(cache_dir, namespace='github_enrich')
+                )
+                # 不使用环境变量中的代理访问本地桩服务
+                stub.session.trust_env = False
+
+                # 首次补充：请求桩服务并解析字段
+                first = demo_repo('2024-01-01')
+                stub.enrich_repos([first])
+                path, body = requests_seen[0]
+                assert path == '/graphql' and body['variables'] == {'o0': 'octo', 'n0': 'demo'}
+                assert first.latest_release == 'v1.2.0'
+                assert first.mentionable_users == 42
+                assert first.readme_excerpt == 'A tiny demo project written in **rst**.'
+
+                # pushed_at未变化：命中缓存，不再请求
+                cached = demo_repo('2024-01-01')
+                stub.enrich_repos([cached])
+                assert len(requests_seen) == 1
+                assert (cached.latest_release, cached.mentionable_users, cached.readme_excerpt) == \
+                    (first.latest_release, first.mentionable_users, first.readme_excerpt)
+
+                # pushed_at变化：缓存失效，重新请求
+                stub.enrich_repos([demo_repo('2024-02-01')])
+                assert len(requests_seen) == 2
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        print("\n=== GraphQL补充自检（本地桩服务）通过 ===")
+        print(f"  最新版本: {first.latest_release}，可提及用户数: {first.mentionable_users}")
+        print(f"  README摘要: {first.readme_excerpt}")
+
+    # 测试GraphQL补充（本地桩服务，不访问网络）；--stub时只运行自检
+    check_enrichment_with_stub()
+    if '--stub' in sys.argv:
+        sys.exit(0)
+
     # 测试GitHub趋势收集
     collector = GitHubTrendingCollector()
 
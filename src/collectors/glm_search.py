@@ -5,23 +5,37 @@ GLM Web Search模块 - 使用智谱AI Web Search功能
 import os
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from zhipuai import ZhipuAI
 
+from storage import LLMResponseCache
+from .rate_limiter import TokenBucket, backoff_delay, is_retryable
+
 logger = logging.getLogger(__name__)
 
 
 class GLMSearchCollector:
     """GLM搜索收集器 - 使用智谱AI的Web Search"""
 
-    def __init__(self, api_key: Optional[str] = None, time_range: str = "24h"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        time_range: str = "24h",
+        max_workers: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
         """
         初始化GLM搜索收集器
 
         Args:
             api_key: GLM API密钥，如果不提供则从环境变量读取
             time_range: 搜索时间范围 (24h=最近24小时, 3d=最近3天, 7d=最近7天)
+            max_workers: 批量搜索的并发线程数
+            rate_limiter: 令牌桶限流器（可选，默认每秒0.5个请求、并发2个）
+            cache: 大模型响应缓存（可选，相同请求直接返回缓存结果）
         """
         self.api_key = api_key or os.getenv('GLM_API_KEY')
         if not self.api_key:
@@ -37,6 +51,9 @@ class GLMSearchCollector:
         self.max_retries = 3     # 最大重试次数
         self.retry_delay = 5     # 重试延迟（秒）
         self.time_range = time_range  # 时间范围
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or TokenBucket(rate=0.5, burst=2, max_concurrent=2)
+        self.cache = cache
 
         logger.info(f"GLM搜索收集器初始化成功，时间范围: {time_range}")
 
@@ -107,28 +124,45 @@ class GLMSearchCollector:
 3. 按发布时间倒序排列（最新的在前）
 4. 格式清晰、易读"""
 
+        request = {
+            'model': self.model,
+            'messages': [
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'tools': [{
+                "type": "web_search",
+                "web_search": {
+                    "enable": True,  # 启用网络搜索
+                    "search_result": True  # 返回搜索结果
+                }
+            }]
+        }
+
+        # 相同请求优先读取响应缓存
+        if self.cache:
+            cached = self.cache.get(request)
+            if cached is not None:
+                return {
+                    'query': query,
+                    'success': True,
+                    'content': cached,
+                    'timestamp': time.time(),
+                    'cached': True
+                }
+
         for attempt in range(self.max_retries):
             try:
-                # 调用GLM API - 使用web_search工具
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                    tools=[{
-                        "type": "web_search",
-                        "web_search": {
-                            "enable": True,  # 启用网络搜索
-                            "search_result": True  # 返回搜索结果
-                        }
-                    }]
-                )
+                # 调用GLM API - 使用web_search工具（受令牌桶限流）
+                with self.rate_limiter:
+                    response = self.client.chat.completions.create(**request)
 
                 # 提取回复内容
                 if response and response.choices:
                     content = response.choices[0].message.content
+                    if self.cache:
+                        self.cache.set(request, content)
 
                     logger.info(f"搜索成功: {query}")
                     return {
@@ -148,8 +182,9 @@ class GLMSearchCollector:
 
             except Exception as e:
                 logger.error(f"搜索失败 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                if attempt < self.max_retries - 1 and is_retryable(e):
+                    # 429/5xx：指数退避 + 随机抖动，避免并发请求同时重试
+                    time.sleep(backoff_delay(attempt, self.retry_delay))
                 else:
                     return {
                         'query': query,
@@ -167,26 +202,19 @@ class GLMSearchCollector:
 
     def batch_search(self, queries: List[str], max_results: int = 10) -> List[Dict]:
         """
-        批量搜索
+        并发批量搜索（请求速率和并发数由令牌桶限流器控制）
 
         Args:
             queries: 搜索查询列表
             max_results: 每个查询返回的最大结果数
 
         Returns:
-            搜索结果列表
+            搜索结果列表（与queries顺序一致）
         """
-        logger.info(f"开始批量搜索，共{len(queries)}个查询")
-        results = []
-
-        for i, query in enumerate(queries, 1):
-            logger.info(f"进度: {i}/{len(queries)}")
-            result = self.search(query, max_results)
-            results.append(result)
+        logger.info(f"开始批量搜索，共{len(queries)}个查询，并发数: {self.max_workers}")
 
-            # 避免请求过快
-            if i < len(queries):
-                time.sleep(2)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda query: self.search(query, max_results), queries))
 
         logger.info(f"批量搜索完成，成功{sum(1 for r in results if r['success'])}个")
         return results
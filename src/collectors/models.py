@@ -0,0 +1,109 @@
+"""
+数据模型 - 各收集器共享的紧凑记录类型
+使用__slots__数据类，避免每条记录携带一个字典；派生字段按需计算
+支持与旧版字典格式互相转换，并兼容 item['key'] / item.get('key') 访问方式
+"""
+
+from dataclasses import dataclass, field, fields, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class _DictCompatMixin:
+    """字典风格访问兼容（旧代码使用 item['title'] / item.get('title')）"""
+
+    __slots__ = ()
+
+    # 子类中可按字典键访问的派生属性
+    _derived_keys: tuple = ()
+
+    def _has_key(self, key: str) -> bool:
+        return key in self.__dataclass_fields__ or key in self._derived_keys
+
+    def __getitem__(self, key: str) -> Any:
+        if not self._has_key(key):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return self._has_key(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """同dict.get"""
+        return getattr(self, key) if self._has_key(key) else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（包含派生字段，与旧版字典格式一致）"""
+        data = asdict(self)
+        for key in self._derived_keys:
+            data[key] = getattr(self, key)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """从字典创建（忽略派生字段和未知字段）"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+@dataclass(slots=True)
+class Article(_DictCompatMixin):
+    """RSS文章"""
+
+    title: str
+    summary: str
+    link: str
+    published: datetime
+    category: str
+    source: str
+    guid: str = ''
+    feed_url: str = ''          # 所属RSS源地址（对应feeds.yaml中的url）
+    priority: Optional[int] = None  # 所属RSS源优先级（feeds.yaml中的priority，数字越小越重要）
+    related: List[Dict[str, str]] = field(default_factory=list)  # 同一事件的其他来源报道（source、title、link），故事聚类时填充
+
+    _derived_keys = ('published_str',)
+
+    @property
+    def published_str(self) -> str:
+        """发布时间字符串（按需格式化，被丢弃的文章不会计算）"""
+        return self.published.strftime('%Y-%m-%d %H:%M')
+
+
+@dataclass(slots=True)
+class Repo(_DictCompatMixin):
+    """GitHub项目"""
+
+    name: str
+    full_name: str
+    description: Optional[str]
+    url: str
+    stars: int
+    language: Optional[str]
+    created_at: str = ''
+    pushed_at: str = ''
+    topics: List[str] = field(default_factory=list)
+    star_velocity: Optional[float] = None      # 窗口内平均每日新增星标（需要快照历史）
+    star_acceleration: Optional[float] = None  # 最近增速与之前增速之差
+    latest_release: Optional[str] = None       # 最新发布版本（GraphQL补充）
+    mentionable_users: Optional[int] = None    # 可提及用户数（提交过代码、issue或PR的用户，近似社区规模；GraphQL补充）
+    readme_excerpt: Optional[str] = None       # README摘要（GraphQL补充）
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> 'Repo':
+        """
+        从GitHub搜索API返回的条目创建
+
+        Args:
+            item: /search/repositories 返回的items元素
+        """
+        return cls(
+            name=item['name'],
+            full_name=item['full_name'],
+            description=item.get('description', '无描述'),
+            url=item['html_url'],
+            stars=item['stargazers_count'],
+            language=item.get('language', '未知'),
+            created_at=item.get('created_at', ''),
+            pushed_at=item.get('pushed_at', ''),
+            topics=item.get('topics', [])
+        )
@@ -0,0 +1,100 @@
+"""
+限流与重试工具 - 令牌桶限流器（每秒请求数 + 并发上限）和带抖动的指数退避
+"""
+
+import time
+import random
+import threading
+from typing import Optional
+
+
+class TokenBucket:
+    """令牌桶限流器"""
+
+    def __init__(self, rate: float = 1.0, burst: int = 1, max_concurrent: int = 2):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（即长期平均每秒请求数）
+            burst: 桶容量（允许的瞬时突发请求数）
+            max_concurrent: 同时进行中的请求数上限
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max(1, max_concurrent))
+
+    def _take_token(self) -> float:
+        """尝试取一个令牌，返回需要等待的秒数（0表示已取到）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """占用一个并发名额并等待令牌（阻塞）"""
+        self._in_flight.acquire()
+        try:
+            while True:
+                wait_seconds = self._take_token()
+                if wait_seconds <= 0:
+                    return
+                time.sleep(wait_seconds)
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+    def release(self):
+        """释放并发名额"""
+        self._in_flight.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    指数退避 + 全抖动（full jitter）
+
+    Args:
+        attempt: 第几次重试（从0开始）
+        base: 基础延迟（秒）
+        cap: 最大延迟（秒）
+
+    Returns:
+        在 [0, min(cap, base * 2^attempt)] 内均匀随机的等待秒数
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """从SDK/HTTP异常中提取HTTP状态码（没有时返回None）"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    判断异常是否值得重试：429限流、5xx服务端错误、无状态码的网络/超时错误可重试，
+    其余4xx（参数错误、鉴权失败等）重试无意义
+    """
+    status = get_status_code(error)
+    if status is None:
+        return True
+    return status == 429 or status >= 500
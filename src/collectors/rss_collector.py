@@ -3,109 +3,490 @@ RSS新闻收集器 - 从可靠的RSS源获取新闻
 解决GLM搜索日期不可靠的问题
 """
 
+import time
+import heapq
 import feedparser
 import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import List, Dict
+from operator import itemgetter
+from typing import List, Dict, Tuple, Optional, Set, Iterator
 from dateutil import parser as date_parser
 
+from storage import FeedStateStore
+from .date_extractor import DateExtractor
+from .feed_registry import FeedRegistry
+from .feed_health import FeedHealthTracker
+from .models import Article
+from .url_canonical import FingerprintSet
+
 logger = logging.getLogger(__name__)
 
 
 class RSSCollector:
     """RSS新闻收集器"""
 
-    def __init__(self):
-        """初始化RSS收集器"""
-        # 配置可靠的中文科技新闻源
-        self.feeds = {
-            'AI科技': [
-                'https://www.36kr.com/feed',  # 36氪
-                'https://www.infoq.cn/feed',  # InfoQ中文
-            ],
-            '国际科技': [
-                'https://techcrunch.com/feed/',  # TechCrunch
-                'https://www.theverge.com/rss/index.xml',  # The Verge
-            ],
-            '开发者资讯': [
-                'https://github.blog/feed/',  # GitHub官方博客
-            ]
-        }
-
-        logger.info("RSS收集器初始化成功")
-
-    def collect(self, hours: int = 24, max_per_feed: int = 10) -> List[Dict]:
+    def __init__(
+        self,
+        max_workers: int = 5,
+        timeout: int = 15,
+        deadline: int = 60,
+        state_store: Optional[FeedStateStore] = None,
+        registry: Optional[FeedRegistry] = None,
+        health: Optional[FeedHealthTracker] = None,
+        stale_date_days: Optional[int] = None
+    ):
         """
-        收集最近N小时的RSS文章
+        初始化RSS收集器
 
         Args:
-            hours: 时间范围（小时）
-            max_per_feed: 每个RSS源最多取多少条
+            max_workers: 并发下载的最大线程数（对应config.yaml中performance.max_workers）
+            timeout: 单个RSS源的网络超时（秒）
+            deadline: 所有RSS源下载的全局截止时间（秒）
+            state_store: RSS源状态存储（可选），提供时使用ETag/Last-Modified条件请求
+            registry: RSS源注册表（可选），默认从config/feeds.yaml加载
+            health: RSS源健康跟踪器（可选），默认基于state_store创建
+            stale_date_days: 旧闻过滤天数（可选，默认不过滤），标题和摘要提到的带年份日期都比发布时间早这么多天时丢弃，
+                周年纪念、回顾类文章也会被丢弃，丢弃的文章记录在INFO日志中
+        """
+        self.registry = registry or FeedRegistry.load()
+
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.deadline = deadline
+        # 沿用feedparser默认UA，保持与feedparser.parse(url)一致的请求特征
+        self.headers = {'User-Agent': feedparser.USER_AGENT}
+        self.state_store = state_store
+        self.health = health or FeedHealthTracker(state_store)
+        # 增量模式下各源本次收集前的高水位标记，文章实际发送后由advance_high_water推进
+        self._high_water: Dict[str, Optional[Tuple[datetime, Set[str]]]] = {}
+        self.stale_date_days = stale_date_days
+        self.date_extractor = DateExtractor() if stale_date_days else None
+
+        logger.info(f"RSS收集器初始化成功，共{len(self.registry)}个RSS源")
+
+    @property
+    def feeds(self) -> Dict[str, List[str]]:
+        """按分类分组的RSS地址（兼容旧版字典格式）"""
+        return self.registry.to_dict()
+
+    def _fetch_feed(self, url: str) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        下载单个RSS源（带单源超时，有状态存储时发送条件请求）
+
+        Args:
+            url: RSS地址
 
         Returns:
-            文章列表，包含标题、摘要、链接、发布时间、分类
+            (HTTP状态码, 响应体, 响应头) 元组，304时响应体为空
         """
-        logger.info(f"开始收集RSS文章，时间范围: {hours}小时")
+        headers = dict(self.headers)
+        if self.state_store:
+            headers.update(self.state_store.conditional_headers(url))
 
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return 304, b'', {}
+        response.raise_for_status()
+
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+        # 供feedparser解析相对链接
+        response_headers.setdefault('content-location', response.url)
+        return response.status_code, response.content, response_headers
+
+    def _timed_fetch(self, url: str) -> Tuple[Optional[Tuple[int, bytes, Dict[str, str]]], float, Optional[Exception]]:
+        """
+        下载单个RSS源并计时
+
+        Returns:
+            (下载结果, 耗时秒数, 异常)，失败时下载结果为None
+        """
+        start = time.monotonic()
+        try:
+            return self._fetch_feed(url), time.monotonic() - start, None
+        except Exception as e:
+            return None, time.monotonic() - start, e
+
+    def _iter_fetched(self, urls: List[str]) -> Iterator[Tuple[str, Tuple[int, bytes, Dict[str, str], float]]]:
+        """
+        并发下载所有RSS源，按完成顺序逐个产出（受全局截止时间约束），失败和超时计入健康统计
+
+        Args:
+            urls: RSS地址列表
+
+        Yields:
+            (url, (HTTP状态码, 响应体, 响应头, 耗时))，下载失败或超时的源不产出
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {}
+        try:
+            futures = {executor.submit(self._timed_fetch, url): url for url in urls}
+
+            for future in as_completed(list(futures), timeout=self.deadline):
+                # 取出后即释放引用，已处理的响应体不在内存中累积
+                url = futures.pop(future)
+                fetched, latency, error = future.result()
+                if error:
+                    logger.error(f"获取RSS失败: {url}, 错误: {str(error)}")
+                    self.health.record_failure(url, latency, str(error))
+                else:
+                    yield url, (*fetched, latency)
+
+        except FuturesTimeoutError:
+            for url in futures.values():
+                logger.error(f"获取RSS超时（超过全局截止时间{self.deadline}秒）: {url}")
+                self.health.record_failure(url, self.deadline, 'deadline exceeded')
+        finally:
+            # 不等待超时的下载线程，避免拖慢整体流程
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_entries(
+        self,
+        feed,
+        url: str,
+        category: str,
+        cutoff_time: datetime,
+        max_per_feed: int,
+        high_water: Optional[Tuple[datetime, Set[str]]] = None,
+        priority: Optional[int] = None
+    ) -> List[Article]:
+        """
+        从已解析的RSS中提取时间范围内的文章
+
+        Args:
+            feed: feedparser解析结果
+            url: RSS地址
+            category: 分类
+            cutoff_time: 最早发布时间
+            max_per_feed: 每个RSS源最多取多少条
+            high_water: 高水位标记 (最新发布时间, 该时间点已见GUID集合)，
+                提供时只返回比标记更新的文章，忽略cutoff_time
+            priority: RSS源优先级（写入文章，供聚类、去重和预排序使用）
+
+        Returns:
+            文章列表
+        """
         articles = []
 
-        for category, urls in self.feeds.items():
-            for url in urls:
+        for entry in feed.entries:
+            # 解析发布时间
+            pub_date = None
+            if hasattr(entry, 'published_parsed'):
+                pub_date = datetime(*entry.published_parsed[:6])
+            elif hasattr(entry, 'updated_parsed'):
+                pub_date = datetime(*entry.updated_parsed[:6])
+            elif hasattr(entry, 'published'):
                 try:
-                    logger.info(f"正在获取RSS: {url}")
-                    feed = feedparser.parse(url)
-
-                    if feed.bozo:
-                        logger.warning(f"RSS解析警告: {url}, {feed.bozo_exception}")
-
-                    feed_articles = 0
-                    for entry in feed.entries:
-                        # 解析发布时间
-                        pub_date = None
-                        if hasattr(entry, 'published_parsed'):
-                            pub_date = datetime(*entry.published_parsed[:6])
-                        elif hasattr(entry, 'updated_parsed'):
-                            pub_date = datetime(*entry.updated_parsed[:6])
-                        elif hasattr(entry, 'published'):
-                            try:
-                                pub_date = date_parser.parse(entry.published)
-                            except Exception as e:
-                                logger.debug(f"日期解析失败: {entry.get('title', '')}, {e}")
-
-                        if not pub_date:
-                            logger.debug(f"跳过无发布日期的文章: {entry.get('title', '')}")
-                            continue
-
-                        # 时间过滤：只保留指定时间范围内的文章
-                        if pub_date >= cutoff_time:
-                            articles.append({
-                                'title': entry.get('title', '无标题'),
-                                'summary': entry.get('summary', entry.get('description', ''))[:500],
-                                'link': entry.get('link', ''),
-                                'published': pub_date,
-                                'published_str': pub_date.strftime('%Y-%m-%d %H:%M'),
-                                'category': category,
-                                'source': feed.feed.get('title', url)
-                            })
-                            feed_articles += 1
-
-                            if feed_articles >= max_per_feed:
-                                break
-
-                    logger.info(f"从 {url} 获取了 {feed_articles} 篇文章")
-
+                    pub_date = date_parser.parse(entry.published)
                 except Exception as e:
-                    logger.error(f"获取RSS失败: {url}, 错误: {str(e)}")
+                    logger.debug(f"日期解析失败: {entry.get('title', '')}, {e}")
+
+            if not pub_date:
+                logger.debug(f"跳过无发布日期的文章: {entry.get('title', '')}")
+                continue
+
+            entry_id = self._entry_id(entry)
+
+            # 增量模式：只保留高水位标记之后的文章（同一时间点按GUID判断）
+            if high_water:
+                hwm_time, hwm_ids = high_water
+                if pub_date < hwm_time or (pub_date == hwm_time and entry_id in hwm_ids):
+                    continue
+
+            # 时间过滤：只保留指定时间范围内的文章
+            if high_water or pub_date >= cutoff_time:
+                title = entry.get('title', '无标题')
+                summary = entry.get('summary', entry.get('description', ''))[:500]
+
+                # 旧闻过滤：正文只提到很早以前的日期（旧闻重新发布）
+                if self.date_extractor and self.date_extractor.is_stale(
+                    f"{title}\n{summary}", (pub_date - timedelta(days=self.stale_date_days)).date()
+                ):
+                    logger.info(f"跳过旧闻（只提到{self.stale_date_days}天前的日期）: {title} - {url}")
                     continue
 
-        # 按发布时间倒序排序
-        articles.sort(key=lambda x: x['published'], reverse=True)
+                articles.append(Article(
+                    title=title,
+                    summary=summary,
+                    link=entry.get('link', ''),
+                    published=pub_date,
+                    category=category,
+                    source=feed.feed.get('title', url),
+                    guid=entry_id,
+                    feed_url=url,
+                    priority=priority
+                ))
+
+                if len(articles) >= max_per_feed:
+                    break
+
+        return articles
+
+    @staticmethod
+    def _entry_id(entry) -> str:
+        """获取条目唯一标识（优先GUID，其次链接、标题）"""
+        return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+    def _get_high_water(self, url: str) -> Optional[Tuple[datetime, Set[str]]]:
+        """
+        读取RSS源的高水位标记
+
+        Args:
+            url: RSS地址
+
+        Returns:
+            (最新发布时间, 该时间点已见GUID集合)，从未记录时返回None
+        """
+        state = self.state_store.get(url)
+        if not state.get('hwm_published'):
+            return None
+        try:
+            return datetime.fromisoformat(state['hwm_published']), set(state.get('hwm_ids', []))
+        except ValueError:
+            logger.warning(f"高水位标记格式错误，回退到时间窗口: {url}")
+            return None
+
+    def _advance_high_water(
+        self,
+        url: str,
+        high_water: Optional[Tuple[datetime, Set[str]]],
+        articles: List[Article]
+    ):
+        """
+        用本次返回的文章推进RSS源的高水位标记
+
+        Args:
+            url: RSS地址
+            high_water: 原高水位标记
+            articles: 本次返回的文章
+        """
+        if not articles:
+            return
+
+        newest = max(article.published for article in articles)
+        ids = {article.guid for article in articles if article.published == newest}
+
+        if high_water:
+            hwm_time, hwm_ids = high_water
+            if newest < hwm_time:
+                return
+            if newest == hwm_time:
+                ids |= hwm_ids
+
+        self.state_store.update(url, hwm_published=newest.isoformat(), hwm_ids=sorted(ids))
+
+    def advance_high_water(self, articles: List[Article]):
+        """
+        用实际发送的文章推进各源的高水位标记（增量模式，应在筛选完成后调用）
+
+        被裁掉的文章不推进标记；比已发送文章更新的被裁文章会在后续运行中重新收集。
+
+        Args:
+            articles: 实际发送的文章
+        """
+        by_feed: Dict[str, List[Article]] = {}
+        for article in articles:
+            if article.feed_url in self._high_water:
+                by_feed.setdefault(article.feed_url, []).append(article)
+        for url, feed_articles in by_feed.items():
+            self._advance_high_water(url, self._high_water[url], feed_articles)
+
+    def _is_due(self, spec) -> bool:
+        """判断RSS源本次是否需要获取（配置的轮询间隔、熔断、自适应轮询）"""
+        if self.state_store and not self.registry.is_due(spec, self.state_store.get(spec.url).get('last_fetch')):
+            return False
+
+        should_fetch, reason = self.health.should_fetch(spec.url)
+        if not should_fetch:
+            logger.info(f"跳过RSS源（{reason}）: {spec.url}")
+        return should_fetch
+
+    def get_feed_stats(self, top_n: Optional[int] = None) -> List[Dict]:
+        """
+        获取RSS源健康统计（按平均耗时从高到低排序，便于找出最耗时的源）
+
+        Args:
+            top_n: 只返回前N个（可选）
+
+        Returns:
+            统计列表
+        """
+        stats = self.health.stats([spec.url for spec in self.registry])
+        return stats[:top_n] if top_n else stats
+
+    def save_state(self):
+        """
+        持久化RSS源状态
+
+        应在推送成功后调用：推送失败时不保存，重新运行仍会完整获取内容
+        """
+        if self.state_store:
+            self.state_store.save()
+
+    def _process_feed(
+        self,
+        spec,
+        fetched: Tuple[int, bytes, Dict[str, str], float],
+        cutoff_time: datetime,
+        max_per_feed: int,
+        incremental: bool
+    ) -> List[Article]:
+        """
+        解析单个已下载的RSS源，并更新状态存储和健康统计
+
+        Args:
+            spec: RSS源配置
+            fetched: (HTTP状态码, 响应体, 响应头, 耗时)
+            cutoff_time: 最早发布时间
+            max_per_feed: 每个RSS源最多取多少条
+            incremental: 是否为增量模式
+
+        Returns:
+            该源的文章列表
+        """
+        url = spec.url
+        status, body, headers, latency = fetched
+
+        if status == 304:
+            # 源未更新，完全跳过解析
+            logger.info(f"RSS未更新（304），跳过解析: {url}")
+            self.state_store.record_fetch(url, not_modified=True)
+            self.health.record_success(url, latency, has_new=False)
+            return []
+
+        feed = feedparser.parse(body, response_headers=headers)
+
+        if feed.bozo:
+            logger.warning(f"RSS解析警告: {url}, {feed.bozo_exception}")
+            if not feed.entries:
+                self.health.record_failure(url, latency, f"无法解析: {feed.bozo_exception}")
+                return []
+
+        limit = spec.max_items if spec.max_items is not None else max_per_feed
+        high_water = self._get_high_water(url) if incremental else None
+        feed_articles = self._parse_entries(feed, url, spec.category, cutoff_time, limit, high_water, spec.priority)
+
+        if incremental:
+            # 此时不推进标记：文章还可能被数量上限、预排序或去重裁掉，由advance_high_water按实际发送的文章推进
+            self._high_water[url] = high_water
+
+        entry_ids = [self._entry_id(entry) for entry in feed.entries]
+        has_new = True
+        if self.state_store:
+            has_new = not set(entry_ids).issubset(self.state_store.get(url).get('seen_ids', []))
+            self.state_store.record_fetch(
+                url,
+                etag=headers.get('etag'),
+                last_modified=headers.get('last-modified'),
+                entry_ids=entry_ids
+            )
+        self.health.record_success(url, latency, bozo=bool(feed.bozo), has_new=has_new)
+
+        logger.info(f"从 {url} 获取了 {len(feed_articles)} 篇文章")
+        return feed_articles
+
+    def _iter_ordered(
+        self,
+        hours: int,
+        max_per_feed: int,
+        incremental: bool
+    ) -> Iterator[Tuple[Tuple[datetime, int, int], Article]]:
+        """
+        按源完成顺序产出文章及其排序键
+
+        排序键为 (发布时间, -源序号, -条目序号)，按排序键倒序即等价于
+        按配置顺序收集后再按发布时间稳定倒序排序。
+
+        Yields:
+            (排序键, 文章)
+        """
+        if incremental and not self.state_store:
+            logger.warning("增量模式需要RSS源状态存储，回退到时间窗口模式")
+            incremental = False
+
+        mode = "增量" if incremental else f"时间范围: {hours}小时"
+        logger.info(f"开始收集RSS文章，{mode}，并发数: {self.max_workers}")
+
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+
+        specs = [spec for spec in self.registry if self._is_due(spec)]
+        if len(specs) < len(self.registry):
+            logger.info(f"{len(self.registry) - len(specs)}个RSS源本次跳过（未到轮询时间、熔断或自适应轮询）")
+
+        order = {spec.url: i for i, spec in enumerate(specs)}
+        by_url = {spec.url: spec for spec in specs}
+
+        for url, fetched in self._iter_fetched(list(by_url)):
+            try:
+                feed_articles = self._process_feed(by_url[url], fetched, cutoff_time, max_per_feed, incremental)
+            except Exception as e:
+                logger.error(f"解析RSS失败: {url}, 错误: {str(e)}")
+                self.health.record_failure(url, fetched[-1], str(e))
+                continue
+
+            feed_index = order[url]
+            for entry_index, article in enumerate(feed_articles):
+                yield (article.published, -feed_index, -entry_index), article
+
+    def iter_articles(self, hours: int = 24, max_per_feed: int = 10, incremental: bool = False) -> Iterator[Article]:
+        """
+        流式收集RSS文章：每个源下载完成后立即解析并产出，不等待其他源
+
+        产出顺序为源的完成顺序（不排序），参数含义同collect。
+
+        Yields:
+            文章记录
+        """
+        for _, article in self._iter_ordered(hours, max_per_feed, incremental):
+            yield article
+
+    def collect(
+        self,
+        hours: int = 24,
+        max_per_feed: int = 10,
+        incremental: bool = False,
+        max_articles: Optional[int] = None
+    ) -> List[Article]:
+        """
+        收集最近N小时的RSS文章
+
+        所有RSS源并发下载，下载完成即解析，结果与逐个顺序获取后排序完全一致。
+        指定max_articles时使用大小为K的堆合并，只保留最新的K篇，内存不随文章总数增长。
+        多个源转载同一链接（规范化后相同，如只差跟踪参数）时只保留排在最前的一篇。
+
+        增量模式下，每个源记录高水位标记（最新文章的发布时间及该时间点的GUID），
+        只返回标记之后的新文章；首次运行（无标记）时按hours时间窗口收集。
+        标记不在收集时推进，调用方筛选完成后用advance_high_water传入实际发送的文章。
+        注意：单源新文章超过max_per_feed时，超出部分不会在后续运行中补回。
+
+        Args:
+            hours: 时间范围（小时），增量模式下仅用于首次运行
+            max_per_feed: 每个RSS源最多取多少条
+            incremental: 是否启用增量模式（需要状态存储）
+            max_articles: 最多返回多少篇（按发布时间取最新），None表示不限制
+
+        Returns:
+            按发布时间倒序排列的Article列表（兼容字典访问，可用to_dict()转为旧版字典）
+        """
+        stream = self._iter_ordered(hours, max_per_feed, incremental)
+
+        if max_articles:
+            ranked = heapq.nlargest(max_articles, stream, key=itemgetter(0))
+        else:
+            ranked = sorted(stream, key=itemgetter(0), reverse=True)
+        seen_urls = FingerprintSet()
+        articles = [article for _, article in ranked if not article.link or seen_urls.add_url(article.link)]
+        if len(articles) < len(ranked):
+            logger.info(f"跳过{len(ranked) - len(articles)}篇链接重复的文章")
 
         logger.info(f"RSS收集完成，共{len(articles)}篇文章")
+        for stat in self.get_feed_stats(top_n=3):
+            logger.info(f"耗时较高的RSS源: {stat['url']}（平均{stat['latency_ewma']:.2f}秒，"
+                        f"失败率{stat['failure_rate']:.0%}，bozo率{stat['bozo_rate']:.0%}）")
         return articles
 
-    def format_for_glm(self, articles: List[Dict]) -> List[Dict]:
+    def format_for_glm(self, articles: List[Article]) -> List[Dict]:
         """
         格式化为GLM处理器兼容的格式
 
@@ -115,27 +496,27 @@ class RSSCollector:
         Returns:
             GLM兼容格式的结果列表
         """
-        # 按分类组织
+        # 按分类组织（只保存文章引用）
         by_category = {}
         for article in articles:
-            category = article['category']
-            if category not in by_category:
-                by_category[category] = []
-            by_category[category].append(article)
+            by_category.setdefault(article.category, []).append(article)
 
-        # 转换为GLM格式
+        # 转换为GLM格式（片段写入列表后一次性拼接）
         glm_results = []
         for category, items in by_category.items():
-            content = f"\n## {category}\n\n"
+            parts = [f"\n## {category}\n\n"]
             for i, article in enumerate(items, 1):
-                content += f"### {i}. {article['title']} ({article['published_str']})\n"
-                content += f"{article['summary']}\n"
-                content += f"来源: {article['source']} | 链接: {article['link']}\n\n"
+                parts.append(f"### {i}. {article.title} ({article.published_str})\n")
+                parts.append(f"{article.summary}\n")
+                parts.append(f"来源: {article.source} | 链接: {article.link}\n")
+                if article.related:
+                    parts.append(f"同时报道: {'、'.join(item['source'] for item in article.related)}\n")
+                parts.append("\n")
 
             glm_results.append({
                 'success': True,
                 'query': category,
-                'content': content,
+                'content': ''.join(parts),
                 'article_count': len(items)
             })
 
@@ -154,8 +535,8 @@ if __name__ == '__main__':
 
     print(f"\n收集到 {len(articles)} 篇文章\n")
     for article in articles[:5]:
-        print(f"标题: {article['title']}")
-        print(f"时间: {article['published_str']}")
-        print(f"分类: {article['category']}")
-        print(f"摘要: {article['summary'][:100]}...")
+        print(f"标题: {article.title}")
+        print(f"时间: {article.published_str}")
+        print(f"分类: {article.category}")
+        print(f"摘要: {article.summary[:100]}...")
         print("-" * 80)
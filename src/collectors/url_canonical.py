@@ -0,0 +1,189 @@
+"""
+URL规范化与指纹集合 - 同一篇文章的不同链接形式（跟踪参数、http/https、移动版子域名、AMP页面、末尾斜杠）
+规范化为同一URL，再以64位指纹存入有序数组，二分查找判断是否已见，不保存URL字符串
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, Set
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# 跟踪参数（utm_*另外按前缀匹配）
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'spm', 'ref', 'ref_src', 'ref_url', 'share_source', 'share_medium', 'from_source',
+    'ncid', 'cmpid', 'sr_share', '_ga', 'amp', 'outputtype'
+})
+
+# 移动版/AMP子域名前缀（去除后与桌面版相同）
+MOBILE_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'wap.')
+
+
+@lru_cache(maxsize=4096)
+def canonicalize_url(url: str) -> str:
+    """
+    URL规范化
+
+    统一为https、主机名小写并去除www/m/mobile/amp/wap前缀和默认端口，
+    去除跟踪参数、片段、AMP路径（/amp、/amp/...、.amp）和末尾斜杠，剩余查询参数按名称排序。
+    不是http(s)链接时只去除首尾空白。
+
+    Args:
+        url: 原始链接
+
+    Returns:
+        规范化后的链接
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if parts.scheme.lower() not in ('http', 'https') or not parts.netloc:
+        return url
+
+    # 直接解析netloc（hostname/port属性每次访问都会重新解析）
+    host = parts.netloc.rpartition('@')[2].lower()
+    if not host.startswith('['):
+        name, _, port = host.partition(':')
+        host = name if port in ('', '80', '443') else f"{name}:{port}"
+    for prefix in MOBILE_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            host = host[len(prefix):]
+            break
+
+    path = parts.path or '/'
+    if path.startswith('/amp/'):
+        path = path[4:]
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path[:path.rindex('/amp')]
+    elif path.endswith('.amp'):
+        path = path[:-4]
+    path = path.rstrip('/')
+
+    query = ''
+    if parts.query:
+        params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+        ]
+        query = urlencode(sorted(params))
+
+    return f"https://{host}{path}?{query}" if query else f"https://{host}{path}"
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    规范化URL的64位指纹
+
+    Args:
+        url: 原始链接
+
+    Returns:
+        64位无符号整数
+    """
+    return int.from_bytes(hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class FingerprintSet:
+    """64位指纹集合（有序数组 + 少量新增缓冲，新增超过缓冲上限时归并）"""
+
+    def __init__(self, fingerprints: Iterable[int] = (), buffer_size: int = 1024):
+        """
+        初始化指纹集合
+
+        Args:
+            fingerprints: 初始指纹（如跨运行存储中的指纹）
+            buffer_size: 新增缓冲的最小上限（实际上限随集合增大，归并开销均摊为O(log n)）
+        """
+        self.buffer_size = buffer_size
+        self._sorted = array('Q', sorted(set(fingerprints)))
+        self._buffer: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._buffer)
+
+    def __contains__(self, fingerprint: int) -> bool:
+        if fingerprint in self._buffer:
+            return True
+        values = self._sorted
+        i = bisect_left(values, fingerprint)
+        return i < len(values) and values[i] == fingerprint
+
+    def add(self, fingerprint: int) -> bool:
+        """
+        加入指纹
+
+        Args:
+            fingerprint: 64位指纹
+
+        Returns:
+            True表示新加入，False表示已存在
+        """
+        if fingerprint in self:
+            return False
+        self._buffer.add(fingerprint)
+        if len(self._buffer) > max(self.buffer_size, len(self._sorted) // 8):
+            self._merge()
+        return True
+
+    def _merge(self):
+        """缓冲并入有序数组"""
+        self._sorted = array('Q', sorted(self._sorted.tolist() + list(self._buffer)))
+        self._buffer.clear()
+
+    def contains_url(self, url: str) -> bool:
+        """URL（规范化后）是否已见"""
+        return url_fingerprint(url) in self
+
+    def add_url(self, url: str) -> bool:
+        """加入URL（规范化后），返回是否新加入"""
+        return self.add(url_fingerprint(url))
+
+    def clear(self):
+        """清空集合"""
+        self._sorted = array('Q')
+        self._buffer.clear()
+
+
+# 测试代码
+if __name__ == '__main__':
+    import time
+    import random
+
+    same_story = [
+        'https://www.example.com/news/123?utm_source=rss&utm_medium=feed',
+        'http://example.com/news/123/',
+        'https://m.example.com/news/123#comments',
+        'https://example.com/amp/news/123',
+        'https://example.com/news/123/amp?fbclid=abc',
+    ]
+    for url in same_story:
+        print(f"{url:<64} -> {canonicalize_url(url)}")
+    print(f"指纹一致: {len({url_fingerprint(url) for url in same_story}) == 1}")
+    print(f"保留业务参数: {canonicalize_url('https://a.com/p?id=2&utm_campaign=x&page=1')}")
+
+    # 基准测试：10万条URL（约30%为带跟踪参数的重复链接）
+    rng = random.Random(0)
+    urls = []
+    for i in range(100000):
+        if urls and rng.random() < 0.3:
+            urls.append(rng.choice(urls[-1000:]) + f"?utm_source=feed{i % 7}")
+        else:
+            urls.append(f"https://www.site{i % 50}.com/articles/{rng.getrandbits(40):x}/")
+    canonicalize_url.cache_clear()
+
+    start = time.perf_counter()
+    seen = FingerprintSet()
+    unique = sum(1 for url in urls if seen.add_url(url))
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    raw_unique = len(set(urls))
+    raw_elapsed = time.perf_counter() - start
+
+    print(f"\n{len(urls)}条URL: 规范化去重后{unique}条（原始字符串去重{raw_unique}条）")
+    print(f"规范化+指纹集合: {elapsed * 1000:.0f}ms，原始字符串集合: {raw_elapsed * 1000:.0f}ms")
+    print(f"内存: 指纹数组约{len(seen) * 8 / 1024:.0f}KB")
@@ -3,5 +3,6 @@
 """
 
 from .markdown_formatter import MarkdownFormatter
+from .stream_chunker import StreamChunker
 
-__all__ = ['MarkdownFormatter']
+__all__ = ['MarkdownFormatter', 'StreamChunker']
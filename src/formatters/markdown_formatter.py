@@ -6,9 +6,12 @@ import os
 import yaml
 import random
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TYPE_CHECKING
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from processors.digest_schema import Digest
+
 logger = logging.getLogger(__name__)
 
 
@@ -200,6 +203,87 @@ class MarkdownFormatter:
         logger.info(f"内容分割完成，共{len(chunks)}个部分")
         return chunks
 
+    def render_digest_blocks(self, digest: 'Digest', date: Optional[str] = None) -> List[str]:
+        """
+        将结构化日报渲染为Markdown块（每条要闻、每个项目一块，分块时不会被拆开）
+
+        Args:
+            digest: 结构化日报
+            date: 日期（可选，默认今天）
+
+        Returns:
+            Markdown块列表
+        """
+        if date is None:
+            date = datetime.now().strftime('%Y年%m月%d日')
+
+        blocks = [f"## 🔥 今日要闻 ({date})"]
+        if not digest.news:
+            blocks.append("当前无最新资讯")
+        for i, item in enumerate(digest.news, 1):
+            title = f"### {i}. {item.title}"
+            if item.date:
+                title += f"（{item.date}）"
+            lines = [title, item.summary]
+            if item.url:
+                lines.append(f"🔗 [原文链接]({item.url})")
+            if item.related:
+                lines.append(f"📰 同时报道: {self.format_related(item.related)}")
+            blocks.append('\n'.join(lines))
+
+        if digest.projects:
+            blocks.append("## ⭐ GitHub热门项目")
+            for i, project in enumerate(digest.projects, 1):
+                name = f"[{project.name}]({project.url})" if project.url else project.name
+                blocks.append(
+                    f"{i}. **{name}** - {project.language or '未知'}\n"
+                    f"   - ⭐ {project.stars:,} | {project.summary}"
+                )
+
+        return blocks
+
+    @staticmethod
+    def format_related(related: List[Dict]) -> str:
+        """
+        "同时报道"来源列表（来源名称链接到对应报道）
+
+        Args:
+            related: 其他来源报道（source、link）
+
+        Returns:
+            以顿号分隔的Markdown链接
+        """
+        return '、'.join(f"[{item['source']}]({item['link']})" if item.get('link') else item['source'] for item in related)
+
+    def pack_blocks(self, blocks: List[str], max_bytes: int = 4000) -> List[str]:
+        """
+        按字节数把Markdown块装入消息（每块字节数只计算一次，不再扫描拼接后的文本）
+
+        Args:
+            blocks: Markdown块列表
+            max_bytes: 每条消息最大字节数（微信markdown.content限制4096字节）
+
+        Returns:
+            消息内容列表
+        """
+        chunks = []
+        current, current_bytes = [], 0
+
+        for block in blocks:
+            block_bytes = len(block.encode('utf-8'))
+            extra = block_bytes + (2 if current else 0)  # 块之间的\n\n
+            if current and current_bytes + extra > max_bytes:
+                chunks.append('\n\n'.join(current))
+                current, current_bytes, extra = [], 0, block_bytes
+            current.append(block)
+            current_bytes += extra
+
+        if current:
+            chunks.append('\n\n'.join(current))
+
+        logger.info(f"结构化分块完成，共{len(chunks)}个部分")
+        return chunks
+
 
 # 测试代码
 if __name__ == '__main__':
@@ -0,0 +1,105 @@
+"""
+流式分块器 - 大模型边生成边分块，章节完成即可推送
+分块规则与MarkdownFormatter.split_content一致（按段落拼接，不超过max_size字符）
+"""
+
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class StreamChunker:
+    """流式分块器"""
+
+    def __init__(self, max_size: int = 1300, min_size: int = 400):
+        """
+        初始化流式分块器
+
+        Args:
+            max_size: 每块最大字符数（默认1300，约3900字节，为微信4096字节限制留缓冲）
+            min_size: 遇到章节标题时，当前块达到该字符数就提前输出（越小首条消息越早送达）
+        """
+        self.max_size = max_size
+        self.min_size = min_size
+        self._buffer = ''          # 尚未完成的段落
+        self._paragraphs = []      # 当前块已完成的段落
+        self._size = 0             # 当前块字符数（含段落间的\n\n）
+
+    def _take_chunk(self) -> str:
+        """取出当前块"""
+        chunk = '\n\n'.join(self._paragraphs)
+        self._paragraphs = []
+        self._size = 0
+        logger.info(f"生成流式分块（字符数: {len(chunk)}, 字节数: {len(chunk.encode('utf-8'))}）")
+        return chunk
+
+    def _add_paragraph(self, para: str) -> List[str]:
+        """加入一个完整段落，返回因此完成的块"""
+        chunks = []
+        if not para.strip():
+            return chunks
+
+        # 章节标题开始新块（当前块足够长时），或当前块放不下
+        is_section = para.lstrip().startswith('#') or para.lstrip().startswith('---')
+        if self._paragraphs and (
+            (is_section and self._size >= self.min_size)
+            or self._size + len(para) + 2 > self.max_size
+        ):
+            chunks.append(self._take_chunk())
+
+        self._paragraphs.append(para)
+        self._size += len(para) + 2
+        return chunks
+
+    def feed(self, text: str) -> List[str]:
+        """
+        输入新生成的文本
+
+        Args:
+            text: 文本片段
+
+        Returns:
+            已完成的块（可能为空）
+        """
+        self._buffer += text
+        *paragraphs, self._buffer = self._buffer.split('\n\n')
+
+        chunks = []
+        for para in paragraphs:
+            chunks.extend(self._add_paragraph(para))
+        return chunks
+
+    def flush(self) -> List[str]:
+        """
+        结束输入，输出剩余内容
+
+        Returns:
+            剩余的块（可能为空）
+        """
+        chunks = self._add_paragraph(self._buffer)
+        self._buffer = ''
+        if self._paragraphs:
+            chunks.append(self._take_chunk())
+        return chunks
+
+
+# 测试代码
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    text = "## 🔥 今日要闻\n\n" + "".join(f"### {i}. 标题{i}\n" + "内容" * 80 + "\n\n" for i in range(1, 9))
+    chunker = StreamChunker(max_size=600, min_size=300)
+
+    # 模拟大模型每次产出7个字符
+    chunks = []
+    for start in range(0, len(text), 7):
+        for chunk in chunker.feed(text[start:start + 7]):
+            print(f"[生成中] 推送第{len(chunks) + 1}块（{len(chunk)}字符）")
+            chunks.append(chunk)
+    chunks.extend(chunker.flush())
+    complete = '\n\n'.join(chunks) == text.strip()
+    print(f"共{len(chunks)}块，内容完整: {complete}")
@@ -3,5 +3,18 @@
 """
 
 from .content_processor import ContentProcessor
+from .token_budget import estimate_tokens
+from .article_ranker import ArticleRanker
+from .digest_schema import Digest, DigestItem, DigestProject, parse_digest
+from .story_clusterer import StoryClusterer
 
-__all__ = ['ContentProcessor']
+__all__ = [
+    'ContentProcessor',
+    'ArticleRanker',
+    'StoryClusterer',
+    'Digest',
+    'DigestItem',
+    'DigestProject',
+    'parse_digest',
+    'estimate_tokens'
+]
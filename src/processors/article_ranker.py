@@ -0,0 +1,221 @@
+"""
+文章预排序 - 在调用大模型之前按本地打分筛选候选文章，缩小提示词
+打分维度：时效性、来源优先级、关键词权重、新颖度（与已选文章的标题相似度惩罚）
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import List, Dict, Optional, Set
+
+from collectors.models import Article
+from .token_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 搜索词中的修饰前缀/后缀（搜索引擎需要，标题中很少原样出现），拆词后去除
+QUERY_PREFIXES = ('国内', '国际')
+QUERY_SUFFIXES = ('最新动态', '最新消息', '最新进展', '行情', '新闻', '热点')
+
+
+def _strip_query_filler(term: str) -> str:
+    """去除搜索词的修饰前缀和后缀（如"国内大模型"→"大模型"，"科技巨头最新动态"→"科技巨头"）"""
+    for prefix in QUERY_PREFIXES:
+        if term.startswith(prefix):
+            term = term[len(prefix):]
+            break
+    for suffix in QUERY_SUFFIXES:
+        if term.endswith(suffix):
+            term = term[:-len(suffix)]
+            break
+    return term
+
+
+def _term_pattern(term: str) -> str:
+    """关键词的正则片段：英文数字词按整词匹配（Meta不匹配metadata），中文按子串匹配"""
+    escaped = re.escape(term)
+    if term.isascii():
+        return rf'(?<![a-z0-9]){escaped}(?![a-z0-9])'
+    return escaped
+
+
+class ArticleRanker:
+    """文章预排序器"""
+
+    def __init__(
+        self,
+        keywords: Optional[List[Dict]] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        token_budget: int = 4000,
+        max_articles: Optional[int] = 30,
+        half_life_hours: float = 12,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        初始化文章预排序器
+
+        Args:
+            keywords: 关键词列表（query、weight），query按空格拆分为词，每个词使用该关键词的weight；
+                来自keywords.yaml的搜索词会去除"最新动态"、"国内"等修饰词，少于2个字符的词忽略
+            priorities: 分类优先级映射（分类 -> 优先级，数字越小越重要），文章没有来源优先级（Article.priority）时使用
+            token_budget: 候选文章的总Token预算（估算值）
+            max_articles: 最多保留的文章数，None表示只受Token预算限制
+            half_life_hours: 时效性得分的半衰期（小时）
+            weights: 各维度权重（recency、priority、keyword、novelty）
+        """
+        self.priorities = priorities or {}
+        self.token_budget = token_budget
+        self.max_articles = max_articles
+        self.half_life_hours = max(0.1, half_life_hours)
+        self.weights = {'recency': 0.35, 'priority': 0.25, 'keyword': 0.3, 'novelty': 0.5}
+        self.weights.update(weights or {})
+
+        # 关键词拆分为词并取最高权重，编译为一个正则（长词优先匹配）
+        self.term_weights: Dict[str, float] = {}
+        for keyword in keywords or []:
+            weight = float(keyword.get('weight', 1))
+            for term in keyword.get('query', '').lower().split():
+                term = _strip_query_filler(term)
+                if len(term) >= 2:
+                    self.term_weights[term] = max(weight, self.term_weights.get(term, 0))
+
+        self.max_term_weight = max(self.term_weights.values(), default=1)
+        self.term_pattern = None
+        if self.term_weights:
+            terms = sorted(self.term_weights, key=len, reverse=True)
+            self.term_pattern = re.compile('|'.join(_term_pattern(term) for term in terms), re.IGNORECASE)
+
+    def _recency_score(self, article: Article, now: datetime) -> float:
+        """时效性得分（0-1，按半衰期指数衰减）"""
+        age_hours = max(0.0, (now - article.published).total_seconds() / 3600)
+        return 0.5 ** (age_hours / self.half_life_hours)
+
+    def _priority_score(self, article: Article) -> float:
+        """来源优先级得分（0.1-1，优先级1得分最高）"""
+        priority = article.priority
+        if priority is None:
+            priority = self.priorities.get(article.category, 5)
+        return (11 - min(max(priority, 1), 10)) / 10
+
+    def _keyword_score(self, article: Article) -> float:
+        """关键词得分（0-1，命中词的权重之和相对最高权重饱和）"""
+        if not self.term_pattern:
+            return 0.0
+        matched = {m.group(0).lower() for m in self.term_pattern.finditer(f"{article.title} {article.summary}")}
+        total = sum(self.term_weights.get(term, 0) for term in matched)
+        return min(1.0, total / (2 * self.max_term_weight))
+
+    @staticmethod
+    def _title_shingles(title: str) -> Set[str]:
+        """标题字符二元组（忽略大小写和空白）"""
+        text = ''.join(title.lower().split())
+        return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+    @staticmethod
+    def _similarity(a: Set[str], b: Set[str]) -> float:
+        """Jaccard相似度"""
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+    @staticmethod
+    def article_tokens(article: Article) -> int:
+        """文章在提示词中的Token估算（与format_for_glm的输出格式一致）"""
+        text = (
+            f"### 1. {article.title} ({article.published_str})\n{article.summary}\n"
+            f"来源: {article.source} | 链接: {article.link}\n"
+        )
+        if article.related:
+            text += f"同时报道: {'、'.join(item['source'] for item in article.related)}\n"
+        return estimate_tokens(text + "\n")
+
+    def score(self, article: Article, now: Optional[datetime] = None) -> float:
+        """
+        计算文章的基础得分（不含新颖度）
+
+        Args:
+            article: 文章
+            now: 当前时间（默认datetime.now()）
+
+        Returns:
+            基础得分
+        """
+        now = now or datetime.now()
+        return (
+            self.weights['recency'] * self._recency_score(article, now)
+            + self.weights['priority'] * self._priority_score(article)
+            + self.weights['keyword'] * self._keyword_score(article)
+        )
+
+    def select(self, articles: List[Article], now: Optional[datetime] = None) -> List[Article]:
+        """
+        在Token预算内选出得分最高的文章
+
+        贪心选择：每轮选调整后得分（基础得分 - 新颖度权重 × 与已选文章的最大标题相似度）最高的文章，
+        放不进剩余预算的文章跳过。返回结果保持输入顺序。
+
+        Args:
+            articles: 候选文章（通常已按发布时间倒序）
+            now: 当前时间（默认datetime.now()）
+
+        Returns:
+            选中的文章列表
+        """
+        if not articles:
+            return []
+
+        now = now or datetime.now()
+        base = [self.score(article, now) for article in articles]
+        costs = [self.article_tokens(article) for article in articles]
+        shingles = [self._title_shingles(article.title) for article in articles]
+        max_similarity = [0.0] * len(articles)
+
+        remaining = set(range(len(articles)))
+        selected = []
+        budget = self.token_budget
+        limit = self.max_articles or len(articles)
+        novelty_weight = self.weights['novelty']
+
+        while remaining and len(selected) < limit:
+            # 同分时取输入中靠前的（更新的）文章
+            best = max(remaining, key=lambda i: (base[i] - novelty_weight * max_similarity[i], -i))
+            remaining.discard(best)
+            if costs[best] > budget:
+                continue
+
+            selected.append(best)
+            budget -= costs[best]
+            for i in remaining:
+                similarity = self._similarity(shingles[best], shingles[i])
+                if similarity > max_similarity[i]:
+                    max_similarity[i] = similarity
+
+        selected.sort()
+        used = self.token_budget - budget
+        logger.info(f"预排序完成: {len(articles)}篇 → {len(selected)}篇（约{used}/{self.token_budget} tokens）")
+        return [articles[i] for i in selected]
+
+
+# 测试代码
+if __name__ == '__main__':
+    from datetime import timedelta
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    now = datetime.now()
+    test_articles = [
+        Article('OpenAI发布GPT-5预览版', '摘要' * 50, 'https://a/1', now - timedelta(hours=1), 'AI科技', '36氪'),
+        Article('OpenAI发布GPT-5预览版本', '摘要' * 50, 'https://b/1', now - timedelta(hours=2), '国际科技', 'TechCrunch'),
+        Article('英伟达发布新一代芯片', '摘要' * 50, 'https://a/2', now - timedelta(hours=5), 'AI科技', '36氪'),
+        Article('某公司年会', '摘要' * 50, 'https://c/1', now - timedelta(hours=20), '开发者资讯', 'GitHub Blog'),
+    ]
+    ranker = ArticleRanker(
+        keywords=[{'query': 'OpenAI 英伟达 芯片', 'weight': 10}],
+        priorities={'AI科技': 1, '国际科技': 2, '开发者资讯': 3},
+        token_budget=400
+    )
+    for article in ranker.select(test_articles, now):
+        print(f"{ranker.score(article, now):.3f} | {article.title}")
@@ -5,19 +5,58 @@
 
 import os
 import re
+import json
+import time
+import hashlib
 import logging
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterator, Tuple, Set
 from datetime import datetime, timedelta
 from zhipuai import ZhipuAI
 
+from collectors.date_extractor import DateExtractor
+from collectors.models import Article
+from collectors.rate_limiter import TokenBucket, backoff_delay, is_retryable
+from storage import DiskCache, LLMResponseCache
+from .digest_schema import DIGEST_SCHEMA, DigestValidationError, parse_digest, attach_related
+from .token_budget import estimate_tokens
+
 logger = logging.getLogger(__name__)
 
+# RSS格式化内容中每篇文章以"### "标题开头
+ARTICLE_BOUNDARY = re.compile(r'(?=^### )', re.M)
+
 
 class ContentProcessor:
     """智能内容处理器"""
 
-    def __init__(self):
-        """初始化内容处理器"""
+    def __init__(
+        self,
+        cache: Optional[LLMResponseCache] = None,
+        mode: str = 'single',
+        batch_token_budget: int = 6000,
+        max_workers: int = 3,
+        map_max_tokens: int = 1500,
+        rate_limiter: Optional[TokenBucket] = None,
+        article_cache: Optional[DiskCache] = None,
+        max_news: int = 8,
+        structured: bool = False
+    ):
+        """
+        初始化内容处理器
+
+        Args:
+            cache: 大模型响应缓存（可选，相同输入重跑时直接复用上次的处理结果）
+            mode: 处理模式，single=一次调用处理全部内容，map_reduce=分批并行摘要后再合并，
+                  per_article=逐篇翻译摘要（按文章缓存）后在本地拼装
+            batch_token_budget: map_reduce模式下每个批次的输入Token预算
+            max_workers: map_reduce模式下并行摘要的线程数
+            map_max_tokens: 每个批次摘要的最大输出Token数
+            rate_limiter: 令牌桶限流器（可选，默认每秒0.5个请求、并发2个）
+            article_cache: 逐篇翻译摘要缓存（per_article模式，按URL和内容哈希缓存）
+            max_news: 最多输出的要闻条数（per_article模式和结构化输出使用）
+            structured: 是否要求大模型输出结构化JSON（校验后由格式化器渲染，流式处理时不使用）
+        """
         api_key = os.getenv('GLM_API_KEY')
         if not api_key:
             raise ValueError("GLM_API_KEY not found in environment variables")
@@ -27,6 +66,21 @@ class ContentProcessor:
 
         # 时间阈值：只接受最近30天的新闻（借鉴GitHub项目策略）
         self.max_age_days = 30
+        self.cache = cache
+
+        # Map-Reduce配置
+        self.mode = mode
+        self.batch_token_budget = max(500, batch_token_budget)
+        self.max_workers = max(1, max_workers)
+        self.map_max_tokens = map_max_tokens
+        self.rate_limiter = rate_limiter or TokenBucket(rate=0.5, burst=2, max_concurrent=2)
+        self.max_retries = 3     # 批次摘要最大重试次数
+        self.retry_delay = 5     # 重试基础延迟（秒）
+
+        # 逐篇处理配置
+        self.article_cache = article_cache
+        self.max_news = max_news
+        self.structured = structured
 
         logger.info("智能内容处理器初始化成功")
 
@@ -44,60 +98,105 @@ class ContentProcessor:
         Returns:
             True表示日期可靠，False表示包含未来或过旧的日期
         """
-        today = datetime.now()
+        today = datetime.now().date()
         cutoff_date = today - timedelta(days=self.max_age_days)
 
-        # 日期模式：2025年11月10日、2025-11-10、11月10日等
-        date_patterns = [
-            r'(\d{4})年(\d{1,2})月(\d{1,2})日',  # 2025年11月10日
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',       # 2025-11-10
-            r'(\d{1,2})月(\d{1,2})日',             # 11月10日
-        ]
+        # 单次扫描：2025年11月10日、2025-11-10、11月10日（只有月日时按今年计算）
+        invalid = DateExtractor(today.year).out_of_range(content, cutoff_date, today)
+        for match in invalid:
+            news_date = match.to_date(today.year)
+            if news_date > today:
+                logger.warning(f"⚠️ 发现未来日期: {news_date.strftime('%Y-%m-%d')}（今天: {today.strftime('%Y-%m-%d')}）")
+            else:
+                logger.warning(f"⚠️ 发现过旧新闻: {news_date.strftime('%Y-%m-%d')}（超过{self.max_age_days}天）")
+
+        return not invalid
+
+    def process_news(
+        self,
+        glm_results: List[Dict],
+        github_projects: List[Dict],
+        articles: Optional[List[Article]] = None
+    ) -> Dict:
+        """
+        智能处理新闻内容
 
-        found_invalid = False
+        Args:
+            glm_results: GLM搜索结果列表
+            github_projects: GitHub项目列表
+            articles: RSS文章列表（per_article模式使用，未提供时退回single模式）
 
-        for pattern in date_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                try:
-                    if len(match) == 3:  # 完整年月日
-                        year, month, day = int(match[0]), int(match[1]), int(match[2])
-                    elif len(match) == 2:  # 只有月日，假设今年
-                        year, month, day = today.year, int(match[0]), int(match[1])
-                    else:
-                        continue
+        Returns:
+            处理后的结构化内容
+        """
+        logger.info("=== 开始智能内容处理 ===")
 
-                    news_date = datetime(year, month, day)
+        all_news, github_summary = self._prepare_inputs(glm_results, github_projects)
 
-                    # 检查未来日期
-                    if news_date > today:
-                        logger.warning(f"⚠️ 发现未来日期: {news_date.strftime('%Y-%m-%d')}（今天: {today.strftime('%Y-%m-%d')}）")
-                        found_invalid = True
+        # 3. 调用GLM进行智能处理（内容较多时分批摘要后再合并）
+        source_urls = {article.link for article in articles} if articles is not None else None
+        if self.mode == 'per_article' and articles is not None:
+            processed_content = self._process_per_article(articles, github_summary)
+        elif self.mode == 'map_reduce':
+            processed_content = self._map_reduce(all_news, github_summary, source_urls)
+        else:
+            processed_content = self._call_glm_processor(all_news, github_summary, source_urls)
+
+        # 结构化日报的"同时报道"来源按链接从原始文章本地填入
+        if processed_content.get('digest') is not None and articles:
+            attach_related(processed_content['digest'], articles)
+
+        logger.info("智能内容处理完成")
+        return processed_content
 
-                    # 检查过旧日期
-                    if news_date < cutoff_date:
-                        logger.warning(f"⚠️ 发现过旧新闻: {news_date.strftime('%Y-%m-%d')}（超过{self.max_age_days}天）")
-                        found_invalid = True
+    def stream_news(
+        self,
+        glm_results: List[Dict],
+        github_projects: List[Dict],
+        articles: Optional[List[Article]] = None
+    ) -> Iterator[str]:
+        """
+        流式智能处理新闻内容（最终处理调用边生成边产出，调用方可以提前推送已完成的部分）
 
-                except (ValueError, IndexError) as e:
-                    logger.debug(f"日期解析异常: {match}, 错误: {e}")
-                    continue
+        map_reduce模式先完成各批次摘要，再流式产出合并结果；per_article模式在本地拼装，一次性产出。
+        处理失败时抛出异常。
 
-        return not found_invalid
+        Args:
+            glm_results: GLM搜索结果列表
+            github_projects: GitHub项目列表
+            articles: RSS文章列表（per_article模式使用）
 
-    def process_news(self, glm_results: List[Dict], github_projects: List[Dict]) -> Dict:
+        Yields:
+            生成的文本片段
         """
-        智能处理新闻内容
+        logger.info("=== 开始智能内容处理（流式） ===")
+
+        all_news, github_summary = self._prepare_inputs(glm_results, github_projects)
+
+        if self.mode == 'per_article' and articles is not None:
+            yield self._process_per_article(articles, github_summary)['content']
+            return
+
+        if self.mode == 'map_reduce':
+            batches = self._build_batches(all_news)
+            if len(batches) > 1:
+                all_news, _ = self._map_batches(batches)
+                if not all_news:
+                    raise RuntimeError('所有批次摘要均失败')
+
+        yield from self._stream_glm_processor(all_news, github_summary)
+
+    def _prepare_inputs(self, glm_results: List[Dict], github_projects: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        提取新闻内容和GitHub项目信息
 
         Args:
             glm_results: GLM搜索结果列表
             github_projects: GitHub项目列表
 
         Returns:
-            处理后的结构化内容
+            (新闻列表, GitHub项目列表)
         """
-        logger.info("=== 开始智能内容处理 ===")
-
         # 1. 提取所有新闻内容
         all_news = []
         for result in glm_results:
@@ -117,26 +216,425 @@ class ContentProcessor:
                 'description': project.get('description', ''),
                 'stars': project.get('stars', 0),
                 'language': project.get('language', ''),
-                'url': project.get('url', '')
+                'url': project.get('url', ''),
+                'star_velocity': project.get('star_velocity'),
+                'latest_release': project.get('latest_release'),
+                'readme_excerpt': project.get('readme_excerpt')
             })
 
-        # 3. 调用GLM进行智能处理
-        processed_content = self._call_glm_processor(all_news, github_summary)
+        return all_news, github_summary
 
-        logger.info("智能内容处理完成")
-        return processed_content
+    def _split_sections(self, content: str) -> List[str]:
+        """
+        将分类内容切分为可独立分批的片段（按文章，单篇超出预算时再按段落）
+
+        Args:
+            content: 分类内容文本
+
+        Returns:
+            片段列表
+        """
+        sections = []
+        for section in ARTICLE_BOUNDARY.split(content):
+            if not section.strip():
+                continue
+            if estimate_tokens(section) <= self.batch_token_budget:
+                sections.append(section)
+            else:
+                sections.extend(part + '\n\n' for part in section.split('\n\n') if part.strip())
+        return sections
+
+    def _build_batches(self, news_list: List[Dict]) -> List[Dict]:
+        """
+        按Token预算将新闻内容顺序装入批次（小分类合并到同一批次，大分类拆分到多个批次）
+
+        Args:
+            news_list: 新闻列表
+
+        Returns:
+            批次列表，每项包含categories和text
+        """
+        batches = []
+        parts, categories, tokens = [], [], 0
+
+        for news in news_list:
+            category = news['category']
+            header = f"\n### 来源：{category}\n"
+            for section in self._split_sections(news['content']):
+                section_tokens = estimate_tokens(section)
+                if parts and tokens + section_tokens > self.batch_token_budget:
+                    batches.append({'categories': categories, 'text': ''.join(parts)})
+                    parts, categories, tokens = [], [], 0
+
+                # 分类在批次内首次出现时加上来源标题
+                if category not in categories:
+                    categories.append(category)
+                    parts.append(header)
+                    tokens += estimate_tokens(header)
+                parts.append(section)
+                tokens += section_tokens
+
+        if parts:
+            batches.append({'categories': categories, 'text': ''.join(parts)})
+
+        return batches
+
+    def _summarize_batch(self, batch: Dict) -> Dict:
+        """
+        摘要单个批次（Map阶段，结果按请求内容缓存）
 
-    def _call_glm_processor(self, news_list: List[Dict], github_list: List[Dict]) -> Dict:
+        Args:
+            batch: 批次信息（categories和text）
+
+        Returns:
+            摘要结果字典
         """
-        调用GLM大模型进行内容处理
+        prompt = f"""请将下面的原始资讯压缩为要点列表，供后续汇总使用：
+- 每条资讯输出一行：**中文标题**（原文日期，如有）：1-2句中文摘要，不超过80字 | 链接: 原文链接
+- 链接必须原样保留原始资讯中该条的链接，不要修改或省略（汇总时用于引用原文）
+- 英文内容必须翻译成简体中文
+- 去除重复、标题党和无实际价值的内容
+- 严禁添加原始内容中不存在的日期
+- 只输出要点列表，不要输出任何其他说明
+
+## 原始资讯
+{batch['text']}
+"""
+        request = {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "你是一个专业的中文新闻编辑，擅长提炼资讯要点。你必须使用简体中文输出。"
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'temperature': 0.3,
+            'max_tokens': self.map_max_tokens
+        }
+        result = self._complete(request, '、'.join(batch['categories']))
+        result['categories'] = batch['categories']
+        return result
+
+    def _complete(self, request: Dict, label: str, use_cache: bool = True) -> Dict:
+        """
+        调用大模型（令牌桶限流，429/5xx指数退避重试，可选读写响应缓存）
+
+        Args:
+            request: chat.completions.create的参数
+            label: 日志中显示的名称
+            use_cache: 是否使用大模型响应缓存
+
+        Returns:
+            {'success': True, 'content': ...} 或 {'success': False, 'error': ...}
+        """
+        cache = self.cache if use_cache else None
+        cached = cache.get(request) if cache else None
+        if cached is not None:
+            return {'success': True, 'content': cached}
+
+        for attempt in range(self.max_retries):
+            try:
+                with self.rate_limiter:
+                    response = self.client.chat.completions.create(**request)
+
+                content = response.choices[0].message.content.strip()
+                if not content:
+                    raise ValueError('Empty response')
+                if cache:
+                    cache.set(request, content)
+
+                logger.info(f"批次处理完成: {label}（{len(content)}字符）")
+                return {'success': True, 'content': content}
+
+            except Exception as e:
+                logger.error(f"批次处理失败 (尝试 {attempt + 1}/{self.max_retries}): {label} - {str(e)}")
+                if attempt < self.max_retries - 1 and is_retryable(e):
+                    time.sleep(backoff_delay(attempt, self.retry_delay))
+                else:
+                    return {'success': False, 'error': str(e)}
+
+        return {'success': False, 'error': 'Max retries exceeded'}
+
+    def _map_batches(self, batches: List[Dict]) -> Tuple[List[Dict], int]:
+        """
+        并行摘要各批次（Map阶段），失败的批次直接跳过
+
+        Args:
+            batches: 批次列表
+
+        Returns:
+            (批次摘要组成的新闻列表, 失败批次数)
+        """
+        logger.info(f"Map-Reduce模式：{len(batches)}个批次并行摘要（每批预算{self.batch_token_budget} tokens）")
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            results = list(executor.map(self._summarize_batch, batches))
+
+        summaries = [result for result in results if result['success']]
+        failed = len(results) - len(summaries)
+        if failed:
+            logger.warning(f"⚠️ {failed}/{len(batches)}个批次摘要失败，已跳过")
+
+        mapped_news = [
+            {'category': '、'.join(result['categories']), 'content': result['content']}
+            for result in summaries
+        ]
+        return mapped_news, failed
+
+    def _map_reduce(
+        self,
+        news_list: List[Dict],
+        github_list: List[Dict],
+        source_urls: Optional[Set[str]] = None
+    ) -> Dict:
+        """
+        Map-Reduce处理：各批次并行摘要，再用一次调用合并排序
+
+        部分批次失败时仅丢弃失败批次；合并调用失败时退化为直接拼接各批次摘要。
 
         Args:
             news_list: 新闻列表
             github_list: GitHub项目列表
+            source_urls: 原始文章链接（结构化输出时用于校验和去重）
 
         Returns:
             处理后的结构化内容
         """
+        batches = self._build_batches(news_list)
+
+        # 内容不超过一个批次时无需分批
+        if len(batches) <= 1:
+            return self._call_glm_processor(news_list, github_list, source_urls)
+
+        mapped_news, failed = self._map_batches(batches)
+        if not mapped_news:
+            return {
+                'success': False,
+                'content': '',
+                'error': '所有批次摘要均失败'
+            }
+
+        processed = self._call_glm_processor(mapped_news, github_list, source_urls)
+
+        if not processed.get('success'):
+            # 合并失败：直接使用各批次摘要，保证仍有内容可推送
+            logger.warning(f"合并调用失败，退化为拼接批次摘要: {processed.get('error', '未知错误')}")
+            today_str = datetime.now().strftime('%Y年%m月%d日')
+            parts = [f"## 🔥 今日要闻 ({today_str})\n"]
+            for news in mapped_news:
+                parts.append(f"\n### {news['category']}\n{news['content']}\n")
+            content = ''.join(parts)
+            processed = {
+                'success': True,
+                'content': content,
+                'char_count': len(content),
+                'byte_count': len(content.encode('utf-8'))
+            }
+
+        processed['batch_count'] = len(batches)
+        processed['failed_batches'] = failed
+        return processed
+
+    def _article_key(self, url: str, title: str, text: str) -> str:
+        """逐篇缓存键：模型 + URL + 内容哈希（标题或正文变化时重新处理）"""
+        content_hash = hashlib.sha256(f"{title}\n{text}".encode('utf-8')).hexdigest()
+        return DiskCache.make_key(self.model, url, content_hash)
+
+    @staticmethod
+    def _parse_json_array(content: str) -> List[Dict]:
+        """从模型输出中提取JSON数组（兼容```json代码块包裹）"""
+        start, end = content.find('['), content.rfind(']')
+        if start < 0 or end <= start:
+            raise ValueError('No JSON array in response')
+        items = json.loads(content[start:end + 1])
+        return [item for item in items if isinstance(item, dict)]
+
+    def _translate_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        """
+        翻译摘要一批条目
+
+        Args:
+            batch: 条目列表（key、kind、title、text）
+
+        Returns:
+            {缓存键: {'title': 中文标题, 'summary': 中文摘要}}，失败的条目不在结果中
+        """
+        parts = []
+        for i, item in enumerate(batch, 1):
+            parts.append(f"[{i}] ({item['kind']}) 标题: {item['title']}\n内容: {item['text']}\n\n")
+
+        prompt = f"""请将下面每条内容翻译并摘要为简体中文，输出JSON数组，每个元素格式为：
+{{"id": 编号, "title": "中文标题", "summary": "中文摘要"}}
+- 资讯的summary为80-120字的中文摘要
+- GitHub项目的title保留项目名称，summary为一句话中文描述
+- 严禁添加原始内容中不存在的日期
+- 只输出JSON数组，不要输出任何其他内容
+
+{''.join(parts)}"""
+        request = {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "你是一个专业的中文新闻编辑，负责把资讯翻译并摘要为简体中文。"
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'temperature': 0.3,
+            'max_tokens': self.map_max_tokens
+        }
+
+        # 结果按条目缓存，不再重复写入整批响应缓存
+        result = self._complete(request, f"{len(batch)}个条目", use_cache=False)
+        if not result['success']:
+            return {}
+
+        try:
+            items = self._parse_json_array(result['content'])
+        except ValueError as e:
+            logger.error(f"翻译结果解析失败: {str(e)}")
+            return {}
+
+        pieces = {}
+        for item in items:
+            try:
+                index = int(item.get('id', 0)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(batch) and item.get('title') and item.get('summary'):
+                pieces[batch[index]['key']] = {'title': str(item['title']), 'summary': str(item['summary'])}
+        return pieces
+
+    def _translate_items(self, items: List[Dict]) -> Dict[str, Dict]:
+        """
+        翻译摘要条目：已缓存的直接复用，只把新条目分批并行发给大模型
+
+        Args:
+            items: 条目列表（key、kind、title、text）
+
+        Returns:
+            {缓存键: {'title': 中文标题, 'summary': 中文摘要}}
+        """
+        pieces = {}
+        pending = []
+        for item in items:
+            cached = self.article_cache.get(item['key']) if self.article_cache else None
+            if cached is not None:
+                pieces[item['key']] = cached
+            else:
+                pending.append(item)
+
+        logger.info(f"逐篇处理: {len(items)}个条目，缓存命中{len(pieces)}个，需要处理{len(pending)}个")
+        if not pending:
+            return pieces
+
+        # 按输入Token预算和输出条数（每条约150 tokens）分批
+        max_items = max(1, self.map_max_tokens // 150)
+        batches, batch, tokens = [], [], 0
+        for item in pending:
+            item_tokens = estimate_tokens(item['title']) + estimate_tokens(item['text'])
+            if batch and (tokens + item_tokens > self.batch_token_budget or len(batch) >= max_items):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(item)
+            tokens += item_tokens
+        if batch:
+            batches.append(batch)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            for translated in executor.map(self._translate_batch, batches):
+                for key, piece in translated.items():
+                    pieces[key] = piece
+                    if self.article_cache:
+                        self.article_cache.set(key, piece)
+
+        missing = len(items) - len(pieces)
+        if missing:
+            logger.warning(f"⚠️ {missing}个条目翻译失败，将使用原文")
+        return pieces
+
+    def _process_per_article(self, articles: List[Article], github_list: List[Dict]) -> Dict:
+        """
+        逐篇处理：每篇文章和每个项目单独翻译摘要并缓存，最后在本地拼装成日报
+
+        Args:
+            articles: RSS文章列表（按输出顺序）
+            github_list: GitHub项目列表
+
+        Returns:
+            处理后的结构化内容
+        """
+        news = articles[:self.max_news]
+        news_items = [
+            {
+                'key': self._article_key(article.link, article.title, article.summary),
+                'kind': '资讯',
+                'title': article.title,
+                'text': article.summary
+            }
+            for article in news
+        ]
+        project_items = [
+            {
+                'key': self._article_key(project['url'], project['name'], project.get('description') or ''),
+                'kind': 'GitHub项目',
+                'title': project['name'],
+                'text': project.get('description') or ''
+            }
+            for project in github_list
+        ]
+        pieces = self._translate_items(news_items + project_items)
+
+        today_str = datetime.now().strftime('%Y年%m月%d日')
+        parts = [f"## 🔥 今日要闻 ({today_str})\n\n"]
+        if not news:
+            parts.append("当前无最新资讯\n\n")
+        for i, (article, item) in enumerate(zip(news, news_items), 1):
+            piece = pieces.get(item['key'], {'title': article.title, 'summary': article.summary[:120]})
+            parts.append(f"### {i}. {piece['title']}\n{piece['summary']}\n\n")
+            if article.related:
+                also = '、'.join(f"[{item['source']}]({item['link']})" for item in article.related)
+                parts.append(f"📰 同时报道: {also}\n\n")
+
+        if github_list:
+            parts.append("## ⭐ GitHub热门项目\n\n")
+            for i, (project, item) in enumerate(zip(github_list, project_items), 1):
+                piece = pieces.get(item['key'], {'summary': item['text']})
+                parts.append(f"{i}. **{project['name']}** - {project['language']}\n")
+                parts.append(f"   - ⭐ {project['stars']} | {piece['summary']}\n\n")
+
+        processed_content = ''.join(parts).strip()
+        if not self._validate_date(processed_content):
+            logger.warning("⚠️ 日期验证检测到问题：GLM可能在摘要时修改了原始日期")
+            warning_msg = f"\n⚠️ **提示**：部分日期可能在AI总结时被调整，请以实际发布时间为准\n\n"
+            processed_content = warning_msg + processed_content
+
+        return {
+            'success': True,
+            'content': processed_content,
+            'char_count': len(processed_content),
+            'byte_count': len(processed_content.encode('utf-8'))
+        }
+
+    def _build_processor_request(self, news_list: List[Dict], github_list: List[Dict], structured: bool = False) -> Dict:
+        """
+        构建内容处理请求（提示词和模型参数）
+
+        Args:
+            news_list: 新闻列表
+            github_list: GitHub项目列表
+            structured: 是否要求输出结构化JSON（否则输出Markdown）
+
+        Returns:
+            chat.completions.create的参数
+        """
         # 构建新闻摘要
         news_text = ""
         for i, news in enumerate(news_list, 1):
@@ -145,13 +643,74 @@ class ContentProcessor:
         # 构建GitHub项目摘要
         github_text = ""
         for project in github_list:
-            github_text += f"- {project['name']} ({project['language']}) - {project['stars']} stars\n  {project['description']}\n"
+            trend = f"，日增约{project['star_velocity']:.0f}星" if project.get('star_velocity') else ""
+            release = f"，最新版本{project['latest_release']}" if project.get('latest_release') else ""
+            github_text += f"- {project['name']} ({project['language']}) - {project['stars']} stars{trend}{release}\n  {project['description']}\n"
+            if project.get('readme_excerpt'):
+                github_text += f"  README: {project['readme_excerpt']}\n"
 
         # 获取今天的日期和时间窗口（借鉴GitHub RSS aggregator策略）
         today = datetime.now()
         today_str = today.strftime('%Y年%m月%d日')
         cutoff_date = (today - timedelta(days=self.max_age_days)).strftime('%Y年%m月%d日')
 
+        if structured:
+            schema = json.dumps(DIGEST_SCHEMA, ensure_ascii=False, indent=2)
+            output_format = f"""### 4. 输出格式（JSON）
+只输出一个JSON对象，结构如下（字段内容必须使用简体中文，url和日期除外）：
+
+```json
+{schema}
+```
+
+- news最多8条，按重要性排序；url必须是原始资讯中对应文章的链接，不要编造
+- date只填写原始资讯中给出的日期（YYYY-MM-DD），没有就填空字符串
+- projects最多5个，name使用上面列出的项目全名
+
+**🔴 最重要提醒**：
+1. 所有标题和摘要必须是简体中文
+2. 如果原文是英文，必须翻译成中文
+3. 只输出JSON，不要输出任何其他内容
+"""
+        else:
+            output_format = f"""### 4. 输出格式（必须使用简体中文）
+使用以下Markdown格式：
+
+---
+
+## 🔥 今日要闻 ({today_str})
+
+### 1. [中文新闻标题]
+[简洁的中文新闻摘要，80-120字]
+
+### 2. [中文新闻标题]
+[简洁的中文新闻摘要，80-120字]
+
+...（最多8条要闻）
+
+**注意**：新闻标题和内容都必须是中文，不要出现英文句子
+
+## ⭐ GitHub热门项目
+
+1. **[项目名称]** - [编程语言]
+   - ⭐ [星标数] | [中文一句话描述]
+
+2. **[项目名称]** - [编程语言]
+   - ⭐ [星标数] | [中文一句话描述]
+
+...（最多5个项目）
+
+---
+
+**🔴 最重要提醒**：
+1. 所有输出内容必须是简体中文
+2. 如果原文是英文，必须翻译成中文
+3. 不要直接复制英文内容
+4. GitHub项目描述也要翻译成中文
+
+注意：请严格按照上述Markdown模板输出，不要添加任何元信息或检查清单，直接输出可读的中文内容。
+"""
+
         # 构建增强版处理提示词（强制中文输出）
         prompt = f"""# 📋 任务说明
 你是一个专业的**中文新闻编辑**，负责处理每日资讯汇总。
@@ -213,67 +772,87 @@ class ContentProcessor:
 - **优先使用"今日"、"本周"等模糊时间表述**，避免具体日期错误
 - **所有内容必须翻译成中文**（包括GitHub项目描述）
 
-### 4. 输出格式（必须使用简体中文）
-使用以下Markdown格式：
-
----
-
-## 🔥 今日要闻 ({today_str})
-
-### 1. [中文新闻标题]
-[简洁的中文新闻摘要，80-120字]
-
-### 2. [中文新闻标题]
-[简洁的中文新闻摘要，80-120字]
-
-...（最多8条要闻）
-
-**注意**：新闻标题和内容都必须是中文，不要出现英文句子
-
-## ⭐ GitHub热门项目
-
-1. **[项目名称]** - [编程语言]
-   - ⭐ [星标数] | [中文一句话描述]
-
-2. **[项目名称]** - [编程语言]
-   - ⭐ [星标数] | [中文一句话描述]
-
-...（最多5个项目）
-
----
+{output_format}"""
+
+        request = {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "你是一个专业的中文新闻编辑，擅长筛选和总结高质量的资讯内容。你必须使用简体中文输出所有内容，包括翻译英文新闻和GitHub项目描述。绝对禁止输出英文句子。"
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'temperature': 0.5,
+            'max_tokens': 4000
+        }
+        if structured:
+            request['response_format'] = {'type': 'json_object'}
+        return request
+
+    def _call_glm_processor(
+        self,
+        news_list: List[Dict],
+        github_list: List[Dict],
+        source_urls: Optional[Set[str]] = None,
+        structured: Optional[bool] = None
+    ) -> Dict:
+        """
+        调用GLM大模型进行内容处理
 
-**🔴 最重要提醒**：
-1. 所有输出内容必须是简体中文
-2. 如果原文是英文，必须翻译成中文
-3. 不要直接复制英文内容
-4. GitHub项目描述也要翻译成中文
+        Args:
+            news_list: 新闻列表
+            github_list: GitHub项目列表
+            source_urls: 原始文章链接（结构化输出时用于校验和去重）
+            structured: 是否使用结构化JSON输出（默认使用self.structured）
 
-注意：请严格按照上述Markdown模板输出，不要添加任何元信息或检查清单，直接输出可读的中文内容。
-"""
+        Returns:
+            处理后的结构化内容
+        """
+        if structured is None:
+            structured = self.structured
 
         try:
-            logger.info("调用GLM-4-Plus进行智能处理...")
+            request = self._build_processor_request(news_list, github_list, structured)
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一个专业的中文新闻编辑，擅长筛选和总结高质量的资讯内容。你必须使用简体中文输出所有内容，包括翻译英文新闻和GitHub项目描述。绝对禁止输出英文句子。"
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.5,
-                max_tokens=4000
-            )
-
-            processed_content = response.choices[0].message.content.strip()
+            # 与其他大模型调用共用限流、重试和响应缓存
+            logger.info("调用GLM-4-Plus进行智能处理...")
+            result = self._complete(request, '汇总处理')
+            if not result['success']:
+                raise RuntimeError(result['error'])
+            processed_content = result['content']
 
             logger.info(f"GLM处理完成，输出字符数: {len(processed_content)}")
 
+            if structured:
+                today = datetime.now().date()
+                try:
+                    digest = parse_digest(
+                        processed_content,
+                        source_urls=source_urls,
+                        github_list=github_list,
+                        earliest=today - timedelta(days=self.max_age_days),
+                        latest=today,
+                        max_news=self.max_news
+                    )
+                except DigestValidationError as e:
+                    # 结构化输出不合格时退回Markdown输出，不合格的响应不保留在缓存中
+                    logger.warning(f"⚠️ 结构化输出校验失败，改用Markdown输出: {str(e)}")
+                    if self.cache:
+                        self.cache.delete(request)
+                    return self._call_glm_processor(news_list, github_list, structured=False)
+
+                return {
+                    'success': True,
+                    'content': processed_content,
+                    'digest': digest,
+                    'char_count': len(processed_content),
+                    'byte_count': len(processed_content.encode('utf-8'))
+                }
+
             # 🆕 后处理验证：检查内容中的日期是否可靠
             # 注意：现在使用RSS数据源，时间应该100%可靠
             # 如果仍然检测到问题，说明GLM在总结时又编造了日期
@@ -300,6 +879,50 @@ class ContentProcessor:
                 'error': str(e)
             }
 
+    def _stream_glm_processor(self, news_list: List[Dict], github_list: List[Dict]) -> Iterator[str]:
+        """
+        流式调用GLM大模型进行内容处理，边生成边产出文本片段
+
+        日期验证需要完整内容，有问题时提示追加在末尾。命中响应缓存时一次性产出缓存内容。
+
+        Args:
+            news_list: 新闻列表
+            github_list: GitHub项目列表
+
+        Yields:
+            生成的文本片段
+        """
+        # 流式输出按Markdown分块推送，不使用结构化输出
+        request = self._build_processor_request(news_list, github_list, structured=False)
+
+        processed_content = self.cache.get(request) if self.cache else None
+        if processed_content is not None:
+            yield processed_content
+        else:
+            logger.info("流式调用GLM-4-Plus进行智能处理...")
+            parts = []
+            with self.rate_limiter:
+                response = self.client.chat.completions.create(**request, stream=True)
+                for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+
+            processed_content = ''.join(parts).strip()
+            if not processed_content:
+                raise ValueError('Empty response')
+            if self.cache:
+                self.cache.set(request, processed_content)
+
+        logger.info(f"GLM流式处理完成，输出字符数: {len(processed_content)}")
+
+        if not self._validate_date(processed_content):
+            logger.warning("⚠️ 日期验证检测到问题：GLM可能在总结时修改了原始日期")
+            yield "\n\n⚠️ **提示**：部分日期可能在AI总结时被调整，请以实际发布时间为准\n"
+
 
 # 测试代码
 if __name__ == '__main__':
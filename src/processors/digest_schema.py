@@ -0,0 +1,206 @@
+"""
+结构化日报 - 大模型以JSON输出要闻和项目，按约定结构校验后直接用于渲染、分块和去重
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from collectors.date_extractor import DateExtractor
+from collectors.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# 提示词中给出的输出结构（字段含义同时用于校验）
+DIGEST_SCHEMA = {
+    "news": [
+        {
+            "title": "中文新闻标题",
+            "summary": "80-120字中文摘要",
+            "url": "原文链接（必须来自原始资讯）",
+            "category": "分类",
+            "date": "原文日期YYYY-MM-DD，原文没有日期时为空字符串"
+        }
+    ],
+    "projects": [
+        {
+            "name": "项目全名（owner/repo）",
+            "summary": "中文一句话描述"
+        }
+    ]
+}
+
+
+class DigestValidationError(ValueError):
+    """结构化输出不符合约定结构"""
+
+
+@dataclass(slots=True)
+class DigestItem:
+    """日报中的一条要闻"""
+
+    title: str
+    summary: str
+    url: str = ''
+    category: str = ''
+    date: str = ''
+    related: List[Dict[str, str]] = field(default_factory=list)  # 同时报道的其他来源（本地填充，不由大模型输出）
+
+
+@dataclass(slots=True)
+class DigestProject:
+    """日报中的一个GitHub项目（星标数和语言取自原始数据）"""
+
+    name: str
+    summary: str
+    url: str = ''
+    language: str = ''
+    stars: int = 0
+
+
+@dataclass(slots=True)
+class Digest:
+    """结构化日报"""
+
+    news: List[DigestItem] = field(default_factory=list)
+    projects: List[DigestProject] = field(default_factory=list)
+
+
+def _text(value: Any) -> str:
+    """字段值转为去除首尾空白的字符串（None视为空）"""
+    return str(value).strip() if value is not None else ''
+
+
+def attach_related(digest: Digest, articles: Iterable) -> int:
+    """
+    按链接把原始文章的"同时报道"来源填入要闻条目（本地匹配，不消耗Token）
+
+    Args:
+        digest: 结构化日报
+        articles: 原始文章（Article，related字段由故事聚类填充）
+
+    Returns:
+        填入了其他来源的条目数
+    """
+    related = {canonicalize_url(article.link): article.related for article in articles if article.related}
+    attached = 0
+    for item in digest.news:
+        item.related = list(related.get(canonicalize_url(item.url), []))
+        attached += bool(item.related)
+    return attached
+
+
+def parse_digest(
+    content: str,
+    source_urls: Optional[Iterable[str]] = None,
+    github_list: Optional[List[Dict]] = None,
+    earliest: Optional[date] = None,
+    latest: Optional[date] = None,
+    max_news: int = 8,
+    max_projects: int = 5
+) -> Digest:
+    """
+    解析并校验大模型输出的结构化日报
+
+    单条不合格时只丢弃该条：缺少标题或摘要、链接不在原始资讯中、与前面条目链接重复、日期超出时间窗口。
+    项目只保留原始GitHub列表中存在的，星标数、语言和链接使用原始数据。
+
+    Args:
+        content: 大模型输出（JSON对象，兼容```json代码块包裹）
+        source_urls: 原始资讯链接（提供时用于校验和去重）
+        github_list: 原始GitHub项目列表（name、url、language、stars）
+        earliest: 最早允许日期
+        latest: 最晚允许日期
+        max_news: 最多保留的要闻条数
+        max_projects: 最多保留的项目数
+
+    Returns:
+        Digest对象
+
+    Raises:
+        DigestValidationError: 输出不是合法JSON对象或缺少news列表
+    """
+    start, end = content.find('{'), content.rfind('}')
+    if start < 0 or end <= start:
+        raise DigestValidationError('No JSON object in response')
+    try:
+        data = json.loads(content[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise DigestValidationError(f'Invalid JSON: {e}') from e
+
+    if not isinstance(data, dict) or not isinstance(data.get('news'), list):
+        raise DigestValidationError('Missing "news" list')
+
+    sources = {canonicalize_url(url) for url in source_urls} if source_urls is not None else None
+    extractor = DateExtractor()
+    digest = Digest()
+    seen_urls = set()
+    dropped = 0
+
+    for raw in data['news']:
+        if len(digest.news) >= max_news:
+            break
+        if not isinstance(raw, dict):
+            dropped += 1
+            continue
+
+        item = DigestItem(
+            title=_text(raw.get('title')),
+            summary=_text(raw.get('summary')),
+            url=_text(raw.get('url')),
+            category=_text(raw.get('category')),
+            date=_text(raw.get('date'))
+        )
+        if not item.title or not item.summary:
+            dropped += 1
+            continue
+
+        key = canonicalize_url(item.url)
+        if sources is not None and key and key not in sources:
+            logger.warning(f"⚠️ 丢弃链接不在原始资讯中的条目: {item.title}")
+            dropped += 1
+            continue
+        if key and key in seen_urls:
+            logger.info(f"合并重复条目: {item.title}")
+            dropped += 1
+            continue
+
+        if item.date:
+            matches = extractor.extract(item.date)
+            value = matches[0].to_date(extractor.default_year) if matches else None
+            if value is None:
+                item.date = ''
+            elif (earliest and value < earliest) or (latest and value > latest):
+                logger.warning(f"⚠️ 丢弃超出时间窗口的条目: {item.title}（{value}）")
+                dropped += 1
+                continue
+            else:
+                item.date = value.isoformat()
+
+        if key:
+            seen_urls.add(key)
+        digest.news.append(item)
+
+    by_name = {project['name'].lower(): project for project in github_list or []}
+    for raw in data.get('projects') or []:
+        if len(digest.projects) >= max_projects:
+            break
+        if not isinstance(raw, dict):
+            continue
+        source = by_name.get(_text(raw.get('name')).lower())
+        summary = _text(raw.get('summary'))
+        if source is None or not summary:
+            continue
+        digest.projects.append(DigestProject(
+            name=source['name'],
+            summary=summary,
+            url=source.get('url', ''),
+            language=source.get('language') or '',
+            stars=source.get('stars', 0)
+        ))
+
+    if dropped:
+        logger.info(f"结构化校验丢弃{dropped}条要闻，保留{len(digest.news)}条")
+    return digest
@@ -0,0 +1,146 @@
+"""
+故事聚类 - 多个源报道同一事件时合并为一个故事，只把代表文章交给大模型，其他报道作为"同时报道"来源保留
+相似度计算复用批量去重（字符特征矩阵预筛选 + SequenceMatcher精确比较 + 并查集），阈值低于去重阈值
+
+标题相似度按字符计算，只能合并同一语言的报道（中文的36氪和英文的TechCrunch标题几乎没有共同字符）。
+跨语言的报道靠链接合并：规范化后链接相同，或摘要中引用了另一篇文章的链接（中文报道常附英文原文链接）。
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional
+
+from collectors.batch_dedup import BatchDeduplicator, UnionFind
+from collectors.models import Article
+from collectors.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# 摘要中的链接（不含引号、尖括号、括号和非ASCII字符，末尾标点另外去除）
+LINK_PATTERN = re.compile(r'''https?://[^\s"'<>()\[\]\u0080-\uffff]+''')
+
+
+class StoryClusterer:
+    """故事聚类器"""
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.65,
+        priorities: Optional[Dict[str, int]] = None,
+        max_related: int = 5,
+        block_size: int = 1024
+    ):
+        """
+        初始化故事聚类器
+
+        Args:
+            similarity_threshold: 标题相似度阈值（0-1），不同来源改写的标题相似度通常低于去重阈值0.8
+            priorities: 分类优先级映射（分类 -> 优先级，数字越小越重要），文章没有来源优先级（Article.priority）时使用
+            max_related: 每个故事最多保留的其他来源数
+            block_size: 相似度矩阵分块行数（控制内存占用）
+        """
+        self.priorities = priorities or {}
+        self.max_related = max_related
+        self.batch = BatchDeduplicator(similarity_threshold, block_size)
+
+    def _priority(self, article: Article) -> int:
+        """文章来源优先级（没有来源优先级时按分类查找，未配置时为5）"""
+        if article.priority is not None:
+            return article.priority
+        return self.priorities.get(article.category, 5)
+
+    @staticmethod
+    def _union_by_links(articles: List[Article], union_find: UnionFind) -> int:
+        """
+        按链接合并报道（与语言无关）：规范化后链接相同，或摘要引用了另一篇文章的链接
+
+        Returns:
+            发生的合并次数
+        """
+        by_url: Dict[str, int] = {}
+        merged = 0
+        for i, article in enumerate(articles):
+            key = canonicalize_url(article.link)
+            if key:
+                merged += union_find.union(by_url.setdefault(key, i), i)
+
+        for i, article in enumerate(articles):
+            for url in LINK_PATTERN.findall(article.summary or ''):
+                j = by_url.get(canonicalize_url(url.rstrip('.,;:!?')))
+                if j is not None:
+                    merged += union_find.union(i, j)
+        return merged
+
+    def cluster(self, articles: List[Article]) -> List[Article]:
+        """
+        合并同一事件的报道
+
+        标题相似（同一语言的改写）或链接关联（见_union_by_links，可跨语言）的文章合并为一个故事。
+        每个故事保留来源优先级最高的文章（同优先级保留靠前的，即更新的），
+        其他来源的报道（每个来源一条）写入代表文章的related字段。
+
+        Args:
+            articles: 文章列表（通常已按发布时间倒序）
+
+        Returns:
+            代表文章列表（保持输入顺序）
+        """
+        if not articles:
+            return []
+
+        union_find = UnionFind(len(articles))
+        for group in self.batch.cluster([article.title for article in articles]):
+            for i in group[1:]:
+                union_find.union(group[0], i)
+        linked = self._union_by_links(articles, union_find)
+        if linked:
+            logger.debug(f"按链接合并{linked}组跨来源报道")
+
+        priorities = [self._priority(article) for article in articles]
+        representatives = []
+        for group in union_find.groups():
+            members = sorted(group, key=lambda i: (priorities[i], i))
+            representative = articles[members[0]]
+
+            sources = {representative.source}
+            related = []
+            for i in members[1:]:
+                article = articles[i]
+                if article.source in sources or len(related) >= self.max_related:
+                    continue
+                sources.add(article.source)
+                related.append({'source': article.source, 'title': article.title, 'link': article.link})
+            representative.related = related
+            representatives.append((members[0], representative))
+
+        representatives.sort(key=lambda pair: pair[0])
+        merged = len(articles) - len(representatives)
+        logger.info(f"故事聚类完成: {len(articles)}篇 → {len(representatives)}个故事（合并{merged}篇）")
+        return [article for _, article in representatives]
+
+
+# 测试代码
+if __name__ == '__main__':
+    from datetime import datetime, timedelta
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    now = datetime.now()
+    test_articles = [
+        Article('OpenAI发布GPT-5预览版', '摘要', 'https://a/1', now - timedelta(hours=1), '国际科技', 'TechCrunch'),
+        Article('OpenAI正式发布GPT-5预览版', '摘要', 'https://b/1', now - timedelta(hours=2), 'AI科技', '36氪'),
+        Article('OpenAI发布GPT-5预览版本', '摘要', 'https://c/1', now - timedelta(hours=3), 'AI科技', 'InfoQ', priority=1),
+        Article('英伟达发布新一代芯片', '摘要', 'https://a/2', now - timedelta(hours=5), 'AI科技', '36氪'),
+        # 跨语言：标题没有共同字符，靠摘要中的原文链接合并
+        Article('Anthropic raises new funding round', 'Summary', 'https://techcrunch.com/2024/funding/',
+                now - timedelta(hours=6), '国际科技', 'TechCrunch'),
+        Article('Anthropic完成新一轮融资', '据<a href="https://techcrunch.com/2024/funding?utm_source=36kr">TechCrunch</a>报道',
+                'https://36kr.com/p/1', now - timedelta(hours=7), 'AI科技', '36氪'),
+    ]
+    clusterer = StoryClusterer(priorities={'AI科技': 2, '国际科技': 3})
+    for article in clusterer.cluster(test_articles):
+        also = '、'.join(item['source'] for item in article.related) or '无'
+        print(f"{article.source} | {article.title} | 同时报道: {also}")
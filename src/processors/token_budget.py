@@ -0,0 +1,35 @@
+"""
+Token估算工具 - 不依赖分词器的快速估算，用于按Token预算切分提示词
+"""
+
+import math
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    快速估算文本的Token数
+
+    中文等非ASCII字符按每字1个Token计算，ASCII字符按每4个字符1个Token计算。
+    对GLM系列模型略偏保守，适合做预算上限判断。
+
+    Args:
+        text: 待估算的文本
+
+    Returns:
+        估算的Token数
+    """
+    if not text:
+        return 0
+    ascii_count = len(text.encode('ascii', 'ignore'))
+    return (len(text) - ascii_count) + math.ceil(ascii_count / 4)
+
+
+# 测试代码
+if __name__ == '__main__':
+    samples = [
+        "OpenAI releases GPT-5 preview version",
+        "OpenAI发布GPT-5预览版",
+        "## AI\n\n### 1. 标题 (2025-11-10 08:00)\n摘要内容\n来源: 36氪 | 链接: https://36kr.com/p/1\n"
+    ]
+    for sample in samples:
+        print(f"{estimate_tokens(sample):4d} tokens | {sample[:40]!r}")
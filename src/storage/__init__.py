@@ -0,0 +1,11 @@
+"""
+持久化存储模块
+"""
+
+from .feed_state import FeedStateStore
+from .disk_cache import DiskCache
+from .repo_snapshots import RepoSnapshotStore
+from .llm_cache import LLMResponseCache
+from .dedup_store import DedupStore
+
+__all__ = ['FeedStateStore', 'DiskCache', 'RepoSnapshotStore', 'LLMResponseCache', 'DedupStore']
@@ -0,0 +1,184 @@
+"""
+跨运行去重存储 - 记录已发送文章的URL指纹（规范化URL的64位哈希）、标题和MinHash签名，下次运行时跳过时间窗口内已发送过的内容
+紧凑二进制格式：定长头 + URL指纹(uint64) + 时间戳(uint32) + 签名(uint32 × num_perm) + 标题(UTF-8)，
+启动时整块读入后直接按数组解析，不需要逐条反序列化
+"""
+
+import os
+import sys
+import time
+import struct
+import logging
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 文件头：魔数、签名长度、条目数、标题区字节数（小端）
+_HEADER = struct.Struct('<4sIII')
+# DDS2：URL指纹改为规范化URL的指纹，旧版文件重新建立
+_MAGIC = b'DDS2'
+
+
+def _from_bytes(typecode: str, data: memoryview) -> array:
+    """从小端字节构建数组"""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _to_bytes(values: array) -> bytes:
+    """数组转为小端字节"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class DedupStore:
+    """跨运行去重存储"""
+
+    def __init__(
+        self,
+        cache_dir: str = 'cache',
+        filename: str = 'dedup_store.bin',
+        window_hours: float = 48,
+        num_perm: int = 64
+    ):
+        """
+        初始化去重存储
+
+        Args:
+            cache_dir: 缓存目录（对应config.yaml中cache.path）
+            filename: 存储文件名
+            window_hours: 时间窗口（小时），超过窗口的条目在加载和保存时丢弃；
+                需覆盖两次运行的间隔加上调度延迟，每日运行时不能只设24
+            num_perm: 标题签名长度（与MinHashLSH一致，不一致的旧文件会被丢弃）
+        """
+        self.path = Path(cache_dir) / filename
+        self.window_seconds = window_hours * 3600
+        self.num_perm = num_perm
+
+        self._fingerprints = array('Q')
+        self._timestamps = array('I')
+        self._signatures = array('I')
+        self._titles: List[str] = []
+        self._load()
+
+        logger.info(f"跨运行去重存储初始化成功: {self.path}（{len(self)}条，窗口{window_hours}小时）")
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _load(self):
+        """从磁盘加载并丢弃过期条目，文件不存在或损坏时从空存储开始"""
+        if not self.path.exists():
+            return
+
+        try:
+            data = memoryview(self.path.read_bytes())
+            magic, num_perm, count, titles_size = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                raise ValueError('bad magic')
+            if num_perm != self.num_perm:
+                logger.warning(f"去重存储签名长度不一致（{num_perm} != {self.num_perm}），将重新建立")
+                return
+
+            offset = _HEADER.size
+            sections = []
+            for typecode, size in (('Q', count * 8), ('I', count * 4), ('I', count * num_perm * 4)):
+                sections.append(_from_bytes(typecode, data[offset:offset + size]))
+                offset += size
+            titles = bytes(data[offset:offset + titles_size]).decode('utf-8').split('\n') if count else []
+            lengths = [len(section) for section in sections]
+            if lengths != [count, count, count * num_perm] or len(titles) != count:
+                raise ValueError('truncated file')
+        except Exception as e:
+            logger.warning(f"去重存储文件读取失败，将重新建立: {self.path}, {e}")
+            return
+
+        self._fingerprints, self._timestamps, self._signatures = sections
+        self._titles = titles
+        expired = self._expire()
+        if expired:
+            logger.info(f"去重存储丢弃{expired}条过期记录")
+
+    def _expire(self) -> int:
+        """
+        丢弃超出时间窗口的条目
+
+        Returns:
+            丢弃的条目数
+        """
+        cutoff = time.time() - self.window_seconds
+        timestamps = self._timestamps
+        keep = [i for i in range(len(timestamps)) if timestamps[i] >= cutoff]
+        expired = len(timestamps) - len(keep)
+        if not expired:
+            return 0
+
+        num_perm = self.num_perm
+        signatures = self._signatures
+        self._fingerprints = array('Q', (self._fingerprints[i] for i in keep))
+        self._timestamps = array('I', (timestamps[i] for i in keep))
+        self._signatures = array('I')
+        for i in keep:
+            self._signatures.extend(signatures[i * num_perm:(i + 1) * num_perm])
+        self._titles = [self._titles[i] for i in keep]
+        return expired
+
+    @property
+    def fingerprints(self) -> array:
+        """窗口内条目的URL指纹（uint64数组）"""
+        return self._fingerprints
+
+    def entries(self) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+        """
+        遍历窗口内的条目
+
+        Yields:
+            (标题, MinHash签名)
+        """
+        num_perm = self.num_perm
+        for i, title in enumerate(self._titles):
+            yield title, tuple(self._signatures[i * num_perm:(i + 1) * num_perm])
+
+    def add(self, fingerprint: int, title: str, signature: Sequence[int], ts: Optional[float] = None):
+        """
+        记录一条已发送的内容（调用方负责跳过已记录的内容）
+
+        Args:
+            fingerprint: URL指纹（collectors.url_canonical.url_fingerprint），0表示没有URL
+            title: 标题
+            signature: 标题的MinHash签名（长度为num_perm）
+            ts: 发送时间戳（可选，默认当前时间）
+        """
+        if len(signature) != self.num_perm:
+            raise ValueError(f"signature length must be {self.num_perm}")
+        self._fingerprints.append(fingerprint)
+        self._timestamps.append(int(ts if ts is not None else time.time()))
+        self._signatures.extend(signature)
+        # 换行符是标题区的分隔符
+        self._titles.append(' '.join(title.split()))
+
+    def save(self):
+        """保存到磁盘（先丢弃过期条目；先写临时文件再替换，避免中途失败损坏存储文件）"""
+        self._expire()
+        titles = '\n'.join(self._titles).encode('utf-8')
+        header = _HEADER.pack(_MAGIC, self.num_perm, len(self._titles), len(titles))
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                for values in (self._fingerprints, self._timestamps, self._signatures):
+                    f.write(_to_bytes(values))
+                f.write(titles)
+            os.replace(tmp_path, self.path)
+            logger.info(f"跨运行去重存储已保存: {self.path}（{len(self)}条）")
+        except Exception as e:
+            logger.error(f"跨运行去重存储保存失败: {self.path}, {e}")
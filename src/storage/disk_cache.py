@@ -0,0 +1,175 @@
+"""
+磁盘缓存 - 内容寻址的键值缓存
+键为规范化参数的SHA-256，支持TTL过期、按条目数LRU淘汰，并可保存ETag等元数据用于重新验证
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """磁盘缓存（每个条目一个JSON文件，按最近访问时间淘汰）"""
+
+    def __init__(
+        self,
+        cache_dir: str = 'cache',
+        namespace: str = 'default',
+        ttl_seconds: float = 3600,
+        max_entries: int = 500
+    ):
+        """
+        初始化磁盘缓存
+
+        Args:
+            cache_dir: 缓存根目录（对应config.yaml中cache.path）
+            namespace: 命名空间（子目录），不同用途的缓存互不影响
+            ttl_seconds: 条目有效期（秒）
+            max_entries: 最多保留的条目数，超出时淘汰最久未访问的条目
+        """
+        self.dir = Path(cache_dir) / namespace
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._count: Optional[int] = None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        根据任意可JSON序列化的参数生成缓存键（字典按键排序，保证相同内容得到相同的键）
+
+        Returns:
+            64位十六进制SHA-256字符串
+        """
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """条目文件路径（按键前两位分目录，避免单目录文件过多）"""
+        return self.dir / key[:2] / f"{key}.json"
+
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """
+        读取条目（不论是否过期），并刷新其最近访问时间
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            {'value': 值, 'stored_at': 写入时间戳, 'meta': 元数据}，不存在时返回None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"缓存条目读取失败，已忽略: {path}, {e}")
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """判断条目是否在有效期内"""
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取未过期的缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，不存在或已过期时返回None
+        """
+        entry = self.get_entry(key)
+        if entry and self.is_fresh(entry):
+            return entry.get('value')
+        return None
+
+    def set(self, key: str, value: Any, **meta):
+        """
+        写入缓存（先写临时文件再替换，并发读不会读到半个文件）
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的值
+            **meta: 元数据（如etag）
+        """
+        path = self._path(key)
+        is_new = not path.exists()
+        data = json.dumps({'value': value, 'stored_at': time.time(), 'meta': meta}, ensure_ascii=False)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"缓存写入失败: {path}, {e}")
+            return
+
+        if is_new:
+            self._on_insert()
+
+    def delete(self, key: str):
+        """删除条目"""
+        try:
+            self._path(key).unlink()
+            with self._lock:
+                if self._count is not None:
+                    self._count -= 1
+        except FileNotFoundError:
+            pass
+
+    def _entry_files(self):
+        return list(self.dir.glob('*/*.json')) if self.dir.exists() else []
+
+    @staticmethod
+    def _mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _on_insert(self):
+        """新增条目后检查容量，超出上限时淘汰"""
+        with self._lock:
+            if self._count is None:
+                self._count = len(self._entry_files())
+            else:
+                self._count += 1
+
+            # 超出10%后才批量淘汰，避免每次写入都扫描目录
+            if self._count <= self.max_entries * 1.1:
+                return
+
+            files = self._entry_files()
+            files.sort(key=self._mtime)
+            for path in files[:max(len(files) - self.max_entries, 0)]:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._count = min(len(files), self.max_entries)
+            logger.info(f"缓存淘汰完成: {self.dir}（保留{self._count}个条目）")
+
+    def clear(self):
+        """清空当前命名空间的所有条目"""
+        for path in self._entry_files():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._count = 0
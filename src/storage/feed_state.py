@@ -0,0 +1,150 @@
+"""
+RSS源状态存储 - 记录每个RSS源的ETag、Last-Modified、已见条目ID和最近获取时间
+用于条件请求（Conditional GET），源未更新时服务器返回304，跳过下载和解析
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FeedStateStore:
+    """RSS源状态存储（按URL保存在cache目录下的JSON文件中）"""
+
+    def __init__(
+        self,
+        cache_dir: str = 'cache',
+        filename: str = 'rss_feed_state.json',
+        max_seen_ids: int = 200
+    ):
+        """
+        初始化RSS源状态存储
+
+        Args:
+            cache_dir: 缓存目录（对应config.yaml中cache.path）
+            filename: 状态文件名
+            max_seen_ids: 每个源最多保留的已见条目ID数
+        """
+        self.path = Path(cache_dir) / filename
+        self.max_seen_ids = max_seen_ids
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = self._load()
+
+        logger.info(f"RSS源状态存储初始化成功: {self.path}（{len(self._states)}个源）")
+
+    def _load(self) -> Dict[str, Dict]:
+        """从磁盘加载状态，文件不存在或损坏时返回空状态"""
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            logger.warning(f"RSS源状态文件读取失败，将重新建立: {self.path}, {e}")
+            return {}
+
+    def get(self, url: str) -> Dict:
+        """
+        获取某个源的状态
+
+        Args:
+            url: RSS地址
+
+        Returns:
+            状态字典（不存在时为空字典）
+        """
+        with self._lock:
+            return dict(self._states.get(url, {}))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        构建条件请求头
+
+        Args:
+            url: RSS地址
+
+        Returns:
+            包含If-None-Match / If-Modified-Since的请求头字典
+        """
+        state = self.get(url)
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def update(self, url: str, **fields):
+        """
+        更新某个源的状态字段
+
+        Args:
+            url: RSS地址
+            **fields: 要更新的字段
+        """
+        with self._lock:
+            self._states.setdefault(url, {}).update(fields)
+
+    def record_fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        entry_ids: Optional[List[str]] = None,
+        not_modified: bool = False
+    ):
+        """
+        记录一次获取结果
+
+        Args:
+            url: RSS地址
+            etag: 响应中的ETag
+            last_modified: 响应中的Last-Modified
+            entry_ids: 本次看到的条目ID（按源中顺序）
+            not_modified: 是否为304未修改响应
+        """
+        fields = {'last_fetch': time.time()}
+        if not not_modified:
+            fields['etag'] = etag
+            fields['last_modified'] = last_modified
+            if entry_ids is not None:
+                fields['seen_ids'] = entry_ids[:self.max_seen_ids]
+        self.update(url, **fields)
+
+    def save(self, only: Optional[Iterable[str]] = None):
+        """
+        保存状态到磁盘（先写临时文件再替换，避免中途失败损坏状态文件）
+
+        Args:
+            only: 只保存这些字段（可选，如('health',)），其他字段保持磁盘上的旧值；
+                推送失败时用于保留源健康数据，而ETag、已见条目和高水位标记不前进
+        """
+        with self._lock:
+            if only is None:
+                states = self._states
+            else:
+                fields = set(only)
+                states = self._load()
+                for url, state in self._states.items():
+                    updates = {key: value for key, value in state.items() if key in fields}
+                    if updates:
+                        states.setdefault(url, {}).update(updates)
+            data = json.dumps(states, ensure_ascii=False)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+            logger.info(f"RSS源状态已保存: {self.path}")
+        except Exception as e:
+            logger.error(f"RSS源状态保存失败: {self.path}, {e}")
@@ -0,0 +1,88 @@
+"""
+大模型响应缓存 - 相同请求（模型、消息、温度、max_tokens、工具）直接返回上次的结果
+用于推送失败后的手动重跑等场景，重复运行不消耗Token
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from .disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# 参与缓存键计算的请求字段
+KEY_FIELDS = ('model', 'messages', 'temperature', 'max_tokens', 'tools')
+
+
+class LLMResponseCache:
+    """大模型响应缓存（基于DiskCache，TTL过期 + LRU条目数上限）"""
+
+    def __init__(
+        self,
+        cache_dir: str = 'cache',
+        ttl_hours: float = 1,
+        max_entries: int = 200,
+        bypass: bool = False
+    ):
+        """
+        初始化大模型响应缓存
+
+        Args:
+            cache_dir: 缓存根目录（对应config.yaml中cache.path）
+            ttl_hours: 有效期（小时，对应cache.ttl）
+            max_entries: 最多保留的响应数，超出时淘汰最久未使用的
+            bypass: 是否跳过读取缓存（仍会写入新结果），环境变量GLM_CACHE_BYPASS=1同样生效
+        """
+        self.cache = DiskCache(cache_dir, namespace='llm', ttl_seconds=ttl_hours * 3600, max_entries=max_entries)
+        self.bypass = bypass or os.getenv('GLM_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')
+
+        logger.info(f"大模型响应缓存初始化成功（有效期{ttl_hours}小时{'，已跳过读取' if self.bypass else ''}）")
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        根据请求参数生成缓存键
+
+        Args:
+            request: chat.completions.create的参数
+        """
+        return DiskCache.make_key({field: request.get(field) for field in KEY_FIELDS})
+
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        读取缓存的响应内容
+
+        Args:
+            request: chat.completions.create的参数
+
+        Returns:
+            响应内容，未命中、已过期或bypass时返回None
+        """
+        if self.bypass:
+            return None
+
+        content = self.cache.get(self.make_key(request))
+        if content is not None:
+            logger.info(f"命中大模型响应缓存（{request.get('model')}），跳过API调用")
+        return content
+
+    def set(self, request: Dict[str, Any], content: str):
+        """
+        写入响应内容（空内容不缓存）
+
+        Args:
+            request: chat.completions.create的参数
+            content: 响应内容
+        """
+        if content:
+            self.cache.set(self.make_key(request), content, model=request.get('model'))
+
+    def delete(self, request: Dict[str, Any]):
+        """
+        删除缓存的响应（响应内容不可用时调用，避免下次运行再次命中）
+
+        Args:
+            request: chat.completions.create的参数
+        """
+        self.cache.delete(self.make_key(request))
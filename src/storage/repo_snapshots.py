@@ -0,0 +1,180 @@
+"""
+GitHub项目星标快照存储 - 每次运行记录各项目的星标数，用于计算星标增速（真正的"趋势"）
+使用SQLite存储，增速和加速度通过窗口函数在数据库内批量计算，不把历史数据加载到Python
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+
+# 每个项目取窗口内最新一条快照，与窗口内最早一条和上一条快照比较：
+# velocity = 窗口内平均每日新增星标
+# recent_velocity = 最近两次快照之间的每日新增星标
+# acceleration = recent_velocity - 之前区间的每日新增星标（需要至少3次快照）
+_VELOCITY_SQL = """
+WITH w AS (
+    SELECT
+        s.repo_id, s.ts, s.stars,
+        FIRST_VALUE(s.ts) OVER p AS first_ts,
+        FIRST_VALUE(s.stars) OVER p AS first_stars,
+        LAG(s.ts) OVER p AS prev_ts,
+        LAG(s.stars) OVER p AS prev_stars,
+        ROW_NUMBER() OVER (PARTITION BY s.repo_id ORDER BY s.ts DESC) AS rn,
+        COUNT(*) OVER (PARTITION BY s.repo_id) AS n
+    FROM snapshots s
+    {candidate_join}
+    WHERE s.ts >= :since
+    WINDOW p AS (PARTITION BY s.repo_id ORDER BY s.ts)
+),
+v AS (
+    SELECT
+        repo_id, stars, n,
+        (stars - first_stars) * :day / (ts - first_ts) AS velocity,
+        (stars - prev_stars) * :day / (ts - prev_ts) AS recent_velocity,
+        CASE WHEN prev_ts > first_ts
+             THEN (prev_stars - first_stars) * :day / (prev_ts - first_ts)
+        END AS older_velocity
+    FROM w
+    WHERE rn = 1 AND n >= :min_snapshots AND ts > first_ts
+)
+SELECT r.full_name, v.stars, v.n, v.velocity, v.recent_velocity - v.older_velocity AS acceleration
+FROM v JOIN repos r ON r.id = v.repo_id
+ORDER BY v.velocity DESC, v.stars DESC
+LIMIT :top_n
+"""
+
+
+class RepoSnapshotStore:
+    """GitHub项目星标快照存储（SQLite）"""
+
+    def __init__(self, db_path: str = 'cache/github_snapshots.db'):
+        """
+        初始化快照存储
+
+        Args:
+            db_path: SQLite数据库路径（默认位于cache.path目录下）
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS repos (
+                id INTEGER PRIMARY KEY,
+                full_name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                repo_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                stars INTEGER NOT NULL,
+                PRIMARY KEY (repo_id, ts)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (ts);
+        """)
+        self._conn.commit()
+
+        logger.info(f"GitHub星标快照存储初始化成功: {self.db_path}")
+
+    def record(self, repos: Iterable, ts: Optional[int] = None) -> int:
+        """
+        记录一批项目的当前星标数
+
+        Args:
+            repos: Repo记录或包含full_name/stars的字典
+            ts: 快照时间戳（可选，默认当前时间，按小时取整）
+
+        Returns:
+            记录的快照数
+        """
+        # 按小时取整：同一小时内重复运行只覆盖快照，避免极短间隔放大增速
+        ts = int(ts if ts is not None else time.time()) // 3600 * 3600
+        rows = [(repo['full_name'], int(repo['stars'])) for repo in repos]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany('INSERT OR IGNORE INTO repos (full_name) VALUES (?)', ((name,) for name, _ in rows))
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO snapshots (repo_id, ts, stars) '
+                'SELECT id, ?, ? FROM repos WHERE full_name = ?',
+                ((ts, stars, name) for name, stars in rows)
+            )
+            self._conn.commit()
+
+        logger.info(f"记录了{len(rows)}个项目的星标快照")
+        return len(rows)
+
+    def rank_by_velocity(
+        self,
+        window_days: float = 7,
+        top_n: int = 10,
+        min_snapshots: int = 2,
+        candidates: Optional[List[str]] = None,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, int, int, float, Optional[float]]]:
+        """
+        按窗口内星标增速排序
+
+        Args:
+            window_days: 统计窗口（天）
+            top_n: 返回前N个
+            min_snapshots: 至少需要多少次快照才参与排序
+            candidates: 只在这些项目（full_name）中排序（可选）
+            now: 当前时间戳（可选）
+
+        Returns:
+            [(full_name, 最新星标数, 快照数, 每日增速, 加速度)]，加速度在快照不足3次时为None
+        """
+        now = now if now is not None else time.time()
+        params = {
+            'since': int(now - window_days * SECONDS_PER_DAY),
+            'day': SECONDS_PER_DAY,
+            'min_snapshots': max(2, min_snapshots),
+            'top_n': top_n
+        }
+
+        with self._lock:
+            candidate_join = ''
+            if candidates is not None:
+                # 候选集放入临时表后连接，避免超长IN列表
+                self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS candidates (full_name TEXT PRIMARY KEY)')
+                self._conn.execute('DELETE FROM candidates')
+                self._conn.executemany('INSERT OR IGNORE INTO candidates VALUES (?)', ((name,) for name in candidates))
+                candidate_join = (
+                    'JOIN repos cr ON cr.id = s.repo_id '
+                    'JOIN candidates c ON c.full_name = cr.full_name'
+                )
+
+            rows = self._conn.execute(_VELOCITY_SQL.format(candidate_join=candidate_join), params).fetchall()
+
+        return rows
+
+    def prune(self, keep_days: float = 90) -> int:
+        """
+        删除超过保留期的快照
+
+        Args:
+            keep_days: 保留天数
+
+        Returns:
+            删除的快照数
+        """
+        cutoff = int(time.time() - keep_days * SECONDS_PER_DAY)
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM snapshots WHERE ts < ?', (cutoff,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()